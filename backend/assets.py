@@ -0,0 +1,172 @@
+"""
+backend/assets.py
+Static asset pipeline.
+Build step (run at image build / deploy time):
+    python -m backend.assets
+bundles the stylesheets, writes content-fingerprinted copies to static/dist/ with
+.gz (and .br, when the brotli package is installed) siblings, and a manifest.json
+mapping logical names to fingerprinted ones. A fingerprinted URL names its content,
+so it is served with `Cache-Control: immutable` and never revalidated.
+
+Wiring (backend/main.py):
+    app.mount("/static", PrecompressedStaticFiles(directory=STATIC_DIR), name="static")
+    install_asset_url(templates)   # {{ asset_url('app.js') }} in templates
+Without a build, asset_url() falls back to the plain /static/ files.
+"""
+
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import stat
+from typing import Dict, Optional, Tuple
+import anyio
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import StaticFiles
+from starlette.types import Scope
+
+try:
+    import brotli
+except ImportError:  # Optional: gzip only without it
+    brotli = None
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+DIST = "dist"
+MANIFEST = "manifest.json"
+
+# Logical name -> source files, concatenated in order.
+# style.css is the pre-cinematic stylesheet: no template links it, so it isn't bundled.
+BUNDLES: Dict[str, Tuple[str, ...]] = {
+    "styles.css": ("styles.css",),
+    "app.js": ("app.js",),
+}
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+HASH_LENGTH = 10
+MIN_COMPRESS_BYTES = 256
+
+
+def _fingerprinted(name: str, body: bytes) -> str:
+    stem, ext = os.path.splitext(name)
+    return f"{stem}.{hashlib.sha256(body).hexdigest()[:HASH_LENGTH]}{ext}"
+
+
+def build(static_dir: str = STATIC_DIR, bundles: Optional[Dict[str, Tuple[str, ...]]] = None) -> Dict[str, str]:
+    """Builds static_dir/dist and returns the manifest {logical name: dist/fingerprinted name}."""
+    bundles = bundles or BUNDLES
+    out_dir = os.path.join(static_dir, DIST)
+    os.makedirs(out_dir, exist_ok=True)
+
+    manifest, keep = {}, {MANIFEST}
+    for logical, sources in bundles.items():
+        parts = []
+        for source in sources:
+            with open(os.path.join(static_dir, source), "rb") as f:
+                parts.append(f.read().rstrip() + b"\n")
+        body = b"".join(parts)
+        name = _fingerprinted(logical, body)
+        manifest[logical] = f"{DIST}/{name}"
+
+        variants = {name: body}
+        if len(body) >= MIN_COMPRESS_BYTES:
+            variants[name + ".gz"] = gzip.compress(body, compresslevel=9, mtime=0)
+            if brotli is not None:
+                variants[name + ".br"] = brotli.compress(body, quality=11)
+        for filename, data in variants.items():
+            path = os.path.join(out_dir, filename)
+            keep.add(filename)
+            if not os.path.exists(path):  # Same name means same content
+                with open(path + ".tmp", "wb") as f:
+                    f.write(data)
+                os.replace(path + ".tmp", path)
+
+    # Previous builds' files: pages still open may reference them for a while, but not forever
+    for filename in os.listdir(out_dir):
+        if filename not in keep:
+            os.remove(os.path.join(out_dir, filename))
+
+    with open(os.path.join(out_dir, MANIFEST + ".tmp"), "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(os.path.join(out_dir, MANIFEST + ".tmp"), os.path.join(out_dir, MANIFEST))
+    return manifest
+
+
+class AssetManifest:
+    def __init__(self, static_dir: str = STATIC_DIR, prefix: str = "/static"):
+        self.path = os.path.join(static_dir, DIST, MANIFEST)
+        self.prefix = prefix.rstrip("/")
+        self._entries: Optional[Dict[str, str]] = None
+        self._mtime: Optional[float] = None
+
+    def _load(self) -> Dict[str, str]:
+        try:
+            mtime = os.stat(self.path).st_mtime
+        except OSError:
+            return {}
+        if mtime != self._mtime:  # A redeploy's build replaces the manifest: pick it up
+            try:
+                with open(self.path) as f:
+                    self._entries = json.load(f)
+                self._mtime = mtime
+            except (OSError, ValueError) as e:
+                print(f"⚠️  Asset manifest unreadable ({e}); serving unfingerprinted assets")
+                return {}
+        return self._entries or {}
+
+    def url(self, name: str) -> str:
+        name = name.lstrip("/")
+        return f"{self.prefix}/{self._load().get(name, name)}"
+
+
+def install_asset_url(templates, manifest: Optional[AssetManifest] = None) -> AssetManifest:
+    """Exposes asset_url() to Jinja2Templates."""
+    manifest = manifest or AssetManifest()
+    templates.env.globals["asset_url"] = manifest.url
+    return manifest
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """
+    StaticFiles that serves the build's .br / .gz siblings when the client accepts them
+    (no per-request compression), and marks fingerprinted files immutable.
+    """
+
+    ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        fingerprinted = path.replace(os.sep, "/").lstrip("/").startswith(DIST + "/")
+        if scope["method"] in ("GET", "HEAD") and fingerprinted:
+            accept = Headers(scope=scope).get("accept-encoding", "")
+            for encoding, suffix in self.ENCODINGS:
+                if encoding not in accept:
+                    continue
+                try:
+                    full_path, stat_result = await anyio.to_thread.run_sync(self.lookup_path, path + suffix)
+                except (OSError, ValueError):
+                    continue
+                if stat_result and stat.S_ISREG(stat_result.st_mode):
+                    media_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+                    response = FileResponse(full_path, stat_result=stat_result, media_type=media_type)
+                    response.headers["Content-Encoding"] = encoding
+                    return self._cache_headers(response, fingerprinted)
+
+        response = await super().get_response(path, scope)
+        return self._cache_headers(response, fingerprinted)
+
+    @staticmethod
+    def _cache_headers(response: Response, fingerprinted: bool) -> Response:
+        response.headers["Cache-Control"] = IMMUTABLE if fingerprinted else REVALIDATE
+        if fingerprinted:
+            response.headers["Vary"] = "Accept-Encoding"
+        return response
+
+
+if __name__ == "__main__":
+    built = build()
+    print(f"📦 Built {len(built)} assets into {os.path.join(STATIC_DIR, DIST)} "
+          f"(gzip{', brotli' if brotli else ''})")
+    for logical, target in sorted(built.items()):
+        print(f"   {logical:<12} -> {target}")
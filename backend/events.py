@@ -0,0 +1,259 @@
+"""
+backend/events.py
+Server-push channel (Server-Sent Events) for live dashboard updates.
+One asyncio broker per worker: each connected client is a coroutine parked on a
+small queue, so thousands of idle connections cost a few KB each and no threads.
+The bridge tails the change feed (written by the mining service, possibly in another
+process) and the ledger, and turns them into offer_* and balance events.
+
+Wiring (backend/main.py):
+    broker = EventBroker()
+    bridge = FeedBridge(broker, feed, rails=rails_engine, ledger=ledger, inventory=inventory)
+    app.include_router(events_router(broker, bridge))
+    # In-process writes can push immediately, e.g. after /api/open:
+    bridge.publish_balance(user_id)
+"""
+
+import asyncio
+import json
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Set
+from fastapi import APIRouter, Query, Request
+from fastapi.responses import StreamingResponse
+from core.changefeed import ADDED, CHANGED, REMOVED, ChangeFeed
+from core.inventory import InventoryManager
+from core.ledger import LedgerManager
+from core.progression import ProgressionManager
+from core.rails import RailsEngine
+
+DEFAULT_USER = "local_user"
+QUEUE_SIZE = 256          # Per-client backlog before it's told to resync
+REPLAY_SIZE = 1024        # Recent events kept for Last-Event-ID resume
+HEARTBEAT = 15.0          # Seconds between keep-alive comments (proxies drop silent streams)
+POLL_INTERVAL = 2.0       # Bridge: seconds between change feed / ledger checks
+RETRY_MS = 3000           # Client reconnect delay
+
+KIND_EVENTS = {ADDED: "offer_added", REMOVED: "offer_removed", CHANGED: "offer_changed"}
+
+
+@dataclass
+class ServerEvent:
+    id: int
+    type: str
+    data: Dict[str, Any]
+    user_id: Optional[str] = None  # None: broadcast
+
+    def encode(self) -> bytes:
+        return f"id: {self.id}\nevent: {self.type}\ndata: {json.dumps(self.data, separators=(',', ':'), default=str)}\n\n".encode("utf-8")
+
+
+@dataclass(eq=False)
+class Subscriber:
+    user_id: str
+    queue: asyncio.Queue
+    lagged: bool = False
+    connected_at: float = field(default_factory=time.time)
+
+
+class EventBroker:
+    def __init__(self, queue_size: int = QUEUE_SIZE, replay_size: int = REPLAY_SIZE):
+        self.queue_size = queue_size
+        self._subscribers: Set[Subscriber] = set()
+        self._replay: Deque[ServerEvent] = deque(maxlen=replay_size)
+        self._next_id = 1
+        self._lock = threading.Lock()  # publish() may come from threadpool endpoints
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.published = 0
+        self.dropped = 0
+
+    # --- Publishing (any thread) ---
+
+    def publish(self, event_type: str, data: Dict[str, Any], user_id: Optional[str] = None) -> ServerEvent:
+        with self._lock:
+            event = ServerEvent(self._next_id, event_type, data, user_id)
+            self._next_id += 1
+            self._replay.append(event)
+            self.published += 1
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return event
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._fanout(event)
+        else:
+            loop.call_soon_threadsafe(self._fanout, event)
+        return event
+
+    def _fanout(self, event: ServerEvent):
+        for sub in list(self._subscribers):
+            if event.user_id is not None and event.user_id != sub.user_id:
+                continue
+            if sub.lagged:
+                continue
+            try:
+                sub.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # Slow client: stop queueing, it will be told to refetch /api/state
+                sub.lagged = True
+                self.dropped += 1
+
+    # --- Subscribing (event loop) ---
+
+    def subscribe(self, user_id: str) -> Subscriber:
+        self._loop = asyncio.get_running_loop()
+        sub = Subscriber(user_id, asyncio.Queue(maxsize=self.queue_size))
+        self._subscribers.add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscriber):
+        self._subscribers.discard(sub)
+
+    def users(self) -> List[str]:
+        return sorted({sub.user_id for sub in list(self._subscribers)})
+
+    def replay_since(self, last_id: int, user_id: str) -> Optional[List[ServerEvent]]:
+        """Events after last_id for this user, or None if the ring no longer reaches back that far."""
+        with self._lock:
+            events = list(self._replay)
+        if events and events[0].id > last_id + 1:
+            return None
+        return [e for e in events if e.id > last_id and e.user_id in (None, user_id)]
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "subscribers": len(self._subscribers),
+            "published": self.published,
+            "dropped": self.dropped,
+            "last_id": self._next_id - 1,
+        }
+
+    async def stream(self, user_id: str, last_event_id: Optional[int] = None,
+                     heartbeat: float = HEARTBEAT) -> AsyncIterator[bytes]:
+        """The SSE body for one client."""
+        sub = self.subscribe(user_id)
+        try:
+            yield f"retry: {RETRY_MS}\n\n".encode("utf-8")
+            if last_event_id is not None:
+                missed = self.replay_since(last_event_id, user_id)
+                if missed is None:
+                    yield b"event: resync\ndata: {}\n\n"
+                else:
+                    for event in missed:
+                        yield event.encode()
+            while True:
+                if sub.lagged:
+                    sub.lagged = False
+                    while not sub.queue.empty():
+                        sub.queue.get_nowait()
+                    yield b"event: resync\ndata: {}\n\n"
+                try:
+                    event = await asyncio.wait_for(sub.queue.get(), timeout=heartbeat)
+                except asyncio.TimeoutError:
+                    yield b": ping\n\n"
+                    continue
+                yield event.encode()
+        finally:
+            self.unsubscribe(sub)
+
+
+class FeedBridge:
+    """
+    Tails the change feed and the ledger and publishes what moved.
+    Polling keeps the mining service decoupled: it may run in another process.
+    """
+
+    def __init__(self, broker: EventBroker, feed: ChangeFeed, rails: Optional[RailsEngine] = None,
+                 ledger: Optional[LedgerManager] = None, inventory: Optional[InventoryManager] = None,
+                 interval: float = POLL_INTERVAL):
+        self.broker = broker
+        self.feed = feed
+        self.rails = rails
+        self.ledger = ledger
+        self.inventory = inventory
+        self.progression = ProgressionManager(ledger) if ledger else None
+        self.interval = interval
+        self.seq: Optional[int] = None
+        self._revisions: Dict[str, int] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def publish_balance(self, user_id: str):
+        """Balance / level / streak snapshot for one user (call after in-process ledger writes too)."""
+        if not self.ledger:
+            return
+        streak = self.progression.get_streak_status(user_id)
+        self._revisions[user_id] = self.ledger.get_revision(user_id)
+        data = {
+            "balance": self.ledger.get_balance(user_id),
+            "level": self.progression.get_level(user_id),
+            "streak": {"active": streak["active"], "age_text": streak["age_text"], "message": streak["message"]},
+        }
+        if self.inventory is not None:
+            data["collection_value"] = self.inventory.get_total_value()
+        self.broker.publish("balance", data, user_id=user_id)
+
+    def poll_once(self) -> int:
+        """One synchronous check of both sources. Returns events published."""
+        published = 0
+        if self.seq is None:
+            self.seq = self.feed.last_seq()  # Live updates only: clients already rendered the past
+        events = self.feed.read(self.seq)
+        if events:
+            if self.rails is not None:
+                self.rails.apply_events(events)
+            for event in events:
+                data = {"offer_id": event.offer_id}
+                if event.kind != REMOVED:
+                    data["offer"] = {k: v for k, v in event.payload.items() if k != "changes"}
+                    if self.rails is not None:
+                        data["card"] = self.rails.card(event.offer_id)
+                        data["placement"] = self.rails.placement(event.offer_id)
+                self.broker.publish(KIND_EVENTS[event.kind], data)
+                published += 1
+            self.seq = events[-1].seq
+
+        if self.ledger:
+            for user_id in self.broker.users():
+                revision = self.ledger.get_revision(user_id)
+                if self._revisions.get(user_id) != revision:
+                    if user_id in self._revisions:
+                        self.publish_balance(user_id)
+                        published += 1
+                    self._revisions[user_id] = revision
+        return published
+
+    async def run(self):
+        while True:
+            try:
+                # SQLite reads off the event loop: idle connections must never stall
+                await asyncio.to_thread(self.poll_once)
+            except Exception as e:
+                print(f"⚠️  Event bridge poll failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    def ensure_running(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self.run())
+
+
+def events_router(broker: EventBroker, bridge: Optional[FeedBridge] = None) -> APIRouter:
+    router = APIRouter()
+
+    @router.get("/api/events")
+    async def events(request: Request, user: str = Query(DEFAULT_USER, max_length=64)):
+        if bridge is not None:
+            bridge.ensure_running()  # Started by the first client, so idle workers don't poll
+        last_id = request.headers.get("last-event-id")
+        last_event_id = int(last_id) if last_id and last_id.isdigit() else None
+        return StreamingResponse(
+            broker.stream(user, last_event_id),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    return router
@@ -0,0 +1,58 @@
+"""
+backend/images_api.py
+Cover image proxy. Mounted by the web app with:
+    from backend.images_api import router as images_router
+    app.include_router(images_router)
+
+/api/img?u=<cdn url>&w=<width>   fetches (once) and redirects to the content URL below
+/img/<sha256>?w=<width>          serves cached bytes; the URL names the content, so it is immutable
+Widths are snapped to miners.images.VARIANT_WIDTHS.
+"""
+
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import FileResponse, RedirectResponse
+from miners.images import MAX_WIDTH, RASTER_TYPES, ImageCache, is_allowed, shared_image_cache, variant_width
+
+router = APIRouter()
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REDIRECT_CACHE = "public, max-age=3600"  # The CDN URL -> content mapping may change when a store swaps art
+# Upstream bytes served as-is can't run anything even if a browser were to treat them as a document
+PASSTHROUGH_CSP = "default-src 'none'"
+
+_cache: Optional[ImageCache] = None
+
+
+def get_cache() -> ImageCache:
+    global _cache
+    if _cache is None:
+        _cache = shared_image_cache()
+    return _cache
+
+
+@router.get("/api/img")
+def proxy(u: str = Query(..., max_length=2048), w: Optional[int] = Query(None, ge=16, le=MAX_WIDTH)):
+    if not is_allowed(u):
+        raise HTTPException(status_code=400, detail="Host not proxied.")
+    cached = get_cache().fetch(u)
+    if cached is None:
+        raise HTTPException(status_code=502, detail="Upstream image unavailable.")
+    w = variant_width(w)
+    target = f"/img/{cached.digest}" + (f"?w={w}" if w else "")
+    return RedirectResponse(target, status_code=302, headers={"Cache-Control": REDIRECT_CACHE})
+
+
+@router.get("/img/{digest}")
+def image(digest: str, w: Optional[int] = Query(None, ge=16, le=MAX_WIDTH)):
+    cache = get_cache()
+    cached = cache.by_digest(digest)
+    if cached is None or cached.content_type not in RASTER_TYPES:
+        raise HTTPException(status_code=404, detail="Unknown image.")
+    w = variant_width(w)
+    served = cache.variant(cached, w)
+    headers = {"Cache-Control": IMMUTABLE, "ETag": f'"{digest}{f"-w{w}" if w else ""}"',
+               "X-Content-Type-Options": "nosniff"}
+    if served.path == cached.path:  # Not re-encoded through Pillow
+        headers["Content-Security-Policy"] = PASSTHROUGH_CSP
+    return FileResponse(served.path, media_type=served.content_type, headers=headers)
@@ -0,0 +1,195 @@
+"""
+backend/lanes.py
+Async facades over the SQLite / JSON managers, so request handlers never block the event loop.
+Work runs on two bounded executor lanes:
+  - read:  a few threads; the ledger and state databases run in WAL mode, so
+           readers don't block each other or wait on the writer's commit
+  - write: exactly one thread (single writer), so writers never contend for the
+           database lock and the inventory JSON is rewritten by one thread only
+Each lane caps its queue depth; past it, requests fail fast with 503 + Retry-After
+instead of piling up and dragging every other request's latency with them.
+
+Wiring (backend/main.py):
+    lanes = StoreLanes()
+    install(app, lanes)
+    ledger_io, state_io, inventory_io = AsyncLedger(ledger, lanes), AsyncUserState(user_state, lanes), AsyncInventory(inventory, lanes)
+
+    @app.post("/api/open/{offer_id}")
+    async def api_open(offer_id: str):
+        result = await state_io.mark_opened(USER_ID, offer_id)
+        ...
+
+    @app.get("/api/state")
+    async def api_state(request: Request):
+        return await lanes.read.run(state_cache.response, request, USER_ID)
+"""
+
+import asyncio
+import contextvars
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Set
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from core.inventory import InventoryManager
+from core.ledger import LedgerManager
+from core.models import GameOffer
+from core.state import UserStateManager
+
+READ_WORKERS = int(os.environ.get("ZEROCRATE_READ_WORKERS", "4"))
+READ_QUEUE = int(os.environ.get("ZEROCRATE_READ_QUEUE", "64"))
+WRITE_QUEUE = int(os.environ.get("ZEROCRATE_WRITE_QUEUE", "32"))
+RETRY_AFTER = 1  # Seconds suggested to rejected clients
+
+
+class LaneBusy(Exception):
+    def __init__(self, lane: str, depth: int):
+        super().__init__(f"{lane} lane is full ({depth} pending)")
+        self.lane = lane
+        self.depth = depth
+
+
+class Lane:
+    def __init__(self, name: str, workers: int, max_pending: int):
+        self.name = name
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"zc-{name}")
+        # Only touched from the event loop thread, so no lock
+        self.pending = 0
+        self.max_seen = 0
+        self.completed = 0
+        self.rejected = 0
+        self.busy = 0.0
+
+    def _timed(self, fn: Callable, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            self.busy += time.perf_counter() - start
+
+    async def run(self, fn: Callable, *args, **kwargs) -> Any:
+        """Runs fn on this lane. Raises LaneBusy at once if max_pending calls are already queued or running."""
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise LaneBusy(self.name, self.pending)
+        self.pending += 1
+        self.max_seen = max(self.max_seen, self.pending)
+        try:
+            loop = asyncio.get_running_loop()
+            # Carry the request's context (metrics accounting) onto the worker thread
+            context = contextvars.copy_context()
+            return await loop.run_in_executor(self._executor, partial(context.run, self._timed, fn, *args, **kwargs))
+        finally:
+            self.pending -= 1
+            self.completed += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "pending": self.pending,
+            "max_pending": self.max_pending,
+            "max_seen": self.max_seen,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "busy_s": round(self.busy, 3),
+        }
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait)
+
+
+class StoreLanes:
+    def __init__(self, read_workers: int = READ_WORKERS, read_queue: int = READ_QUEUE,
+                 write_queue: int = WRITE_QUEUE):
+        self.read = Lane("read", read_workers, read_queue)
+        self.write = Lane("write", 1, write_queue)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {"read": self.read.stats(), "write": self.write.stats()}
+
+    def shutdown(self, wait: bool = True):
+        self.read.shutdown(wait)
+        self.write.shutdown(wait)
+
+
+class AsyncLedger:
+    def __init__(self, ledger: LedgerManager, lanes: StoreLanes):
+        self.ledger = ledger
+        self.lanes = lanes
+
+    async def add_transaction(self, user_id: str, amount: int, transaction_type: str, reference_id: str,
+                              metadata: Dict[str, Any] = None, created_at: datetime = None) -> Dict[str, Any]:
+        return await self.lanes.write.run(self.ledger.add_transaction, user_id, amount, transaction_type,
+                                          reference_id, metadata, created_at)
+
+    async def get_balance(self, user_id: str) -> int:
+        return await self.lanes.read.run(self.ledger.get_balance, user_id)
+
+    async def get_lifetime_earned(self, user_id: str) -> int:
+        return await self.lanes.read.run(self.ledger.get_lifetime_earned, user_id)
+
+    async def get_last_earn_timestamp(self, user_id: str) -> Optional[datetime]:
+        return await self.lanes.read.run(self.ledger.get_last_earn_timestamp, user_id)
+
+    async def get_revision(self, user_id: str) -> int:
+        return await self.lanes.read.run(self.ledger.get_revision, user_id)
+
+
+class AsyncUserState:
+    def __init__(self, user_state: UserStateManager, lanes: StoreLanes):
+        self.user_state = user_state
+        self.lanes = lanes
+
+    async def mark_opened(self, user_id: str, offer_id: str) -> Dict[str, Any]:
+        return await self.lanes.write.run(self.user_state.mark_opened, user_id, offer_id)
+
+    async def get_opened_set(self, user_id: str) -> Set[str]:
+        return await self.lanes.read.run(self.user_state.get_opened_set, user_id)
+
+    async def has_opened(self, user_id: str, offer_id: str) -> bool:
+        return await self.lanes.read.run(self.user_state.has_opened, user_id, offer_id)
+
+    async def get_revision(self, user_id: str) -> int:
+        return await self.lanes.read.run(self.user_state.get_revision, user_id)
+
+
+class AsyncInventory:
+    """
+    The inventory is an in-memory dict rewritten to JSON on every claim. Reads go
+    through the writer lane too: it is the only thread that mutates the dict, and reads are memory-only.
+    """
+
+    def __init__(self, inventory: InventoryManager, lanes: StoreLanes):
+        self.inventory = inventory
+        self.lanes = lanes
+
+    async def claim_loot(self, loot: List[GameOffer]):
+        return await self.lanes.write.run(self.inventory.claim_loot, loot)
+
+    async def add_loot(self, item: GameOffer):
+        return await self.lanes.write.run(self.inventory.add_loot, item)
+
+    async def filter_new_loot(self, loot: List[GameOffer]) -> List[GameOffer]:
+        return await self.lanes.write.run(self.inventory.filter_new_loot, loot)
+
+    async def get_all_loot(self) -> List[dict]:
+        return await self.lanes.write.run(self.inventory.get_all_loot)
+
+    async def get_total_value(self) -> float:
+        return await self.lanes.write.run(self.inventory.get_total_value)
+
+
+def install(app: FastAPI, lanes: StoreLanes):
+    """LaneBusy -> 503 with Retry-After, and lanes drained on shutdown."""
+
+    @app.exception_handler(LaneBusy)
+    async def lane_busy(request: Request, exc: LaneBusy):
+        return JSONResponse(status_code=503, headers={"Retry-After": str(RETRY_AFTER)},
+                            content={"status": "busy", "lane": exc.lane, "message": str(exc)})
+
+    app.router.on_shutdown.append(lambda: lanes.shutdown(wait=True))
@@ -0,0 +1,64 @@
+"""
+backend/metrics_api.py
+Request metrics and the Prometheus scrape endpoint.
+Mounted by the web app with:
+    from backend.metrics_api import MetricsMiddleware, router as metrics_router
+    app.add_middleware(MetricsMiddleware)
+    app.include_router(metrics_router)
+"""
+
+import time
+from fastapi import APIRouter, Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from core.metrics import (HTTP_LATENCY, HTTP_REQUESTS, REGISTRY, REQUEST_DB_OPS, REQUEST_DB_TIME,
+                          MetricsRegistry, begin_request, end_request)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+UNMATCHED = "<unmatched>"  # 404s: keeps arbitrary paths out of the label set
+
+router = APIRouter()
+
+
+class MetricsMiddleware:
+    """
+    Plain ASGI (no BaseHTTPMiddleware): nothing is buffered, streaming responses pass through.
+    Routes are labelled by their template (/api/why/{offer_id}), never the raw path.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = [500]
+
+        async def send_wrapper(message: Message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        token = begin_request()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            calls, db_seconds = end_request(token)
+            route = getattr(scope.get("route"), "path", None) or UNMATCHED
+            method = scope["method"]
+            HTTP_REQUESTS.inc(method, route, str(status[0]))
+            HTTP_LATENCY.observe(elapsed, method, route)
+            REQUEST_DB_OPS.observe(calls, route)
+            REQUEST_DB_TIME.observe(db_seconds, route)
+
+
+def render(registry: MetricsRegistry = REGISTRY) -> Response:
+    return Response(content=registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+
+@router.get("/metrics", include_in_schema=False)
+def metrics():
+    return render()
@@ -0,0 +1,29 @@
+"""
+backend/search_api.py
+Search endpoint. Mounted by the web app with:
+    from backend.search_api import router as search_router
+    app.include_router(search_router)
+"""
+
+from typing import Optional
+from fastapi import APIRouter, Query
+from core.search import INVENTORY, OFFER, SearchIndex
+
+router = APIRouter()
+
+_index: Optional[SearchIndex] = None
+
+
+def get_index() -> SearchIndex:
+    global _index
+    if _index is None:
+        _index = SearchIndex()
+    return _index
+
+
+@router.get("/api/search")
+def search(q: str = Query("", max_length=200),
+           limit: int = Query(20, ge=1, le=100),
+           kind: Optional[str] = Query(None, pattern=f"^({OFFER}|{INVENTORY})$")):
+    """Prefix + typo tolerant search over live offers and the user's inventory."""
+    return get_index().search(q, limit=limit, kind=kind)
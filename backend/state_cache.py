@@ -0,0 +1,113 @@
+"""
+backend/state_cache.py
+Versioned, pre-serialized payloads for GET /api/state.
+A user's state only changes when their ledger or opened set changes, when the
+offer catalog moves (change feed head), or when relative times ("2h ago") roll
+over. Those four numbers form the ETag; the JSON and its gzip form are built
+once per version, and repeat polls with If-None-Match get a bodiless 304.
+
+Wiring (backend/main.py):
+    state_cache = StatePayloadCache(build_state, ledger, user_state, feed)
+
+    @app.get("/api/state")
+    def api_state(request: Request):
+        return state_cache.response(request, USER_ID)
+"""
+
+import gzip
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Optional, Tuple
+from fastapi import Request, Response
+from core.changefeed import ChangeFeed
+from core.ledger import LedgerManager
+from core.state import UserStateManager
+
+TIME_BUCKET = 60.0       # Seconds: relative timestamps in the payload are minute-accurate
+MAX_USERS = 1024         # Cached payloads kept (LRU)
+GZIP_MIN_BYTES = 512     # Not worth compressing below this
+
+
+@dataclass
+class CachedPayload:
+    etag: str
+    body: bytes
+    gzipped: Optional[bytes]
+
+
+class StatePayloadCache:
+    def __init__(self, build: Callable[[str], dict], ledger: LedgerManager,
+                 user_state: UserStateManager, feed: ChangeFeed,
+                 time_bucket: float = TIME_BUCKET, max_users: int = MAX_USERS,
+                 clock: Callable[[], float] = time.time):
+        self.build = build
+        self.ledger = ledger
+        self.user_state = user_state
+        self.feed = feed
+        self.time_bucket = time_bucket
+        self.max_users = max_users
+        self.clock = clock
+        self._payloads: "OrderedDict[str, CachedPayload]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.builds = 0
+
+    def version(self, user_id: str) -> Tuple[int, int, int, int]:
+        """(catalog, ledger, opened, time bucket). Four indexed lookups, no payload work."""
+        return (
+            self.feed.last_seq(),
+            self.ledger.get_revision(user_id),
+            self.user_state.get_revision(user_id),
+            int(self.clock() // self.time_bucket) if self.time_bucket > 0 else 0,
+        )
+
+    def etag(self, user_id: str) -> str:
+        # Weak: the gzip and identity bodies are the same representation
+        return 'W/"{}.{}.{}.{}"'.format(*self.version(user_id))
+
+    def get(self, user_id: str, etag: Optional[str] = None) -> CachedPayload:
+        etag = etag or self.etag(user_id)
+        with self._lock:
+            cached = self._payloads.get(user_id)
+            if cached is not None and cached.etag == etag:
+                self._payloads.move_to_end(user_id)
+                self.hits += 1
+                return cached
+
+        # Built outside the lock: one slow user must not stall everyone else's polls
+        body = json.dumps(self.build(user_id), separators=(",", ":"), default=str).encode("utf-8")
+        gzipped = gzip.compress(body, compresslevel=6, mtime=0) if len(body) >= GZIP_MIN_BYTES else None
+        cached = CachedPayload(etag=etag, body=body, gzipped=gzipped)
+        with self._lock:
+            self.builds += 1
+            self._payloads[user_id] = cached
+            self._payloads.move_to_end(user_id)
+            while len(self._payloads) > self.max_users:
+                self._payloads.popitem(last=False)
+        return cached
+
+    def invalidate(self, user_id: Optional[str] = None):
+        """Drops cached payloads (all users when user_id is None). Revisions normally make this unnecessary."""
+        with self._lock:
+            if user_id is None:
+                self._payloads.clear()
+            else:
+                self._payloads.pop(user_id, None)
+
+    def response(self, request: Request, user_id: str) -> Response:
+        headers = {"Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+        etag = self.etag(user_id)
+        if_none_match = request.headers.get("if-none-match", "")
+        if etag in (tag.strip() for tag in if_none_match.split(",")):
+            headers["ETag"] = etag
+            return Response(status_code=304, headers=headers)
+
+        payload = self.get(user_id, etag)
+        headers["ETag"] = payload.etag
+        if payload.gzipped is not None and "gzip" in request.headers.get("accept-encoding", ""):
+            headers["Content-Encoding"] = "gzip"
+            return Response(content=payload.gzipped, media_type="application/json", headers=headers)
+        return Response(content=payload.body, media_type="application/json", headers=headers)
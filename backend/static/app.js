@@ -6,6 +6,7 @@ let state = {
     activeCard: 0,
     rails: [],
     showInfo: false,
+    why: {},  // offer_id -> explanation, prefetched per rail
 };
 
 // --- DOM ELEMENTS ---
@@ -21,12 +22,7 @@ function init() {
         console.log("Ignition: ZeroCrate Cinematic Engine");
 
         // 1. Hydrate State from DOM (SSR Ground Truth)
-        const railEls = document.querySelectorAll('.rail');
-        state.rails = Array.from(railEls).map(el => ({
-            id: el.dataset.railId,
-            element: el,
-            cards: Array.from(el.querySelectorAll('.z-card'))
-        }));
+        hydrateRails();
 
         // 2. Initial Focus
         if (state.rails.length > 0 && state.rails[0].cards.length > 0) {
@@ -72,7 +68,13 @@ function init() {
             }
         });
 
-        // 4. Update Diagnostics
+        // 4. Prefetch explanations so the info modal opens instantly
+        prefetchWhy();
+
+        // 5. Live Updates (SSE)
+        connectLive();
+
+        // 6. Update Diagnostics
         diagJsStatus.innerHTML = '<span style="color:#10b981">ON (Key+Mouse)</span>';
 
     } catch (e) {
@@ -81,6 +83,152 @@ function init() {
     }
 }
 
+function hydrateRails() {
+    const railEls = document.querySelectorAll('.rail');
+    state.rails = Array.from(railEls).map(el => ({
+        id: el.dataset.railId,
+        element: el,
+        cards: Array.from(el.querySelectorAll('.z-card'))
+    }));
+}
+
+// One batched request per rail; misses fall back to GET /api/why/{id} when the modal opens
+async function prefetchWhy() {
+    for (const rail of state.rails) {
+        const ids = rail.cards.map(c => c.dataset.id).filter(id => !(id in state.why));
+        if (ids.length === 0) continue;
+        try {
+            const res = await fetch(`/api/why?ids=${ids.map(encodeURIComponent).join(',')}`);
+            if (!res.ok) continue;
+            const data = await res.json();
+            Object.assign(state.why, data.explanations);
+        } catch (e) {
+            console.warn("Why prefetch failed", e);
+        }
+    }
+}
+
+function renderWhy(data) {
+    infoBody.innerHTML = `
+        <div><span style="color:#888;font-size:0.7rem;">SIGNAL ORIGIN</span><br>${escapeHtml(data.title)}</div>
+        <div><span style="color:#888;font-size:0.7rem;">REASON</span><br><span style="color:#10b981">${escapeHtml(data.reason)}</span></div>
+        <div><span style="color:#888;font-size:0.7rem;">CONFIDENCE</span><br>${escapeHtml(data.confidence)}</div>
+    `;
+}
+
+// --- LIVE UPDATES ---
+// One EventSource per tab; the browser reconnects (with Last-Event-ID) on its own.
+function connectLive() {
+    if (!window.EventSource) return;
+    const source = new EventSource('/api/events');
+
+    source.addEventListener('offer_added', (e) => placeCard(JSON.parse(e.data)));
+    source.addEventListener('offer_changed', (e) => placeCard(JSON.parse(e.data)));
+    source.addEventListener('offer_removed', (e) => removeCard(JSON.parse(e.data).offer_id));
+    source.addEventListener('balance', (e) => {
+        const data = JSON.parse(e.data);
+        if (data.collection_value !== undefined) {
+            heroValueDisplay.innerText = "$" + data.collection_value.toFixed(2);
+        }
+        const streakEl = document.querySelector('.streak-active');
+        if (streakEl && data.streak) streakEl.innerText = `Streak ${data.streak.age_text}`;
+    });
+    // Server dropped events for us (slow tab, or we were away too long): take a fresh SSR snapshot
+    source.addEventListener('resync', () => window.location.reload());
+}
+
+function escapeHtml(text) {
+    const div = document.createElement('div');
+    div.innerText = text == null ? '' : String(text);
+    return div.innerHTML;
+}
+
+// Mirrors the card markup in templates/index.html
+function buildCard(offer) {
+    const el = document.createElement('div');
+    const variant = offer.offer_type === 'Mystery' ? 'z-card-mystery' : (offer.opened ? 'z-card-opened' : 'z-card-idle');
+    el.className = `z-card ${variant}`;
+    el.dataset.id = offer.id;
+    el.dataset.url = offer.url || '';
+    const art = offer.cover_image_url
+        ? `<img src="${escapeHtml(offer.cover_image_url)}" alt="${escapeHtml(offer.title)} cover art"
+               onerror="this.style.display='none'; this.nextElementSibling.style.display='block';">
+           <div class="card-fallback" style="display:none;"></div>`
+        : `<div class="card-fallback"></div>`;
+    el.innerHTML = `
+        <div class="art-layer">${art}<div class="art-overlay"></div></div>
+        <div class="card-info">
+            <h3 class="card-title">${escapeHtml(offer.title)}</h3>
+            <div class="reveal-on-focus">
+                <div class="meta-left">
+                    <span class="platform-badge">${escapeHtml(offer.platform)}</span>
+                    ${offer.end_time_rel ? `<span class="time-badge">${escapeHtml(offer.end_time_rel)}</span>` : ''}
+                </div>
+                <span class="value-badge">$${Number(offer.original_price || 0).toFixed(2)}</span>
+            </div>
+            <div class="card-actions">
+                <span class="action-prompt">[ENTER] Open</span>
+                <span class="action-prompt">[I] Why</span>
+            </div>
+        </div>`;
+    return el;
+}
+
+// Splices a pushed card into each rail at the position the server computed
+function placeCard(data) {
+    if (!data.card || !data.placement) return;
+    delete state.why[data.offer_id];  // Price or expiry may have moved: refetch its explanation
+    const focused = document.querySelector('.z-card-focused');
+    document.querySelectorAll(`.z-card[data-id="${CSS.escape(data.offer_id)}"]`).forEach(el => {
+        if (!(el.closest('.rail').dataset.railId in data.placement)) el.remove();
+    });
+    Object.entries(data.placement).forEach(([railId, beforeId]) => {
+        const container = document.querySelector(`.rail[data-rail-id="${CSS.escape(railId)}"] .rail-cards-container`);
+        if (!container) return;
+        const existing = container.querySelector(`.z-card[data-id="${CSS.escape(data.offer_id)}"]`);
+        if (existing && existing.classList.contains('z-card-opened')) return;
+        const before = beforeId ? container.querySelector(`.z-card[data-id="${CSS.escape(beforeId)}"]`) : null;
+        // Rails are paged: a card sorting past the rendered page stays off-screen.
+        // Last in the rail only means "append" when the whole rail is rendered.
+        const truncated = Boolean(container.closest('.rail').dataset.nextCursor);
+        if (beforeId ? !before : truncated) {
+            if (existing) existing.remove();
+            return;
+        }
+        const card = buildCard(data.card);
+        if (existing) existing.remove();
+        const empty = container.querySelector('.rail-empty');
+        if (empty) empty.remove();
+        container.insertBefore(card, before);
+    });
+    refreshFocus(focused);
+    prefetchWhy();
+}
+
+function removeCard(offerId) {
+    const focused = document.querySelector('.z-card-focused');
+    document.querySelectorAll(`.z-card[data-id="${CSS.escape(offerId)}"]`).forEach(el => el.remove());
+    refreshFocus(focused);
+}
+
+// Keeps keyboard focus on the same card (or its slot) after the DOM moved under it
+function refreshFocus(previous) {
+    hydrateRails();
+    if (previous && previous.isConnected) {
+        const railIndex = state.rails.findIndex(r => r.cards.includes(previous));
+        if (railIndex !== -1) {
+            state.activeRow = railIndex;
+            state.activeCard = state.rails[railIndex].cards.indexOf(previous);
+        }
+    }
+    if (state.rails.length > 0) {
+        document.querySelectorAll('.z-card-focused').forEach(el => el.classList.remove('z-card-focused'));
+        const rail = state.rails[state.activeRow];
+        const card = rail && rail.cards[Math.min(state.activeCard, rail.cards.length - 1)];
+        if (card) card.classList.add('z-card-focused');
+    }
+}
+
 // --- LOGIC ---
 function updateFocus() {
     // Clear old focus
@@ -192,16 +340,20 @@ async function showWhy() {
     const offerId = card.dataset.id;
     state.showInfo = true;
     infoModal.classList.remove('hidden');
+
+    // Prefetched: no round trip
+    if (state.why[offerId]) {
+        renderWhy(state.why[offerId]);
+        return;
+    }
     infoBody.innerHTML = "Accessing Signal Intelligence...";
 
     try {
-        const res = await fetch(`/api/why/${offerId}`);
+        const res = await fetch(`/api/why/${encodeURIComponent(offerId)}`);
+        if (!res.ok) throw new Error(`HTTP ${res.status}`);
         const data = await res.json();
-        infoBody.innerHTML = `
-            <div><span style="color:#888;font-size:0.7rem;">SIGNAL ORIGIN</span><br>${data.title}</div>
-            <div><span style="color:#888;font-size:0.7rem;">REASON</span><br><span style="color:#10b981">${data.reason}</span></div>
-            <div><span style="color:#888;font-size:0.7rem;">CONFIDENCE</span><br>${data.confidence}</div>
-        `;
+        state.why[offerId] = data;
+        renderWhy(data);
     } catch (e) {
         infoBody.innerHTML = "Signal Lost.";
     }
@@ -0,0 +1,68 @@
+"""
+backend/why_api.py
+Explanation endpoints ("Why is this here?"), served from the precomputed ExplanationStore.
+Mounted by the web app with:
+    from backend.why_api import router as why_router
+    app.include_router(why_router)
+"""
+
+import hashlib
+from typing import Iterable, Optional
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from core.explain import ExplanationStore
+
+router = APIRouter()
+
+MAX_BATCH = 100
+# Explanations change whenever the offer does: the browser revalidates every time, and the
+# ETag (built from the offers' fingerprints) turns unchanged answers into bodiless 304s
+CACHE_CONTROL = "private, no-cache"
+
+_store: Optional[ExplanationStore] = None
+
+
+def get_store() -> ExplanationStore:
+    global _store
+    if _store is None:
+        _store = ExplanationStore()
+    return _store
+
+
+def _etag(parts: Iterable[str]) -> str:
+    return '"' + hashlib.blake2b("|".join(parts).encode("utf-8"), digest_size=8).hexdigest() + '"'
+
+
+def _not_modified(request: Request, response: Response, etag: str) -> Optional[Response]:
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    response.headers["ETag"] = etag
+    if etag in (tag.strip() for tag in request.headers.get("if-none-match", "").split(",")):
+        return Response(status_code=304, headers={"Cache-Control": CACHE_CONTROL, "ETag": etag})
+    return None
+
+
+@router.get("/api/why")
+def why_batch(request: Request, response: Response, ids: str = Query(..., max_length=8000)):
+    """Explanations for many offers (e.g. a whole rail) in one round trip: ?ids=a,b,c"""
+    offer_ids = list(dict.fromkeys(i for i in (part.strip() for part in ids.split(",")) if i))
+    if len(offer_ids) > MAX_BATCH:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH} ids per request.")
+    entries = get_store().get_entries(offer_ids)
+    # Missing ids are part of the tag too: one appearing later must not revalidate to a 304
+    etag = _etag(f"{i}:{entries[i][0] if i in entries else '-'}" for i in offer_ids)
+    not_modified = _not_modified(request, response, etag)
+    if not_modified:
+        return not_modified
+    return {"explanations": {i: payload for i, (_, payload) in entries.items()},
+            "missing": [i for i in offer_ids if i not in entries]}
+
+
+@router.get("/api/why/{offer_id}")
+def why(offer_id: str, request: Request, response: Response):
+    entry = get_store().get_entries([offer_id]).get(offer_id)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Signal not analysed yet.")
+    fingerprint, explanation = entry
+    not_modified = _not_modified(request, response, f'"{fingerprint}"')
+    if not_modified:
+        return not_modified
+    return explanation
@@ -0,0 +1,202 @@
+"""
+core/changefeed.py
+Offer Change Feed.
+Diffs each mining cycle against the previous snapshot (by canonical offer ID) and
+appends ADDED / REMOVED / CHANGED events with sequence numbers, so consumers only
+process deltas and can resume from a cursor after a restart.
+"""
+
+import json
+import os
+import sqlite3
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Any
+from core.models import GameOffer
+
+CHANGEFEED_DB_PATH = "data/changefeed.db"
+
+ADDED = "ADDED"
+REMOVED = "REMOVED"
+CHANGED = "CHANGED"
+
+# Fields whose change is worth an event (price moves, expiry extended)
+TRACKED_FIELDS = ("original_price", "discount_price", "end_time")
+
+
+@dataclass
+class ChangeEvent:
+    seq: int
+    offer_id: str
+    kind: str
+    payload: Dict[str, Any]  # Offer dict; CHANGED events also carry 'changes': {field: [old, new]}
+    created_at: str
+
+    @property
+    def offer(self) -> GameOffer:
+        return GameOffer.from_dict(self.payload)
+
+
+class ChangeFeed:
+    def __init__(self, db_path: str = CHANGEFEED_DB_PATH):
+        self.db_path = db_path
+        self._ensure_db()
+
+    def _ensure_db(self):
+        if os.path.dirname(self.db_path):
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            # Last known state of every live offer, owned by the producer that first reported it
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS offer_snapshot (
+                    offer_id TEXT PRIMARY KEY,
+                    producer TEXT NOT NULL,
+                    payload TEXT NOT NULL
+                )
+            """)
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_snapshot_producer ON offer_snapshot(producer)")
+            # Append-only event log; seq is the resume cursor
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS offer_changes (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    offer_id TEXT NOT NULL,
+                    kind TEXT NOT NULL CHECK(kind IN ('ADDED', 'REMOVED', 'CHANGED')),
+                    payload TEXT NOT NULL,
+                    created_at TEXT NOT NULL
+                )
+            """)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS feed_cursors (
+                    consumer TEXT PRIMARY KEY,
+                    seq INTEGER NOT NULL
+                )
+            """)
+            conn.commit()
+
+    def record_cycle(self, offers: Iterable[GameOffer], producer: str = "default", prune: bool = True) -> List[ChangeEvent]:
+        """
+        Diffs a cycle's offers against the snapshot and appends the resulting events.
+        Removals are scoped to `producer` (the miner that ran the cycle): a Steam cycle must
+        not 'remove' Epic offers. A producer reporting a partial cycle passes prune=False.
+        An offer another producer already owns is left to that producer: re-owning it here
+        would make each owner's prune remove it in turn.
+        """
+        current = {}
+        for offer in offers:
+            current[offer.offer_id] = offer.to_dict()
+
+        created_at = datetime.utcnow().isoformat()
+        pending = []
+
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        try:
+            # Single writer for the whole diff so concurrent cycles can't interleave
+            conn.execute("BEGIN IMMEDIATE")
+            previous = {}
+            if prune:
+                rows = conn.execute(
+                    "SELECT offer_id, payload FROM offer_snapshot WHERE producer = ?", (producer,)
+                ).fetchall()
+                previous = {offer_id: json.loads(payload) for offer_id, payload in rows}
+            # The same offer may already be known via another producer
+            outside = set(current) - set(previous)
+            if outside:
+                placeholders = ",".join("?" * len(outside))
+                rows = conn.execute(
+                    f"SELECT offer_id, producer, payload FROM offer_snapshot WHERE offer_id IN ({placeholders})",
+                    tuple(outside)
+                ).fetchall()
+                for offer_id, owner, payload in rows:
+                    if owner == producer:  # Ours, but not loaded because prune=False
+                        previous[offer_id] = json.loads(payload)
+                    else:
+                        del current[offer_id]
+
+            for offer_id, data in current.items():
+                old = previous.get(offer_id)
+                if old is None:
+                    pending.append((offer_id, ADDED, data))
+                    continue
+                changes = {f: [old.get(f), data.get(f)] for f in TRACKED_FIELDS if old.get(f) != data.get(f)}
+                if changes:
+                    pending.append((offer_id, CHANGED, dict(data, changes=changes)))
+
+            for offer_id, old in list(previous.items()):
+                if prune and offer_id not in current:
+                    pending.append((offer_id, REMOVED, old))
+
+            events = []
+            for offer_id, kind, payload in pending:
+                cursor = conn.execute(
+                    "INSERT INTO offer_changes (offer_id, kind, payload, created_at) VALUES (?, ?, ?, ?)",
+                    (offer_id, kind, json.dumps(payload), created_at)
+                )
+                events.append(ChangeEvent(cursor.lastrowid, offer_id, kind, payload, created_at))
+                if kind == REMOVED:
+                    conn.execute("DELETE FROM offer_snapshot WHERE offer_id = ?", (offer_id,))
+                else:
+                    snapshot = current[offer_id]
+                    conn.execute(
+                        "INSERT OR REPLACE INTO offer_snapshot (offer_id, producer, payload) VALUES (?, ?, ?)",
+                        (offer_id, producer, json.dumps(snapshot))
+                    )
+            conn.execute("COMMIT")
+            return events
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def read(self, since: int = 0, limit: int = 500) -> List[ChangeEvent]:
+        """Events with seq > since, oldest first."""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT seq, offer_id, kind, payload, created_at FROM offer_changes WHERE seq > ? ORDER BY seq LIMIT ?",
+                (since, limit)
+            )
+            return [ChangeEvent(seq, offer_id, kind, json.loads(payload), created_at)
+                    for seq, offer_id, kind, payload, created_at in cursor.fetchall()]
+
+    def last_seq(self) -> int:
+        """Current head of the feed (doubles as the offer-catalog revision)."""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT COALESCE(MAX(seq), 0) FROM offer_changes")
+            return cursor.fetchone()[0]
+
+    def snapshot(self) -> List[GameOffer]:
+        """All live offers, as of the last recorded cycle."""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT payload FROM offer_snapshot")
+            return [GameOffer.from_dict(json.loads(row[0])) for row in cursor.fetchall()]
+
+    def get_cursor(self, consumer: str) -> int:
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT seq FROM feed_cursors WHERE consumer = ?", (consumer,))
+            row = cursor.fetchone()
+            return row[0] if row else 0
+
+    def commit_cursor(self, consumer: str, seq: int):
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute(
+                "INSERT INTO feed_cursors (consumer, seq) VALUES (?, ?) "
+                "ON CONFLICT(consumer) DO UPDATE SET seq = MAX(seq, excluded.seq)",
+                (consumer, seq)
+            )
+            conn.commit()
+
+    def consume(self, consumer: str, handler: Callable[[List[ChangeEvent]], None], limit: int = 500) -> int:
+        """
+        Feeds unseen events to `handler`, then advances the consumer's cursor.
+        At-least-once: if the handler raises, the cursor stays put. Returns events handled.
+        """
+        events = self.read(self.get_cursor(consumer), limit)
+        if events:
+            handler(events)
+            self.commit_cursor(consumer, events[-1].seq)
+        return len(events)
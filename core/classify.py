@@ -0,0 +1,84 @@
+"""
+core/classify.py
+The Appraiser: single source of truth for turning raw prices into numbers and
+numbers into Rarity. Every miner (and the ingestion pipeline) classifies through here,
+so a $19.99 game is EPIC no matter which source found it.
+"""
+
+import re
+from bisect import bisect_left
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import List, Sequence, Union
+from core.models import Rarity
+
+# Tier floors are exclusive: > $40 LEGENDARY, > $15 EPIC, > $5 RARE, anything else COMMON
+RARITY_BOUNDS = (5.0, 15.0, 40.0)
+RARITY_TIERS = (Rarity.COMMON, Rarity.RARE, Rarity.EPIC, Rarity.LEGENDARY)
+RARITY_ORDER = (Rarity.COMMON, Rarity.RARE, Rarity.EPIC, Rarity.LEGENDARY, Rarity.HOLOGRAPHIC)
+
+NUMBER_RE = re.compile(r"\d[\d.,'\s ]*")  # First number, thousands separators included
+NON_DIGIT_RE = re.compile(r"\D")
+
+Price = Union[str, int, float, None]
+
+
+@dataclass
+class PriceBatch:
+    prices: List[float]     # Normalized, in currency units
+    rarities: List[Rarity]
+
+
+@lru_cache(maxsize=8192)
+def parse_price(raw: str) -> float:
+    """
+    '$19.99', '59,90€', '₪1,299.00', '1.299,00 zł', 'Free' -> float.
+    Memoized: a catalog repeats the same handful of price strings thousands of times.
+    Anything unparseable is 0.0.
+    """
+    if not raw or "free" in raw.lower():
+        return 0.0
+    match = NUMBER_RE.search(raw)
+    if not match:
+        return 0.0
+    number = re.sub(r"['\s ]", "", match.group()).rstrip(".,")
+
+    # The right-most separator is the decimal point, unless it can only be a thousands
+    # separator: one kind used several times ('1.299.000') or a lone one before 3 digits ('1,200')
+    decimal = max(number.rfind("."), number.rfind(","))
+    if decimal != -1 and not ("." in number and "," in number):
+        sep = number[decimal]
+        if number.count(sep) > 1 or len(number) - decimal - 1 == 3:
+            decimal = -1
+
+    if decimal == -1:
+        return float(NON_DIGIT_RE.sub("", number) or 0)
+    whole = NON_DIGIT_RE.sub("", number[:decimal]) or "0"
+    fraction = NON_DIGIT_RE.sub("", number[decimal + 1:]) or "0"
+    return float(f"{whole}.{fraction}")
+
+
+def rarity_for(price: float) -> Rarity:
+    return RARITY_TIERS[bisect_left(RARITY_BOUNDS, price)]
+
+
+def promote(current: Rarity, candidate: Rarity) -> Rarity:
+    """Keeps the rarer of the two (miner-specific upgrades like Vault → LEGENDARY survive)."""
+    return candidate if RARITY_ORDER.index(candidate) > RARITY_ORDER.index(current) else current
+
+
+def classify_prices(values: Sequence[Price], cents: bool = False) -> PriceBatch:
+    """
+    Batch API: one pass over a whole page or catalog.
+    Strings go through the memoized parser; numbers are taken as currency units,
+    or as cents when cents=True (the Epic API's format). None counts as 0.
+    """
+    parse, bounds, tiers, bisect = parse_price, RARITY_BOUNDS, RARITY_TIERS, bisect_left
+    scale = 100.0 if cents else 1.0
+    prices = [parse(v) if isinstance(v, str) else (v or 0) / scale for v in values]
+    return PriceBatch(prices=prices, rarities=[tiers[bisect(bounds, p)] for p in prices])
+
+
+def classify_price(value: Price, cents: bool = False) -> Rarity:
+    """Single-value convenience wrapper around classify_prices."""
+    return classify_prices([value], cents=cents).rarities[0]
@@ -0,0 +1,143 @@
+"""
+core/explain.py
+Offer Explanations ("Why is this here?").
+An explanation depends only on the offer itself (rarity, source, price and whether
+the price is a Scout estimate), so it is computed once when the offer is ingested
+and stored next to it, keyed by canonical offer ID. /api/why then is a lookup,
+and a whole rail's explanations can be fetched in one query.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from core.changefeed import REMOVED, ChangeEvent, ChangeFeed
+from core.models import GameOffer, Rarity
+
+EXPLAIN_DB_PATH = "data/explanations.db"
+
+RARITY_REASONS = {
+    Rarity.COMMON: "Small freebie",
+    Rarity.RARE: "Solid pickup",
+    Rarity.EPIC: "Notable drop",
+    Rarity.LEGENDARY: "Premium title given away",
+    Rarity.HOLOGRAPHIC: "Critically acclaimed title given away",
+}
+
+
+def _is_estimate(offer: GameOffer) -> bool:
+    # Scout reads RSS, which has no prices: its values are platform averages
+    return (offer.platform_id or "").startswith("scout_")
+
+
+def explain(offer: GameOffer) -> Dict[str, Any]:
+    """The /api/why record for one offer: {offer_id, title, reason, confidence, rarity, value, estimated}."""
+    estimated = _is_estimate(offer)
+    value = f"${offer.original_price:.2f}"
+    if estimated:
+        reason = f"Spotted by Scout on {offer.source}. Value estimated at ~{value} from the platform average."
+        confidence = "Medium"
+    else:
+        reason = f"{RARITY_REASONS.get(offer.rarity, 'Free drop')}: {value} on {offer.source}, yours for $0.00."
+        confidence = "High"
+    if isinstance(offer.end_time, datetime):
+        reason += f" Free until {offer.end_time.strftime('%b %d %H:%M')} UTC."
+    if "mystery" in offer.title.lower():
+        reason = "Mystery game: the title is revealed when the giveaway unlocks."
+        confidence = "Low"
+    return {
+        "offer_id": offer.offer_id,
+        "title": offer.title,
+        "reason": reason,
+        "confidence": confidence,
+        "rarity": offer.rarity.value,
+        "value": offer.original_price,
+        "estimated": estimated,
+    }
+
+
+def _fingerprint(offer: GameOffer) -> str:
+    return hashlib.sha1(json.dumps(offer.to_dict(), sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+class ExplanationStore:
+    def __init__(self, db_path: str = EXPLAIN_DB_PATH):
+        self.db_path = db_path
+        self._ensure_db()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def _ensure_db(self):
+        if os.path.dirname(self.db_path):
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS explanations (
+                    offer_id TEXT PRIMARY KEY,
+                    fingerprint TEXT NOT NULL,
+                    payload TEXT NOT NULL
+                )
+            """)
+
+    # --- Writes (ingestion side) ---
+
+    def _upsert(self, conn: sqlite3.Connection, offers: Iterable[GameOffer]):
+        # Unchanged offers (same fingerprint) are skipped by the WHERE clause
+        conn.executemany("""
+            INSERT INTO explanations (offer_id, fingerprint, payload) VALUES (?, ?, ?)
+            ON CONFLICT(offer_id) DO UPDATE SET fingerprint = excluded.fingerprint, payload = excluded.payload
+            WHERE fingerprint != excluded.fingerprint
+        """, [(offer.offer_id, _fingerprint(offer), json.dumps(explain(offer))) for offer in offers])
+
+    def record(self, offers: Iterable[GameOffer]):
+        with self._connect() as conn:
+            self._upsert(conn, offers)
+
+    def apply_events(self, events: List[ChangeEvent]):
+        """Applies change feed events in order: one transaction per batch."""
+        with self._connect() as conn:
+            for event in events:
+                if event.kind == REMOVED:
+                    conn.execute("DELETE FROM explanations WHERE offer_id = ?", (event.offer_id,))
+                else:
+                    self._upsert(conn, [event.offer])
+
+    def sync_changefeed(self, feed: ChangeFeed, consumer: str = "explain", batch: int = 500) -> int:
+        """Catches up with the change feed from this store's cursor. Returns events applied."""
+        applied = 0
+        while True:
+            handled = feed.consume(consumer, self.apply_events, limit=batch)
+            applied += handled
+            if handled < batch:
+                return applied
+
+    # --- Reads ---
+
+    def get(self, offer_id: str) -> Optional[Dict[str, Any]]:
+        entry = self.get_entries([offer_id]).get(offer_id)
+        return entry[1] if entry else None
+
+    def get_many(self, offer_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """{offer_id: explanation} for the IDs that are known. One query."""
+        return {offer_id: payload for offer_id, (_, payload) in self.get_entries(offer_ids).items()}
+
+    def get_entries(self, offer_ids: Iterable[str]) -> Dict[str, Tuple[str, Dict[str, Any]]]:
+        """{offer_id: (fingerprint, explanation)}: the fingerprint changes whenever the offer does."""
+        offer_ids = list(dict.fromkeys(offer_ids))
+        if not offer_ids:
+            return {}
+        placeholders = ",".join("?" * len(offer_ids))
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT offer_id, fingerprint, payload FROM explanations WHERE offer_id IN ({placeholders})",
+                offer_ids
+            ).fetchall()
+        return {offer_id: (fingerprint, json.loads(payload)) for offer_id, fingerprint, payload in rows}
+
+    def count(self) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM explanations").fetchone()[0]
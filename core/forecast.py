@@ -0,0 +1,106 @@
+"""
+core/forecast.py
+Oracle Forecast Store.
+Persists upcoming free-game unlocks keyed by (game, start time) so the mining
+service can arm a refresh for the exact moment each one goes live.
+"""
+
+import os
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+FORECAST_DB_PATH = "data/forecast.db"
+
+
+@dataclass
+class Forecast:
+    game: str
+    starts_at: Optional[datetime]  # UTC, None if Epic sent an unparseable date
+    ends_at: Optional[datetime] = None
+    value: str = "Unknown Value"
+    image: Optional[str] = None
+    starts_at_raw: Optional[str] = None
+
+    def to_intel(self) -> Dict[str, Any]:
+        """The Oracle's public JSON shape."""
+        return {
+            "game": self.game,
+            "unlocks_at": self.starts_at.strftime("%Y-%m-%d %H:%M") if self.starts_at else self.starts_at_raw,
+            "value": self.value,
+            "image": self.image
+        }
+
+
+def _ts(dt: Optional[datetime]) -> Optional[float]:
+    if dt is None:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+def _dt(ts: Optional[float]) -> Optional[datetime]:
+    return datetime.fromtimestamp(ts, timezone.utc) if ts is not None else None
+
+
+class ForecastStore:
+    def __init__(self, db_path: str = FORECAST_DB_PATH):
+        self.db_path = db_path
+        self._ensure_db()
+
+    def _connect(self):
+        import sqlite3  # Lazy: the Oracle Lambda imports Forecast, never the store
+
+        return sqlite3.connect(self.db_path)
+
+    def _ensure_db(self):
+        if os.path.dirname(self.db_path):
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        with self._connect() as conn:
+            cursor = conn.cursor()
+            # Times are epoch seconds (UTC) so range scans use the index directly
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS forecasts (
+                    game TEXT NOT NULL,
+                    starts_at REAL NOT NULL,
+                    ends_at REAL,
+                    value TEXT,
+                    image TEXT,
+                    recorded_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (game, starts_at)
+                )
+            """)
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_forecasts_starts ON forecasts(starts_at)")
+            conn.commit()
+
+    def record(self, forecasts: Iterable[Forecast]) -> int:
+        """Upserts forecasts. Ones without a start time can't be scheduled and are skipped."""
+        rows = [(f.game, _ts(f.starts_at), _ts(f.ends_at), f.value, f.image)
+                for f in forecasts if f.starts_at is not None]
+        with self._connect() as conn:
+            conn.executemany("""
+                INSERT INTO forecasts (game, starts_at, ends_at, value, image) VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(game, starts_at) DO UPDATE SET
+                    ends_at = excluded.ends_at, value = excluded.value, image = excluded.image
+            """, rows)
+            conn.commit()
+        return len(rows)
+
+    def _select(self, where: str, params: tuple, limit: int = -1) -> List[Forecast]:
+        with self._connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                f"SELECT game, starts_at, ends_at, value, image FROM forecasts WHERE {where} ORDER BY starts_at LIMIT ?",
+                params + (limit,)
+            )
+            return [Forecast(game=game, starts_at=_dt(starts), ends_at=_dt(ends), value=value, image=image)
+                    for game, starts, ends, value, image in cursor.fetchall()]
+
+    def upcoming(self, after: datetime, limit: int = 50) -> List[Forecast]:
+        """Unlocks strictly after `after`, soonest first."""
+        return self._select("starts_at > ?", (_ts(after),), limit)
+
+    def between(self, start: datetime, end: datetime) -> List[Forecast]:
+        """Unlocks in (start, end]: what went live since the last poll."""
+        return self._select("starts_at > ? AND starts_at <= ?", (_ts(start), _ts(end)))
@@ -3,6 +3,7 @@ import os
 from typing import List, Dict
 from datetime import datetime
 from core.models import GameOffer
+from core.profiling import profiled
 
 INVENTORY_FILE = "inventory.json"
 
@@ -23,6 +24,7 @@ class InventoryManager:
         with open(INVENTORY_FILE, 'w') as f:
             json.dump(self.inventory, f, indent=4)
 
+    @profiled("inventory", rows=len)
     def filter_new_loot(self, loot: List[GameOffer]) -> List[GameOffer]:
         """Returns only the items that haven't been claimed yet."""
         new_items = []
@@ -32,6 +34,7 @@ class InventoryManager:
                 new_items.append(item)
         return new_items
 
+    @profiled("inventory")
     def claim_loot(self, loot: List[GameOffer]):
         """Adds new items to the inventory."""
         for item in loot:
@@ -76,6 +79,7 @@ class InventoryManager:
             offers.append(o)
         return offers
 
+    @profiled("inventory", rows=len)
     def get_all_loot(self) -> List[dict]:
         """Returns list of dicts for UI display."""
         return list(self.inventory.values())
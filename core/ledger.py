@@ -3,6 +3,8 @@ import uuid
 import json
 from datetime import datetime
 from typing import Optional, List, Dict, Any
+from core.metrics import db_timed
+from core.profiling import profiled
 
 DB_PATH = "data/zerocrate.db"
 
@@ -15,6 +17,8 @@ class LedgerManager:
         """Initialize the ledger tables if they don't exist."""
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
+        # WAL: readers see the last commit instead of waiting on a writer's lock (persists in the file)
+        cursor.execute("PRAGMA journal_mode=WAL")
         
         # 1. Ledger Entries Table (The Source of Truth)
         cursor.execute('''
@@ -52,6 +56,8 @@ class LedgerManager:
         conn.commit()
         conn.close()
 
+    @profiled("ledger", rows=lambda r: 1 if r.get("status") == "success" else 0)
+    @db_timed("ledger")
     def add_transaction(self, user_id: str, amount: int, transaction_type: str, reference_id: str, metadata: Dict[str, Any] = None, created_at: datetime = None) -> Dict[str, Any]:
         """
         Add a new transaction to the ledger.
@@ -91,6 +97,8 @@ class LedgerManager:
         finally:
             conn.close()
 
+    @profiled("ledger")
+    @db_timed("ledger")
     def get_balance(self, user_id: str) -> int:
         """Calculate current balance by summing all transactions."""
         conn = sqlite3.connect(self.db_path)
@@ -100,6 +108,8 @@ class LedgerManager:
         conn.close()
         return balance
 
+    @profiled("ledger")
+    @db_timed("ledger")
     def get_lifetime_earned(self, user_id: str) -> int:
         """Calculate total lifetime XP earned (ignoring redemption spend)."""
         conn = sqlite3.connect(self.db_path)
@@ -113,6 +123,8 @@ class LedgerManager:
         conn.close()
         return lifetime
 
+    @profiled("ledger")
+    @db_timed("ledger")
     def get_last_earn_timestamp(self, user_id: str) -> Optional[datetime]:
         """Return the timestamp of the last earning activity."""
         conn = sqlite3.connect(self.db_path)
@@ -130,3 +142,17 @@ class LedgerManager:
         if row:
             return datetime.fromisoformat(row[0])
         return None
+
+    @profiled("ledger")
+    @db_timed("ledger")
+    def get_revision(self, user_id: str) -> int:
+        """
+        Monotonic per-user revision: the newest entry's rowid.
+        The ledger is append-only, so any new transaction bumps it (cheap: covered by idx_ledger_user_created).
+        """
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute('SELECT COALESCE(MAX(rowid), 0) FROM ledger_entries WHERE user_id = ?', (user_id,))
+        revision = cursor.fetchone()[0]
+        conn.close()
+        return revision
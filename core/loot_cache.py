@@ -0,0 +1,213 @@
+"""
+core/loot_cache.py
+The Loot Cache: live offers by canonical claim ID (IDGenerator.claim).
+Bounded (LRU) and TTL-evicted. With a db_path it writes through to a shared SQLite
+file, so every uvicorn worker sees the same catalog: a worker that misses locally
+reads the shared copy instead of re-mining, and a commit by any other process
+(PRAGMA data_version) drops this worker's local copies on its next access.
+
+    loot_cache = LootCache(db_path=LOOT_CACHE_DB_PATH)
+    loot_cache.update_many(offers)            # Mining side
+    offer = loot_cache.get(offer_id)          # Any worker
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, Iterator, MutableMapping, Optional, Tuple
+from core.models import GameOffer
+
+LOOT_CACHE_DB_PATH = "data/loot_cache.db"
+
+MAX_ENTRIES = 5000          # Local LRU, per worker
+MAX_SHARED_ENTRIES = 50000  # Shared table; prune() trims it back to this
+TTL = 6 * 3600.0   # Seconds; mining cycles refresh live offers long before this
+
+
+class LootCache(MutableMapping):
+    def __init__(self, maxsize: int = MAX_ENTRIES, ttl: float = TTL, db_path: Optional[str] = None,
+                 clock: Callable[[], float] = time.time, max_shared: int = MAX_SHARED_ENTRIES):
+        self.maxsize = maxsize
+        self.max_shared = max_shared
+        self.ttl = ttl
+        self.db_path = db_path
+        self.clock = clock
+        self._local: "OrderedDict[str, Tuple[float, GameOffer]]" = OrderedDict()  # id -> (expires_at, offer)
+        self._lock = threading.RLock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._data_version: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+        self.shared_reads = 0
+        self.invalidations = 0
+        if db_path:
+            self._ensure_db()
+
+    # --- Shared store ---
+
+    def _ensure_db(self):
+        if os.path.dirname(self.db_path):
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        # One long-lived connection: data_version is per connection and only moves for others' commits
+        self._conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS loot_cache (
+                offer_id TEXT PRIMARY KEY,
+                payload TEXT NOT NULL,
+                expires_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_loot_cache_expires ON loot_cache(expires_at)")
+        self._data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def _check_shared(self):
+        """Drops local copies if another process committed since we last looked. One pragma, no I/O."""
+        if self._conn is None:
+            return
+        version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+        if version != self._data_version:
+            self._data_version = version
+            if self._local:
+                self._local.clear()
+                self.invalidations += 1
+
+    def _write_shared(self, rows: Iterable[Tuple[str, str, float]]):
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._conn.executemany("""
+                INSERT INTO loot_cache (offer_id, payload, expires_at) VALUES (?, ?, ?)
+                ON CONFLICT(offer_id) DO UPDATE SET payload = excluded.payload, expires_at = excluded.expires_at
+            """, rows)
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    def _read_shared(self, offer_id: str) -> Optional[Tuple[float, GameOffer]]:
+        row = self._conn.execute(
+            "SELECT payload, expires_at FROM loot_cache WHERE offer_id = ? AND expires_at > ?",
+            (offer_id, self.clock())
+        ).fetchone()
+        if row is None:
+            return None
+        self.shared_reads += 1
+        return row[1], GameOffer.from_dict(json.loads(row[0]))
+
+    # --- Local LRU ---
+
+    def _remember(self, offer_id: str, expires_at: float, offer: GameOffer):
+        self._local[offer_id] = (expires_at, offer)
+        self._local.move_to_end(offer_id)
+        while len(self._local) > self.maxsize:
+            self._local.popitem(last=False)
+
+    # --- Mapping interface ---
+
+    def __getitem__(self, offer_id: str) -> GameOffer:
+        now = self.clock()
+        with self._lock:
+            self._check_shared()
+            entry = self._local.get(offer_id)
+            if entry is not None:
+                if entry[0] > now:
+                    self._local.move_to_end(offer_id)
+                    self.hits += 1
+                    return entry[1]
+                del self._local[offer_id]
+            if self._conn is not None:
+                entry = self._read_shared(offer_id)
+                if entry is not None:
+                    self._remember(offer_id, *entry)
+                    self.hits += 1
+                    return entry[1]
+            self.misses += 1
+        raise KeyError(offer_id)
+
+    def __setitem__(self, offer_id: str, offer: GameOffer):
+        self.update_many([offer], ids=[offer_id])
+
+    def __delitem__(self, offer_id: str):
+        with self._lock:
+            local = self._local.pop(offer_id, None)
+            deleted = 0
+            if self._conn is not None:
+                deleted = self._conn.execute("DELETE FROM loot_cache WHERE offer_id = ?", (offer_id,)).rowcount
+            if local is None and not deleted:
+                raise KeyError(offer_id)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys_live())
+
+    def __len__(self) -> int:
+        return len(self.keys_live())
+
+    # --- Bulk / maintenance ---
+
+    def update_many(self, offers: Iterable[GameOffer], ids: Optional[Iterable[str]] = None):
+        """Caches offers under their canonical IDs (or the given ones), one shared transaction."""
+        offers = list(offers)
+        ids = list(ids) if ids is not None else [offer.offer_id for offer in offers]
+        expires_at = self.clock() + self.ttl
+        with self._lock:
+            if self._conn is not None:
+                self._write_shared([(offer_id, json.dumps(offer.to_dict()), expires_at)
+                                    for offer_id, offer in zip(ids, offers)])
+                # Picks up other processes' commits first; our own never move data_version
+                self._check_shared()
+            for offer_id, offer in zip(ids, offers):
+                self._remember(offer_id, expires_at, offer)
+
+    def keys_live(self):
+        """Unexpired IDs (from the shared store when there is one)."""
+        now = self.clock()
+        with self._lock:
+            if self._conn is not None:
+                return [row[0] for row in self._conn.execute(
+                    "SELECT offer_id FROM loot_cache WHERE expires_at > ? ORDER BY offer_id", (now,))]
+            return [offer_id for offer_id, (expires_at, _) in self._local.items() if expires_at > now]
+
+    def prune(self) -> int:
+        """
+        Drops expired entries, then trims the shared table to `max_shared` rows (soonest to
+        expire first). Returns how many were removed.
+        """
+        now = self.clock()
+        with self._lock:
+            expired = [k for k, (expires_at, _) in self._local.items() if expires_at <= now]
+            for offer_id in expired:
+                del self._local[offer_id]
+            removed = len(expired)
+            if self._conn is not None:
+                removed = self._conn.execute("DELETE FROM loot_cache WHERE expires_at <= ?", (now,)).rowcount
+                removed += self._conn.execute("""
+                    DELETE FROM loot_cache WHERE offer_id IN (
+                        SELECT offer_id FROM loot_cache ORDER BY expires_at DESC LIMIT -1 OFFSET ?
+                    )
+                """, (self.max_shared,)).rowcount
+            return removed
+
+    def clear(self):
+        with self._lock:
+            self._local.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM loot_cache")
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "local": len(self._local),
+            "hits": self.hits,
+            "misses": self.misses,
+            "shared_reads": self.shared_reads,
+            "invalidations": self.invalidations,
+        }
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
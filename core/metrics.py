@@ -0,0 +1,302 @@
+"""
+core/metrics.py
+Process Metrics (Prometheus text format).
+Counters and histograms are sharded per thread: a thread only ever writes its own
+preallocated cells, so recording takes no lock (the lock is taken once per thread,
+to register its shard). A scrape sums the shards. Shards of finished threads are
+folded into a retired total, so short-lived worker threads don't accumulate.
+
+    with MINER_PHASE.time("steam", "parse"):
+        ...
+    DB_OPS.observe(elapsed, "ledger", "get_balance")
+    REGISTRY.render()  -> text for GET /metrics
+"""
+
+import functools
+import threading
+import time
+import weakref
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+CYCLE_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+COUNT_BUCKETS = (0, 1, 2, 4, 8, 16, 32, 64)
+
+Labels = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Iterable[str], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class _ThreadEnd:
+    """Lives in a thread's local storage; its finalizer runs when the thread is gone."""
+
+
+class _Sharded:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str], width: int):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.width = width  # Cells per label set
+        self._local = threading.local()
+        self._shards: List[Dict[Labels, list]] = []
+        self._retired: Dict[Labels, list] = {}
+        self._lock = threading.Lock()  # Shard registration / retirement only
+
+    def _shard(self) -> Dict[Labels, list]:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = {}
+            end = _ThreadEnd()
+            self._local.shard, self._local.end = shard, end
+            with self._lock:
+                self._shards.append(shard)
+            weakref.finalize(end, self._retire, shard)
+        return shard
+
+    def _cell(self, labels: Labels) -> list:
+        shard = self._shard()
+        cell = shard.get(labels)
+        if cell is None:
+            if len(labels) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {labels}")
+            cell = shard[labels] = [0.0] * self.width
+        return cell
+
+    def _retire(self, shard: Dict[Labels, list]):
+        # The owning thread has exited: nobody writes this shard any more
+        with self._lock:
+            for labels, cell in shard.items():
+                total = self._retired.setdefault(labels, [0.0] * self.width)
+                for i, value in enumerate(cell):
+                    total[i] += value
+            self._shards = [s for s in self._shards if s is not shard]
+
+    def collect(self) -> Dict[Labels, List[float]]:
+        """Sum of all shards, per label set."""
+        with self._lock:
+            shards = list(self._shards)
+            totals = {labels: list(cell) for labels, cell in self._retired.items()}
+        for shard in shards:
+            for _ in range(3):  # The owner may add a label set mid-copy; retry the snapshot
+                try:
+                    items = list(shard.items())
+                    break
+                except RuntimeError:
+                    continue
+            else:
+                items = []
+            for labels, cell in items:
+                total = totals.setdefault(labels, [0.0] * self.width)
+                for i, value in enumerate(cell):
+                    total[i] += value
+        return totals
+
+    def render(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Sharded):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help, labelnames, width=1)
+
+    def inc(self, *labels: str, amount: float = 1.0):
+        self._cell(labels)[0] += amount
+
+    def value(self, *labels: str) -> float:
+        return self.collect().get(labels, [0.0])[0]
+
+    def render(self) -> List[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, labels)} {_number(cell[0])}"
+                for labels, cell in sorted(self.collect().items())]
+
+
+class _Timer:
+    __slots__ = ("histogram", "labels", "start")
+
+    def __init__(self, histogram: "Histogram", labels: Labels):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.start, *self.labels)
+        return False
+
+
+class Histogram(_Sharded):
+    """Cells: one count per bucket (+Inf last), then sum, then count."""
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.bounds = tuple(sorted(buckets))
+        super().__init__(name, help, labelnames, width=len(self.bounds) + 3)
+
+    def observe(self, value: float, *labels: str):
+        cell = self._cell(labels)
+        cell[bisect_left(self.bounds, value)] += 1
+        cell[-2] += value
+        cell[-1] += 1
+
+    def time(self, *labels: str) -> _Timer:
+        return _Timer(self, labels)
+
+    def snapshot(self, *labels: str) -> Dict[str, float]:
+        cell = self.collect().get(labels)
+        if cell is None:
+            return {"count": 0, "sum": 0.0}
+        return {"count": cell[-1], "sum": cell[-2]}
+
+    def render(self) -> List[str]:
+        lines = []
+        for labels, cell in sorted(self.collect().items()):
+            cumulative = 0.0
+            for bound, count in zip(self.bounds + (float("inf"),), cell):
+                cumulative += count
+                le = 'le="{}"'.format("+Inf" if bound == float("inf") else _number(bound))
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {_number(cumulative)}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labels)} {_number(cell[-2])}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, labels)} {_number(cell[-1])}")
+        return lines
+
+
+class Gauge:
+    """Sampled at scrape time from a callback returning {label values: value}."""
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, fn: Callable[[], Dict[Labels, float]], labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.fn = fn
+        self.labelnames = tuple(labelnames)
+
+    def render(self) -> List[str]:
+        try:
+            values = self.fn()
+        except Exception as e:
+            print(f"⚠️  Metrics: gauge {self.name} failed: {e}")
+            return []
+        return [f"{self.name}{_format_labels(self.labelnames, labels)} {_number(value)}"
+                for labels, value in sorted(values.items())]
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing  # Module reloads / repeated wiring get the same series
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help, labelnames))
+
+    def histogram(self, name: str, help: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, help, labelnames, buckets))
+
+    def gauge(self, name: str, help: str, fn: Callable[[], Dict[Labels, float]],
+              labelnames: Sequence[str] = ()) -> Gauge:
+        with self._lock:
+            self._metrics[name] = Gauge(name, help, fn, labelnames)  # Latest wiring wins
+            return self._metrics[name]
+
+    def get(self, name: str):
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+HTTP_REQUESTS = REGISTRY.counter(
+    "zerocrate_http_requests_total", "HTTP requests by route and status.", ("method", "route", "status"))
+HTTP_LATENCY = REGISTRY.histogram(
+    "zerocrate_http_request_duration_seconds", "HTTP request latency by route.", ("method", "route"))
+REQUEST_DB_OPS = REGISTRY.histogram(
+    "zerocrate_http_request_db_operations", "Ledger/state store calls made while serving one request.",
+    ("route",), buckets=COUNT_BUCKETS)
+REQUEST_DB_TIME = REGISTRY.histogram(
+    "zerocrate_http_request_db_seconds", "Time spent in ledger/state store calls per request.", ("route",))
+DB_OPS = REGISTRY.histogram(
+    "zerocrate_db_operation_duration_seconds", "Ledger/state store call latency.", ("manager", "operation"))
+MINER_PHASE = REGISTRY.histogram(
+    "zerocrate_miner_phase_duration_seconds", "Miner fetch/parse durations.", ("miner", "phase"),
+    buckets=CYCLE_BUCKETS)
+MINER_CYCLES = REGISTRY.counter(
+    "zerocrate_miner_cycles_total", "Mining cycles by source and outcome.", ("source", "outcome"))
+
+
+# --- Per-request store accounting ---
+
+# [calls, seconds] for the request being served; the middleware sets it, db_timed adds to it.
+# Threadpool endpoints run in a copy of the context, which still points at the same list.
+_request_db: ContextVar[Optional[list]] = ContextVar("zerocrate_request_db", default=None)
+
+
+def begin_request():
+    """Starts per-request store accounting. Returns a token for end_request()."""
+    return _request_db.set([0, 0.0])
+
+
+def end_request(token) -> Tuple[int, float]:
+    """(store calls, seconds in store calls) since begin_request()."""
+    calls, seconds = _request_db.get() or (0, 0.0)
+    _request_db.reset(token)
+    return calls, seconds
+
+
+def db_timed(manager: str):
+    """Method decorator: latency per (manager, operation), charged to the current request if any."""
+    def decorator(fn):
+        operation = fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                DB_OPS.observe(elapsed, manager, operation)
+                acc = _request_db.get()
+                if acc is not None:
+                    acc[0] += 1
+                    acc[1] += elapsed
+        return wrapper
+    return decorator
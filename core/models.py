@@ -1,6 +1,8 @@
 from dataclasses import dataclass
+from datetime import datetime
 from enum import Enum
-from typing import Optional
+from typing import Optional, Dict, Any
+from core.ids import IDGenerator
 
 class Rarity(Enum):
     COMMON = "COMMON"       # < $5
@@ -30,11 +32,53 @@ class GameOffer:
     def is_free_now(self) -> bool:
         return self.discount_price == 0
 
+    @property
+    def offer_id(self) -> str:
+        """Canonical claim ID (IDGenerator.claim), falling back to the title when there's no platform ID."""
+        return IDGenerator.claim(self.source, self.platform_id or self.title)
+
     @property
     def discount(self) -> int:
         if self.original_price == 0:
             return 0
         return int(((self.original_price - self.discount_price) / self.original_price) * 100)
 
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-safe representation (for persistence, not the UI contract)."""
+        end_time = self.end_time.isoformat() if isinstance(self.end_time, datetime) else self.end_time
+        return {
+            "title": self.title,
+            "original_price": self.original_price,
+            "discount_price": self.discount_price,
+            "description": self.description,
+            "image_url": self.image_url,
+            "store_url": self.store_url,
+            "source": self.source,
+            "platform_id": self.platform_id,
+            "end_time": end_time,
+            "rarity": self.rarity.value,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "GameOffer":
+        end_time = data.get("end_time")
+        if isinstance(end_time, str):
+            try:
+                end_time = datetime.fromisoformat(end_time)
+            except ValueError:
+                pass
+        return cls(
+            title=data["title"],
+            original_price=data["original_price"],
+            discount_price=data["discount_price"],
+            description=data.get("description", ""),
+            image_url=data.get("image_url", ""),
+            store_url=data.get("store_url", ""),
+            source=data["source"],
+            platform_id=data.get("platform_id"),
+            end_time=end_time,
+            rarity=Rarity(data.get("rarity", Rarity.COMMON.value)),
+        )
+
     def __str__(self):
         return f"[{self.rarity.value}] {self.title} (Saved ${self.original_price:.2f})"
@@ -0,0 +1,315 @@
+"""
+core/pipeline.py
+Streaming Offer Ingestion.
+fetch → normalize → classify → dedup → persist → mint, each stage on its own
+worker pool connected by bounded queues. A full queue blocks the stage feeding it,
+so a slow persist step throttles fetching instead of piling offers up in memory.
+Run with: python -m core.pipeline [user_id]
+"""
+
+import html
+import queue
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from core.classify import classify_price, promote
+from core.inventory import InventoryManager
+from core.ledger import LedgerManager
+from core.models import GameOffer, Rarity
+from core.search import SearchIndex
+
+QUEUE_SIZE = 32  # Per-stage inbox capacity: the backpressure bound
+
+# XP minted per claimed offer
+MINT_XP = {
+    Rarity.COMMON: 50,
+    Rarity.RARE: 100,
+    Rarity.EPIC: 200,
+    Rarity.LEGENDARY: 400,
+    Rarity.HOLOGRAPHIC: 500,
+}
+
+WHITESPACE_RE = re.compile(r"\s+")
+
+_DONE = object()  # End-of-stream marker
+
+
+@dataclass
+class Stage:
+    """
+    fn receives one item (or a list when batch_size > 1) and returns the item to
+    pass on, or None to drop it. With fan_out, fn returns an iterable instead and
+    every element is forwarded as soon as it is produced.
+    """
+    name: str
+    fn: Callable[[Any], Any]
+    workers: int = 1
+    batch_size: int = 1
+    fan_out: bool = False
+
+
+@dataclass
+class StageStats:
+    received: int = 0
+    emitted: int = 0
+    dropped: int = 0
+    errors: int = 0
+    busy: float = 0.0       # Seconds spent inside fn, summed over workers
+    blocked: float = 0.0    # Seconds spent waiting on a full downstream queue
+    max_depth: int = 0      # Deepest backlog seen in the stage's inbox
+    last_error: Optional[str] = None
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+
+class Pipeline:
+    def __init__(self, stages: List[Stage], queue_size: int = QUEUE_SIZE):
+        self.stages = stages
+        self.queue_size = queue_size
+        self._stats = {stage.name: StageStats() for stage in stages}
+        self._queues: List[queue.Queue] = []
+        self._started: Optional[float] = None
+        self._finished: Optional[float] = None
+
+    def _busy(self, stats: StageStats, start: float) -> float:
+        now = time.perf_counter()
+        with stats.lock:
+            stats.busy += now - start
+        return now
+
+    def _forward(self, stats: StageStats, outbox: queue.Queue, item: Any):
+        if item is None:
+            with stats.lock:
+                stats.dropped += 1
+            return
+        start = time.perf_counter()
+        outbox.put(item)  # Blocks while downstream is full: this is the backpressure
+        waited = time.perf_counter() - start
+        with stats.lock:
+            stats.emitted += 1
+            stats.blocked += waited
+
+    def _take(self, stage: Stage, inbox: queue.Queue) -> Optional[list]:
+        """Blocks for one item, then greedily tops the batch up. None means end of stream."""
+        item = inbox.get()
+        if item is _DONE:
+            inbox.put(_DONE)  # Let sibling workers see it too
+            return None
+        batch = [item]
+        while len(batch) < stage.batch_size:
+            try:
+                item = inbox.get_nowait()
+            except queue.Empty:
+                break
+            if item is _DONE:
+                inbox.put(_DONE)
+                break
+            batch.append(item)
+        return batch
+
+    def _worker(self, stage: Stage, inbox: queue.Queue, outbox: queue.Queue, remaining: list):
+        stats = self._stats[stage.name]
+        while True:
+            batch = self._take(stage, inbox)
+            if batch is None:
+                break
+            with stats.lock:
+                stats.received += len(batch)
+                stats.max_depth = max(stats.max_depth, inbox.qsize())  # Backlog left behind this take
+
+            start = time.perf_counter()
+            try:
+                result = stage.fn(batch if stage.batch_size > 1 else batch[0])
+                if stage.fan_out:
+                    # Forward as items are produced, so a full queue pauses the producer itself
+                    for item in result or ():
+                        start = self._busy(stats, start)
+                        self._forward(stats, outbox, item)
+                    result = None
+            except Exception as e:
+                self._busy(stats, start)
+                with stats.lock:
+                    stats.errors += len(batch)
+                    stats.last_error = str(e)
+                print(f"⚠️  Pipeline stage '{stage.name}' failed: {e}")
+                continue
+            self._busy(stats, start)
+
+            if stage.fan_out:
+                continue
+            if stage.batch_size > 1:
+                result = list(result or ())
+                with stats.lock:
+                    stats.dropped += len(batch) - len(result)
+                for item in result:
+                    self._forward(stats, outbox, item)
+            else:
+                self._forward(stats, outbox, result)
+
+        # The last worker out closes the stream for the next stage
+        with stats.lock:
+            remaining[0] -= 1
+            last = remaining[0] == 0
+        if last:
+            outbox.put(_DONE)
+
+    def run(self, items: Iterable[Any]) -> List[Any]:
+        """
+        Streams items through every stage and returns what comes out of the last one.
+        If the input iterable raises, the items already fed are drained, then the error is re-raised.
+        """
+        self._started, self._finished = time.perf_counter(), None
+        self._queues = [queue.Queue(maxsize=self.queue_size) for _ in range(len(self.stages) + 1)]
+        feed_error: List[BaseException] = []
+
+        def feed():
+            try:
+                for item in items:
+                    self._queues[0].put(item)
+            except BaseException as e:
+                feed_error.append(e)
+            finally:
+                self._queues[0].put(_DONE)  # Always close the stream, or run() waits forever
+
+        threads = [threading.Thread(target=feed, name="pipeline-feed", daemon=True)]
+        for i, stage in enumerate(self.stages):
+            remaining = [stage.workers]
+            for n in range(stage.workers):
+                threads.append(threading.Thread(
+                    target=self._worker, args=(stage, self._queues[i], self._queues[i + 1], remaining),
+                    name=f"pipeline-{stage.name}-{n}", daemon=True
+                ))
+        for thread in threads:
+            thread.start()
+
+        results = []
+        while True:
+            item = self._queues[-1].get()
+            if item is _DONE:
+                break
+            results.append(item)
+        for thread in threads:
+            thread.join()
+        self._finished = time.perf_counter()
+        if feed_error:
+            raise feed_error[0]
+        return results
+
+    def stats(self) -> Dict[str, dict]:
+        """Per-stage throughput and queue-depth metrics."""
+        end = self._finished or time.perf_counter()
+        elapsed = end - self._started if self._started else 0.0
+        report = {}
+        for i, stage in enumerate(self.stages):
+            s = self._stats[stage.name]
+            with s.lock:
+                report[stage.name] = {
+                    "workers": stage.workers,
+                    "received": s.received,
+                    "emitted": s.emitted,
+                    "dropped": s.dropped,
+                    "errors": s.errors,
+                    "busy_seconds": round(s.busy, 4),
+                    "blocked_seconds": round(s.blocked, 4),
+                    "throughput": round(s.received / s.busy, 1) if s.busy else None,  # Items/s per busy second
+                    "queue_depth": self._queues[i].qsize() if self._queues else 0,
+                    "max_queue_depth": s.max_depth,
+                    "last_error": s.last_error,
+                }
+        report["_total"] = {"elapsed_seconds": round(elapsed, 4), "queue_size": self.queue_size}
+        return report
+
+
+# --- Offer stages ---
+
+def fetch(miner) -> Iterable[GameOffer]:
+    """Fan-out: one miner in, its offers out. Generator miners stream; list miners are handed over whole."""
+    mine = getattr(miner, "mine", None) or miner.fetch_games
+    return mine()
+
+
+def fetch_from(registry) -> Callable[[Any], Iterable[GameOffer]]:
+    """
+    fetch() that also accepts miner names, built through `registry` (a MinerRegistry)
+    on the fetch worker: the miner's module is imported there, and a failing import
+    is a stage error like any other instead of breaking the feed.
+    """
+    def fetch_named(miner) -> Iterable[GameOffer]:
+        if isinstance(miner, str):
+            miner = registry.create(miner)
+        return fetch(miner)
+    return fetch_named
+
+
+def normalize(offer: GameOffer) -> Optional[GameOffer]:
+    """Collapses whitespace/entities in titles and drops anything that isn't free right now."""
+    offer.title = WHITESPACE_RE.sub(" ", html.unescape(offer.title or "")).strip()
+    if not offer.title:
+        return None
+    offer.original_price = max(0.0, float(offer.original_price or 0))
+    offer.discount_price = max(0.0, float(offer.discount_price or 0))
+    if not offer.is_free_now:
+        return None
+    return offer
+
+
+def classify(offer: GameOffer) -> GameOffer:
+    """Price tier rarity. Miners' own upgrades (Vault → LEGENDARY, HOLOGRAPHIC) are kept."""
+    offer.rarity = promote(offer.rarity, classify_price(offer.original_price))
+    return offer
+
+
+def build_offer_pipeline(user_id: str = "local_user", inventory: Optional[InventoryManager] = None,
+                         ledger: Optional[LedgerManager] = None, queue_size: int = QUEUE_SIZE,
+                         fetch_workers: int = 3, persist_batch: int = 16,
+                         search: Optional[SearchIndex] = None, registry=None) -> Pipeline:
+    """Feed it miner instances, or miner names when a registry is given."""
+    inventory = inventory or InventoryManager()
+    ledger = ledger or LedgerManager()
+    seen = set()
+
+    def dedup(offer: GameOffer) -> Optional[GameOffer]:
+        # Single worker: the seen set and the inventory lookup need no lock
+        if offer.offer_id in seen or offer.title in inventory.inventory:
+            return None
+        seen.add(offer.offer_id)
+        return offer
+
+    def persist(batch: List[GameOffer]) -> List[GameOffer]:
+        # Batched so the inventory file is rewritten once per batch, not once per offer
+        inventory.claim_loot(batch)
+        if search is not None:
+            search.index_inventory(inventory.inventory[offer.title] for offer in batch)
+        return batch
+
+    def mint(offer: GameOffer) -> Dict[str, Any]:
+        xp = MINT_XP[offer.rarity]
+        receipt = ledger.add_transaction(user_id, xp, "EARN", offer.offer_id,
+                                         metadata={"title": offer.title, "rarity": offer.rarity.value})
+        return {"offer_id": offer.offer_id, "title": offer.title, "xp": xp, "status": receipt["status"]}
+
+    return Pipeline([
+        Stage("fetch", fetch_from(registry) if registry is not None else fetch, workers=fetch_workers, fan_out=True),
+        Stage("normalize", normalize, workers=2),
+        Stage("classify", classify, workers=2),
+        Stage("dedup", dedup),
+        Stage("persist", persist, batch_size=persist_batch),
+        Stage("mint", mint, workers=2),
+    ], queue_size=queue_size)
+
+
+if __name__ == "__main__":
+    import sys
+    from miners.registry import shared_registry
+
+    registry = shared_registry()
+    pipeline = build_offer_pipeline(sys.argv[1] if len(sys.argv) > 1 else "local_user", search=SearchIndex(),
+                                    registry=registry)
+    # Only names are fed: each miner module is imported by the fetch worker that builds it
+    minted = pipeline.run(registry.names())
+    print(f"🏭 Ingested {len(minted)} new offer(s), {sum(m['xp'] for m in minted if m['status'] == 'success')} XP minted.")
+    for name, s in pipeline.stats().items():
+        if name != "_total":
+            print(f"   {name:<9} in {s['received']:>5}  out {s['emitted']:>5}  dropped {s['dropped']:>4}  "
+                  f"errors {s['errors']:>3}  max depth {s['max_queue_depth']:>3}  busy {s['busy_seconds']:>7}s")
@@ -0,0 +1,286 @@
+"""
+core/profiling.py
+Opt-in Profiling Spans.
+Metrics (core/metrics.py) say *that* store calls or parses got slow; spans say *which*
+one: every instrumented call can emit a structured record (operation, digest of its
+arguments, duration, rows touched) to a pluggable sink. Only sampled calls and calls
+over the slow threshold are emitted.
+
+Disabled (the default), an instrumented call costs one global lookup.
+
+    @profiled("ledger", rows=lambda result: 1)
+    def add_transaction(self, ...): ...
+
+    with span("steam.parse", page) as s:
+        offers = parse(page)
+        s.rows = len(offers)
+
+Enabling:
+    enable(RingBufferSink(), sample_rate=0.01, slow_ms=100)
+or from the environment at import:
+    ZEROCRATE_PROFILE=ring | log | jsonl[:path]
+    ZEROCRATE_PROFILE_SAMPLE=0.01   ZEROCRATE_PROFILE_SLOW_MS=250
+"""
+
+import functools
+import hashlib
+import json
+import logging
+import os
+import random
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+PROFILE_LOG_PATH = "data/profile.jsonl"
+SAMPLE_RATE = 0.01
+SLOW_MS = 250.0
+RING_SIZE = 2048
+
+
+@dataclass
+class Span:
+    operation: str
+    args_digest: str
+    duration_ms: float
+    rows: Optional[int]
+    started_at: float  # Unix time
+    thread: str
+    slow: bool
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def args_digest(args: tuple, kwargs: Dict[str, Any]) -> str:
+    """Short, stable digest of call arguments: groups repeated calls without logging user data."""
+    raw = repr(args) + repr(sorted(kwargs.items())) if kwargs else repr(args)
+    return hashlib.blake2b(raw.encode("utf-8", "replace"), digest_size=6).hexdigest()
+
+
+# --- Sinks ---
+
+class RingBufferSink:
+    """The most recent spans, in memory (e.g. for a debug endpoint)."""
+
+    def __init__(self, size: int = RING_SIZE):
+        self._spans = deque(maxlen=size)  # append() is atomic: no lock needed
+
+    def emit(self, span: Span):
+        self._spans.append(span)
+
+    def spans(self) -> List[Span]:
+        return list(self._spans)
+
+    def slowest(self, limit: int = 20) -> List[Span]:
+        return sorted(self._spans, key=lambda s: s.duration_ms, reverse=True)[:limit]
+
+    def clear(self):
+        self._spans.clear()
+
+
+class JsonlSink:
+    """One JSON object per line, appended to a file."""
+
+    def __init__(self, path: str = PROFILE_LOG_PATH):
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._file = open(path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def emit(self, span: Span):
+        line = json.dumps(span.to_dict(), separators=(",", ":")) + "\n"
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+class LoggerSink:
+    """Spans as log records; the structured span rides along as record.span."""
+
+    def __init__(self, logger: Optional[logging.Logger] = None, level: int = logging.INFO):
+        self.logger = logger or logging.getLogger("zerocrate.profile")
+        self.level = level
+
+    def emit(self, span: Span):
+        self.logger.log(logging.WARNING if span.slow else self.level,
+                        "%s %.2fms rows=%s args=%s%s", span.operation, span.duration_ms, span.rows,
+                        span.args_digest, f" error={span.error}" if span.error else "",
+                        extra={"span": span.to_dict()})
+
+
+# --- Profiler ---
+
+class Profiler:
+    def __init__(self, sink, sample_rate: float = SAMPLE_RATE, slow_ms: Optional[float] = SLOW_MS,
+                 rng: Callable[[], float] = random.random):
+        self.sink = sink
+        self.sample_rate = sample_rate
+        self.slow_ms = slow_ms  # None: no threshold, sampling only
+        self.rng = rng
+        self.emitted = 0
+        self.sink_errors = 0
+
+    def record(self, operation: str, args: tuple, kwargs: Dict[str, Any], started_at: float,
+               elapsed: float, rows: Optional[int] = None, error: Optional[str] = None):
+        duration_ms = elapsed * 1000.0
+        slow = self.slow_ms is not None and duration_ms >= self.slow_ms
+        if not slow and not (self.sample_rate > 0 and self.rng() < self.sample_rate):
+            return
+        span = Span(operation=operation, args_digest=args_digest(args, kwargs),
+                    duration_ms=round(duration_ms, 3), rows=rows, started_at=started_at,
+                    thread=threading.current_thread().name, slow=slow, error=error)
+        try:
+            self.sink.emit(span)
+            self.emitted += 1
+        except Exception as e:
+            # Profiling must never fail the call it observes; complain once
+            self.sink_errors += 1
+            if self.sink_errors == 1:
+                print(f"⚠️  Profiling sink failed: {e}")
+
+
+_active: Optional[Profiler] = None
+
+
+def enable(sink, sample_rate: float = SAMPLE_RATE, slow_ms: Optional[float] = SLOW_MS) -> Profiler:
+    global _active
+    _active = Profiler(sink, sample_rate=sample_rate, slow_ms=slow_ms)
+    return _active
+
+
+def disable():
+    global _active
+    _active = None
+
+
+def active() -> Optional[Profiler]:
+    return _active
+
+
+def _rows_of(rows: Optional[Callable[[Any], Optional[int]]], result: Any) -> Optional[int]:
+    if rows is None:
+        return None
+    try:
+        return rows(result)
+    except Exception:
+        return None
+
+
+def profiled(manager: str, rows: Optional[Callable[[Any], Optional[int]]] = None):
+    """
+    Method decorator: a span named "<manager>.<method>" per call.
+    `rows(result)` reports rows touched. `self` is left out of the arguments digest.
+    """
+    def decorator(fn):
+        operation = f"{manager}.{fn.__name__}"
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            profiler = _active
+            if profiler is None:
+                return fn(*args, **kwargs)
+            started_at = time.time()
+            start = time.perf_counter()
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                profiler.record(operation, args[1:], kwargs, started_at, time.perf_counter() - start,
+                                error=type(e).__name__)
+                raise
+            profiler.record(operation, args[1:], kwargs, started_at, time.perf_counter() - start,
+                            rows=_rows_of(rows, result))
+            return result
+        return wrapper
+    return decorator
+
+
+class _Span:
+    __slots__ = ("profiler", "operation", "args", "kwargs", "started_at", "start", "rows")
+
+    def __init__(self, profiler: Profiler, operation: str, args: tuple, kwargs: Dict[str, Any]):
+        self.profiler = profiler
+        self.operation = operation
+        self.args = args
+        self.kwargs = kwargs
+        self.rows: Optional[int] = None
+
+    def __enter__(self):
+        self.started_at = time.time()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.profiler.record(self.operation, self.args, self.kwargs, self.started_at,
+                             time.perf_counter() - self.start, rows=self.rows,
+                             error=exc_type.__name__ if exc_type else None)
+        return False
+
+
+class _NoSpan:
+    """Stand-in while profiling is off: accepts .rows and does nothing."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    @property
+    def rows(self):
+        return None
+
+    @rows.setter
+    def rows(self, value):
+        pass
+
+
+_NO_SPAN = _NoSpan()
+
+
+def span(operation: str, *args, **kwargs):
+    """Context manager form of profiled() for a block; set .rows on it to report rows touched."""
+    profiler = _active
+    if profiler is None:
+        return _NO_SPAN
+    return _Span(profiler, operation, args, kwargs)
+
+
+def enable_from_env() -> Optional[Profiler]:
+    """
+    ZEROCRATE_PROFILE=ring | log | jsonl[:path]. Unset (or unknown) leaves profiling off.
+    Runs at import: a bad setting warns and leaves profiling off, it never breaks the import.
+    """
+    mode = os.environ.get("ZEROCRATE_PROFILE", "").strip()
+    if not mode:
+        return None
+    kind, _, arg = mode.partition(":")
+    if kind not in ("ring", "log", "jsonl"):
+        print(f"⚠️  Unknown ZEROCRATE_PROFILE sink '{kind}'; profiling stays off")
+        return None
+    try:
+        sample_rate = float(os.environ.get("ZEROCRATE_PROFILE_SAMPLE", SAMPLE_RATE))
+        slow = os.environ.get("ZEROCRATE_PROFILE_SLOW_MS")
+        slow_ms = float(slow) if slow else SLOW_MS
+        if kind == "ring":
+            sink = RingBufferSink(int(arg) if arg else RING_SIZE)
+        elif kind == "log":
+            sink = LoggerSink()
+        else:
+            sink = JsonlSink(arg or PROFILE_LOG_PATH)
+    except (ValueError, OSError) as e:
+        print(f"⚠️  Bad ZEROCRATE_PROFILE settings ({e}); profiling stays off")
+        return None
+    return enable(sink, sample_rate=sample_rate, slow_ms=slow_ms)
+
+
+enable_from_env()
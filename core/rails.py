@@ -0,0 +1,272 @@
+"""
+core/rails.py
+Dashboard Rails Engine.
+Every rail is a pre-sorted index over the offer catalog, kept up to date
+incrementally (bisect insert/delete) as offers are added or removed. Rendering a
+rail walks its index from a cursor and skips opened offers lazily, so a page costs
+O(page size) instead of a full filter + sort of the catalog per request.
+"""
+
+import base64
+import json
+import threading
+from bisect import bisect_left, bisect_right, insort
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Container, Dict, Iterable, List, Optional, Tuple
+from core.changefeed import REMOVED, ChangeEvent, ChangeFeed
+from core.models import GameOffer, Rarity
+
+PAGE_SIZE = 12
+
+SortKey = Tuple[Any, ...]
+
+
+@dataclass
+class RailSpec:
+    id: str
+    title: str
+    accepts: Callable[[GameOffer], bool]
+    sort_key: Callable[[GameOffer], SortKey]  # Ascending; must be JSON-safe (numbers/strings)
+    empty_message: str = "Scout is scanning..."
+    hide_opened: bool = True
+
+
+def _end_ts(offer: GameOffer) -> Optional[float]:
+    end = offer.end_time
+    if isinstance(end, datetime):
+        return (end if end.tzinfo else end.replace(tzinfo=timezone.utc)).timestamp()
+    return None
+
+
+DEFAULT_RAILS = [
+    RailSpec("legendary", "Legendary Drops",
+             lambda o: o.rarity in (Rarity.LEGENDARY, Rarity.HOLOGRAPHIC),
+             lambda o: (-o.original_price, o.title.lower())),
+    RailSpec("ending_soon", "Ending Soon",
+             lambda o: _end_ts(o) is not None,
+             lambda o: (_end_ts(o), o.title.lower()),
+             empty_message="No countdowns running."),
+    RailSpec("top_value", "Biggest Savings",
+             lambda o: True,
+             lambda o: (-o.savings, o.title.lower()),
+             hide_opened=False),
+    RailSpec("epic", "Epic Games Store",
+             lambda o: o.source.startswith("Epic") and not (o.platform_id or "").startswith("scout_"),
+             lambda o: (-o.original_price, o.title.lower()),
+             empty_message="No Epic drops right now."),
+    RailSpec("steam", "Steam Giveaways",
+             lambda o: o.source == "Steam" and not (o.platform_id or "").startswith("scout_"),
+             lambda o: (-o.original_price, o.title.lower()),
+             empty_message="No Steam giveaways right now."),
+    RailSpec("scout", "Scout Finds",
+             lambda o: (o.platform_id or "").startswith("scout_"),
+             lambda o: (o.title.lower(),)),
+]
+
+
+def _encode_cursor(key: SortKey, offer_id: str) -> str:
+    raw = json.dumps([list(key), offer_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> Optional[Tuple[SortKey, str]]:
+    """None for a malformed cursor (truncated, tampered with): the page restarts from the top."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        key, offer_id = json.loads(raw)
+        return tuple(key), str(offer_id)
+    except (ValueError, TypeError):  # binascii.Error and JSONDecodeError are ValueErrors
+        return None
+
+
+def _relative_end(offer: GameOffer, now: datetime) -> Optional[str]:
+    end = _end_ts(offer)
+    if end is None:
+        return None
+    hours = int((end - now.timestamp()) // 3600)
+    if hours < 0:
+        return "Ended"
+    if hours < 1:
+        return "Ends soon"
+    if hours < 48:
+        return f"{hours}h left"
+    return f"{hours // 24}d left"
+
+
+@dataclass
+class RailIndex:
+    spec: RailSpec
+    entries: List[Tuple[SortKey, str]] = field(default_factory=list)  # Sorted (key, offer_id)
+    keys: Dict[str, SortKey] = field(default_factory=dict)
+
+    def add(self, offer_id: str, key: SortKey):
+        if self.keys.get(offer_id) == key:
+            return
+        self.remove(offer_id)
+        insort(self.entries, (key, offer_id))
+        self.keys[offer_id] = key
+
+    def remove(self, offer_id: str):
+        key = self.keys.pop(offer_id, None)
+        if key is not None:
+            del self.entries[bisect_left(self.entries, (key, offer_id))]
+
+
+@dataclass
+class RailPage:
+    cards: List[dict]
+    next_cursor: Optional[str]
+
+
+class RailsEngine:
+    def __init__(self, specs: Optional[List[RailSpec]] = None,
+                 cover_url: Optional[Callable[[str], str]] = None):
+        self.specs = specs or DEFAULT_RAILS
+        self.cover_url = cover_url  # e.g. ImageCache.card_url: serve covers through the local proxy
+        self._rails: Dict[str, RailIndex] = {spec.id: RailIndex(spec) for spec in self.specs}
+        self._offers: Dict[str, GameOffer] = {}
+        self._cards: Dict[str, dict] = {}  # Static part of each card, built once per offer version
+        self._lock = threading.RLock()
+        self.seq = 0  # Change feed position applied so far
+        self._loaded = False
+
+    # --- Incremental maintenance ---
+
+    def upsert(self, offer: GameOffer):
+        offer_id = offer.offer_id
+        with self._lock:
+            self._offers[offer_id] = offer
+            self._cards[offer_id] = {
+                "id": offer_id,
+                "title": offer.title,
+                "url": offer.store_url,
+                "platform": offer.source,
+                "cover_image_url": self.cover_url(offer.image_url) if self.cover_url else offer.image_url,
+                "original_price": offer.original_price,
+                "rarity": offer.rarity.value,
+                "offer_type": "Mystery" if "mystery" in offer.title.lower() else "Game",
+            }
+            for rail in self._rails.values():
+                if rail.spec.accepts(offer):
+                    rail.add(offer_id, rail.spec.sort_key(offer))
+                else:
+                    rail.remove(offer_id)
+
+    def remove(self, offer_id: str):
+        with self._lock:
+            self._offers.pop(offer_id, None)
+            self._cards.pop(offer_id, None)
+            for rail in self._rails.values():
+                rail.remove(offer_id)
+
+    def apply_events(self, events: Iterable[ChangeEvent]):
+        with self._lock:
+            for event in events:
+                if event.kind == REMOVED:
+                    self.remove(event.offer_id)
+                else:
+                    self.upsert(event.offer)
+                self.seq = max(self.seq, event.seq)
+
+    def sync(self, feed: ChangeFeed, batch: int = 500) -> int:
+        """
+        First call loads the feed's snapshot; later calls apply only new events.
+        Events are idempotent upserts/removals, so replaying a few after the snapshot is harmless.
+        """
+        applied = 0
+        with self._lock:
+            if not self._loaded:
+                head = feed.last_seq()
+                for offer in feed.snapshot():
+                    self.upsert(offer)
+                    applied += 1
+                self.seq = max(self.seq, head)
+                self._loaded = True
+            while True:
+                events = feed.read(self.seq, batch)
+                self.apply_events(events)
+                applied += len(events)
+                if len(events) < batch:
+                    return applied
+
+    # --- Reads ---
+
+    def page(self, rail_id: str, hidden: Container[str] = (), cursor: Optional[str] = None,
+             limit: int = PAGE_SIZE, now: Optional[datetime] = None) -> RailPage:
+        """
+        Walks the rail from `cursor`, skipping hidden (opened) offers on the fly.
+        Cursors are the last returned (sort key, offer id), so they stay valid as the rail changes.
+        """
+        now = now or datetime.now(timezone.utc)
+        with self._lock:
+            rail = self._rails[rail_id]
+            start = 0
+            position = _decode_cursor(cursor) if cursor else None
+            if position is not None:
+                try:
+                    start = bisect_right(rail.entries, position)
+                except TypeError:
+                    pass  # Decodes, but its key doesn't compare with this rail's (e.g. another rail's cursor)
+
+            cards, last = [], None
+            for i in range(start, len(rail.entries)):
+                key, offer_id = rail.entries[i]
+                opened = offer_id in hidden
+                if opened and rail.spec.hide_opened:
+                    continue
+                offer = self._offers[offer_id]
+                cards.append(dict(self._cards[offer_id], opened=opened,
+                                  end_time_rel=_relative_end(offer, now)))
+                last = (key, offer_id)
+                if len(cards) == limit:
+                    break
+
+            more = last is not None and bisect_right(rail.entries, last) < len(rail.entries)
+            return RailPage(cards=cards, next_cursor=_encode_cursor(*last) if more else None)
+
+    def card(self, offer_id: str, now: Optional[datetime] = None) -> Optional[dict]:
+        """One offer's card (unopened), for pushing a single insert to live clients."""
+        with self._lock:
+            offer = self._offers.get(offer_id)
+            if offer is None:
+                return None
+            return dict(self._cards[offer_id], opened=False,
+                        end_time_rel=_relative_end(offer, now or datetime.now(timezone.utc)))
+
+    def placement(self, offer_id: str) -> Dict[str, Optional[str]]:
+        """
+        {rail_id: id of the offer it now sits before (None: last)} for every rail holding it.
+        Lets a client splice the card into an already rendered rail without a reload.
+        """
+        with self._lock:
+            placed = {}
+            for rail_id, rail in self._rails.items():
+                key = rail.keys.get(offer_id)
+                if key is None:
+                    continue
+                i = bisect_right(rail.entries, (key, offer_id))
+                placed[rail_id] = rail.entries[i][1] if i < len(rail.entries) else None
+            return placed
+
+    def render(self, hidden: Container[str] = (), limit: int = PAGE_SIZE) -> List[Dict[str, Any]]:
+        """First page of every rail, in the /api/state 'rails' shape."""
+        now = datetime.now(timezone.utc)
+        rails = []
+        for spec in self.specs:
+            page = self.page(spec.id, hidden=hidden, limit=limit, now=now)
+            rails.append({
+                "id": spec.id,
+                "title": spec.title,
+                "cards": page.cards,
+                "empty_message": spec.empty_message,
+                "next_cursor": page.next_cursor,
+            })
+        return rails
+
+    def render_for(self, user_state, user_id: str, limit: int = PAGE_SIZE) -> List[Dict[str, Any]]:
+        """render() with the user's opened set (UserStateManager) as the lazy filter."""
+        return self.render(hidden=user_state.get_opened_set(user_id), limit=limit)
+
+    def __len__(self) -> int:
+        return len(self._offers)
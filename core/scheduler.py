@@ -0,0 +1,245 @@
+"""
+core/scheduler.py
+Adaptive Polling Scheduler.
+Polls each source on its own interval: faster after cycles that changed something
+or when an Oracle-predicted unlock is close, exponentially slower while the payload
+stays the same. Jobs live in a heap, so thousands of sources cost O(log n) per run.
+"""
+
+import bisect
+import hashlib
+import heapq
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+UNLOCK_GRACE = 5.0  # Seconds after a predicted unlock before we poll (stores flip slightly late)
+
+
+def payload_digest(payload: Any) -> str:
+    """Stable digest of a poll result. GameOffer lists digest by their persisted fields."""
+    if isinstance(payload, list):
+        payload = sorted(
+            (item.to_dict() if hasattr(item, "to_dict") else item for item in payload),
+            key=lambda d: json.dumps(d, sort_keys=True, default=str)
+        )
+    data = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+@dataclass
+class PollJob:
+    name: str
+    poll: Callable[[], Any]
+    base_interval: float
+    min_interval: float
+    max_interval: float
+    interval: float
+    next_run: float
+    last_digest: Optional[str] = None
+    unlocks: List[float] = field(default_factory=list)  # Pending predicted unlocks, soonest first
+    running: bool = False
+    runs: int = 0
+    changes: int = 0
+    failures: int = 0
+    unchanged_streak: int = 0
+    last_run: Optional[float] = None
+    last_error: Optional[str] = None
+    version: int = 0  # Bumped on every reschedule; stale heap entries are skipped
+
+    @property
+    def unlock_at(self) -> Optional[float]:
+        return self.unlocks[0] if self.unlocks else None
+
+
+class PollScheduler:
+    def __init__(self, max_workers: int = 4, clock: Callable[[], float] = time.time):
+        self.clock = clock
+        self.jobs: Dict[str, PollJob] = {}
+        self._heap: List[tuple] = []
+        self._cond = threading.Condition()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="poll")
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = True
+
+    # --- Registration ---
+
+    def add_source(self, name: str, poll: Callable[[], Any], interval: float = 300.0,
+                   min_interval: float = 30.0, max_interval: float = 3600.0, start_in: float = 0.0) -> PollJob:
+        """
+        `poll` returns either a payload (digested to detect change) or a bool meaning "changed".
+        """
+        with self._cond:
+            job = PollJob(name=name, poll=poll, base_interval=interval, min_interval=min_interval,
+                          max_interval=max_interval, interval=interval, next_run=self.clock() + start_in)
+            self.jobs[name] = job
+            self._push(job)
+            self._cond.notify()
+            return job
+
+    def remove_source(self, name: str):
+        with self._cond:
+            job = self.jobs.pop(name, None)
+            if job:
+                job.version += 1  # Orphans its heap entry
+
+    def hint_unlock(self, name: str, at: float):
+        """Oracle hint: the source is expected to change at `at` (epoch seconds)."""
+        with self._cond:
+            job = self.jobs.get(name)
+            if not job:
+                return
+            if at not in job.unlocks:
+                bisect.insort(job.unlocks, at)
+            if not job.running and at + UNLOCK_GRACE < job.next_run:
+                job.next_run = max(self.clock(), at + UNLOCK_GRACE)
+                self._push(job)
+                self._cond.notify()
+
+    def trigger(self, name: str):
+        """Poll a source as soon as a worker is free."""
+        with self._cond:
+            job = self.jobs.get(name)
+            if job and not job.running:
+                job.next_run = self.clock()
+                self._push(job)
+                self._cond.notify()
+
+    # --- Heap plumbing ---
+
+    def _push(self, job: PollJob):
+        job.version += 1
+        heapq.heappush(self._heap, (job.next_run, job.version, job.name))
+
+    def _pop_due(self, now: float) -> List[PollJob]:
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            _, version, name = heapq.heappop(self._heap)
+            job = self.jobs.get(name)
+            if job is None or job.version != version or job.running:
+                continue
+            job.running = True
+            due.append(job)
+        return due
+
+    def _next_wakeup(self) -> Optional[float]:
+        # Drop orphaned entries so we don't wake up for nothing
+        while self._heap:
+            _, version, name = self._heap[0]
+            job = self.jobs.get(name)
+            if job is not None and job.version == version and not job.running:
+                return self._heap[0][0]
+            heapq.heappop(self._heap)
+        return None
+
+    # --- Adaptation ---
+
+    def _reschedule(self, job: PollJob, payload: Any, error: Optional[Exception]):
+        now = self.clock()
+        job.running = False
+        job.runs += 1
+        job.last_run = now
+
+        if error is not None:
+            job.failures += 1
+            job.last_error = str(error)
+            changed = False
+        else:
+            job.last_error = None
+            if isinstance(payload, bool):
+                changed = payload
+            else:
+                digest = payload_digest(payload)
+                changed = digest != job.last_digest
+                job.last_digest = digest
+
+        if changed:
+            job.changes += 1
+            job.unchanged_streak = 0
+            # Something is happening: poll faster (at most base_interval, halving down to min)
+            job.interval = max(job.min_interval, min(job.interval, job.base_interval) / 2)
+        else:
+            job.unchanged_streak += 1
+            job.interval = min(job.max_interval, job.interval * 2)
+
+        job.next_run = now + job.interval
+
+        # Unlocks that have passed (and been polled since) are done; the next one re-arms
+        while job.unlocks and job.unlocks[0] + UNLOCK_GRACE <= now:
+            job.unlocks.pop(0)
+        if job.unlocks and job.unlocks[0] + UNLOCK_GRACE < job.next_run:
+            job.next_run = job.unlocks[0] + UNLOCK_GRACE
+
+        if job.name in self.jobs:
+            self._push(job)
+
+    def _run_job(self, job: PollJob):
+        payload, error = None, None
+        try:
+            payload = job.poll()
+        except Exception as e:
+            error = e
+            print(f"⚠️  Scheduler: {job.name} poll failed ({e})")
+        with self._cond:
+            self._reschedule(job, payload, error)
+            self._cond.notify()
+
+    # --- Running ---
+
+    def run_pending(self) -> List[str]:
+        """Runs every due job inline. Useful for tests and one-shot cron use."""
+        with self._cond:
+            due = self._pop_due(self.clock())
+        for job in due:
+            self._run_job(job)
+        return [job.name for job in due]
+
+    def _loop(self):
+        with self._cond:
+            while not self._stopped:
+                for job in self._pop_due(self.clock()):
+                    self._executor.submit(self._run_job, job)
+                wakeup = self._next_wakeup()
+                timeout = None if wakeup is None else max(0.0, wakeup - self.clock())
+                self._cond.wait(timeout)
+
+    def start(self):
+        """Runs the scheduler loop on a background thread."""
+        with self._cond:
+            if not self._stopped:
+                return
+            self._stopped = False
+        self._thread = threading.Thread(target=self._loop, name="poll-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self, wait: bool = True):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+        if self._thread and wait:
+            self._thread.join()
+        self._executor.shutdown(wait=wait)
+
+    # --- Inspection ---
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """Queue state, soonest first."""
+        now = self.clock()
+        with self._cond:
+            jobs = sorted(self.jobs.values(), key=lambda j: j.next_run)
+            return [{
+                "name": job.name,
+                "running": job.running,
+                "next_run_in": round(job.next_run - now, 1),
+                "interval": job.interval,
+                "unlock_at": job.unlock_at,
+                "pending_unlocks": len(job.unlocks),
+                "runs": job.runs,
+                "changes": job.changes,
+                "failures": job.failures,
+                "unchanged_streak": job.unchanged_streak,
+                "last_error": job.last_error,
+            } for job in jobs]
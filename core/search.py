@@ -0,0 +1,228 @@
+"""
+core/search.py
+Offer & Inventory Search.
+SQLite FTS5 index over titles, descriptions and sources of live offers (fed
+incrementally from the change feed) and claimed inventory. Queries are prefix-aware
+(search-as-you-type) and typo tolerant: unknown terms are swapped for close matches
+from the index vocabulary.
+"""
+
+import difflib
+import json
+import os
+import re
+import sqlite3
+import time
+import unicodedata
+from typing import Any, Dict, Iterable, List, Optional
+from core.changefeed import REMOVED, ChangeEvent, ChangeFeed
+from core.models import GameOffer
+
+SEARCH_DB_PATH = "data/search.db"
+
+OFFER = "offer"
+INVENTORY = "inventory"
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+TITLE_WEIGHT, DESCRIPTION_WEIGHT, SOURCE_WEIGHT = 10.0, 1.0, 2.0
+TYPO_CUTOFF = 0.75   # difflib ratio a vocabulary term needs to stand in for a misspelling
+TYPO_CANDIDATES = 3
+
+
+def _terms(query: str) -> List[str]:
+    """Lowercased, diacritics stripped: the same shape unicode61 gives the vocabulary."""
+    folded = unicodedata.normalize("NFKD", query or "")
+    folded = "".join(c for c in folded if not unicodedata.combining(c))
+    return [t.lower() for t in TOKEN_RE.findall(folded)]
+
+
+def _quote(term: str) -> str:
+    return '"' + term.replace('"', '""') + '"'
+
+
+class SearchIndex:
+    def __init__(self, db_path: str = SEARCH_DB_PATH):
+        self.db_path = db_path
+        self._ensure_db()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def _ensure_db(self):
+        if os.path.dirname(self.db_path):
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            # Documents live in a plain table (keyed lookups, cheap deletes)...
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS search_docs (
+                    id INTEGER PRIMARY KEY,
+                    doc_key TEXT NOT NULL UNIQUE,
+                    kind TEXT NOT NULL,
+                    title TEXT NOT NULL,
+                    description TEXT NOT NULL DEFAULT '',
+                    source TEXT NOT NULL DEFAULT '',
+                    payload TEXT NOT NULL
+                )
+            """)
+            # ...and the FTS5 index points back at them (external content)
+            conn.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS search_fts USING fts5(
+                    title, description, source, kind UNINDEXED,
+                    content='search_docs', content_rowid='id',
+                    tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+                )
+            """)
+            conn.execute("CREATE VIRTUAL TABLE IF NOT EXISTS search_vocab USING fts5vocab(search_fts, 'row')")
+            conn.executescript("""
+                CREATE TRIGGER IF NOT EXISTS search_docs_ai AFTER INSERT ON search_docs BEGIN
+                    INSERT INTO search_fts(rowid, title, description, source, kind)
+                    VALUES (new.id, new.title, new.description, new.source, new.kind);
+                END;
+                CREATE TRIGGER IF NOT EXISTS search_docs_ad AFTER DELETE ON search_docs BEGIN
+                    INSERT INTO search_fts(search_fts, rowid, title, description, source, kind)
+                    VALUES ('delete', old.id, old.title, old.description, old.source, old.kind);
+                END;
+                CREATE TRIGGER IF NOT EXISTS search_docs_au AFTER UPDATE ON search_docs BEGIN
+                    INSERT INTO search_fts(search_fts, rowid, title, description, source, kind)
+                    VALUES ('delete', old.id, old.title, old.description, old.source, old.kind);
+                    INSERT INTO search_fts(rowid, title, description, source, kind)
+                    VALUES (new.id, new.title, new.description, new.source, new.kind);
+                END;
+            """)
+
+    # --- Writes ---
+
+    def _upsert(self, conn: sqlite3.Connection, docs: Iterable[tuple]):
+        conn.executemany("""
+            INSERT INTO search_docs (doc_key, kind, title, description, source, payload)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(doc_key) DO UPDATE SET
+                title = excluded.title, description = excluded.description,
+                source = excluded.source, payload = excluded.payload
+            WHERE title != excluded.title OR description != excluded.description
+               OR source != excluded.source OR payload != excluded.payload
+        """, docs)
+
+    def index_offers(self, offers: Iterable[GameOffer]):
+        docs = [(f"{OFFER}:{o.offer_id}", OFFER, o.title, o.description or "", o.source,
+                 json.dumps(dict(o.to_dict(), offer_id=o.offer_id))) for o in offers]
+        with self._connect() as conn:
+            self._upsert(conn, docs)
+
+    def remove_offers(self, offer_ids: Iterable[str]):
+        with self._connect() as conn:
+            conn.executemany("DELETE FROM search_docs WHERE doc_key = ?",
+                             [(f"{OFFER}:{offer_id}",) for offer_id in offer_ids])
+
+    def index_inventory(self, items: Iterable[dict]):
+        """Inventory entries as stored by InventoryManager (keyed by title)."""
+        docs = [(f"{INVENTORY}:{item['title']}", INVENTORY, item["title"], "", item.get("source", ""),
+                 json.dumps(item)) for item in items]
+        with self._connect() as conn:
+            self._upsert(conn, docs)
+
+    def apply_events(self, events: List[ChangeEvent]):
+        """Applies change feed events in order: one transaction per batch."""
+        with self._connect() as conn:
+            for event in events:
+                if event.kind == REMOVED:
+                    conn.execute("DELETE FROM search_docs WHERE doc_key = ?", (f"{OFFER}:{event.offer_id}",))
+                else:
+                    offer = event.offer
+                    payload = {k: v for k, v in event.payload.items() if k != "changes"}
+                    self._upsert(conn, [(f"{OFFER}:{event.offer_id}", OFFER, offer.title, offer.description or "",
+                                         offer.source, json.dumps(dict(payload, offer_id=event.offer_id)))])
+
+    def sync_changefeed(self, feed: ChangeFeed, consumer: str = "search", batch: int = 500) -> int:
+        """Catches up with the change feed from this index's cursor. Returns events applied."""
+        applied = 0
+        while True:
+            handled = feed.consume(consumer, self.apply_events, limit=batch)
+            applied += handled
+            if handled < batch:
+                return applied
+
+    def sync_inventory(self, inventory: Dict[str, dict]) -> int:
+        """Indexes claimed items not yet in the index (the inventory is append-only)."""
+        with self._connect() as conn:
+            known = {row[0] for row in conn.execute(
+                "SELECT doc_key FROM search_docs WHERE kind = ?", (INVENTORY,))}
+        missing = [item for title, item in inventory.items() if f"{INVENTORY}:{title}" not in known]
+        if missing:
+            self.index_inventory(missing)
+        return len(missing)
+
+    # --- Reads ---
+
+    def _corrections(self, conn: sqlite3.Connection, term: str, prefix: bool) -> List[str]:
+        """Vocabulary terms close to `term`. Empty if the term (or, for the last one, its prefix) is known."""
+        if prefix:
+            hit = conn.execute("SELECT 1 FROM search_vocab WHERE term >= ? AND term < ? LIMIT 1",
+                               (term, term + "\uffff")).fetchone()
+        else:
+            hit = conn.execute("SELECT 1 FROM search_vocab WHERE term = ?", (term,)).fetchone()
+        if hit or len(term) < 3:
+            return []
+        # Typos rarely hit the first letter: only compare terms sharing it and of similar length
+        candidates = [row[0] for row in conn.execute(
+            "SELECT term FROM search_vocab WHERE term >= ? AND term < ? AND length(term) BETWEEN ? AND ?",
+            (term[0], term[0] + "\uffff", len(term) - 2, len(term) + 2)
+        )]
+        return difflib.get_close_matches(term, candidates, n=TYPO_CANDIDATES, cutoff=TYPO_CUTOFF)
+
+    def _ranked(self, conn: sqlite3.Connection, expression: str, limit: int,
+                kind: Optional[str] = None) -> List[tuple]:
+        # Rank inside the FTS table, join only the survivors. The document type is a filter, never a match
+        scope = " AND kind = ?" if kind else ""
+        return conn.execute(f"""
+            SELECT d.id, d.kind, d.payload, m.rank
+            FROM (
+                SELECT rowid, bm25(search_fts, {TITLE_WEIGHT}, {DESCRIPTION_WEIGHT}, {SOURCE_WEIGHT}, 0.0) AS rank
+                FROM search_fts WHERE search_fts MATCH ?{scope} ORDER BY rank LIMIT ?
+            ) m JOIN search_docs d ON d.id = m.rowid
+            ORDER BY m.rank
+        """, (expression, *([kind] if kind else []), limit)).fetchall()
+
+    def search(self, query: str, limit: int = 20, kind: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Returns {query, results, corrected, took_ms}. The last term matches as a prefix;
+        misspelt terms are OR-ed with their closest vocabulary matches.
+        """
+        start = time.perf_counter()
+        terms = _terms(query)
+        if not terms:
+            return {"query": query, "results": [], "corrected": {}, "took_ms": 0.0}
+
+        with self._connect() as conn:
+            clauses, corrected = [], {}
+            for i, term in enumerate(terms):
+                last = i == len(terms) - 1
+                exact = _quote(term) + ("*" if last else "")
+                alternatives = self._corrections(conn, term, prefix=last)
+                if alternatives:
+                    corrected[term] = alternatives
+                    clauses.append("(" + " OR ".join([exact] + [_quote(a) for a in alternatives]) + ")")
+                else:
+                    clauses.append(exact)
+
+            expression = " AND ".join(clauses)
+            # Title (and source) hits first: small match sets rank fast; widen to descriptions if short
+            rows = self._ranked(conn, f"{{title source}} : ({expression})", limit, kind)
+            if len(rows) < limit:
+                seen = {row[0] for row in rows}
+                wider = self._ranked(conn, f"{{title description source}} : ({expression})", limit, kind)
+                rows += [row for row in wider if row[0] not in seen][:limit - len(rows)]
+
+        results = [dict(json.loads(payload), kind=doc_kind, score=round(-rank, 4))
+                   for _, doc_kind, payload, rank in rows]
+        return {
+            "query": query,
+            "results": results,
+            "corrected": corrected,
+            "took_ms": round((time.perf_counter() - start) * 1000, 2),
+        }
+
+    def count(self) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM search_docs").fetchone()[0]
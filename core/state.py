@@ -7,17 +7,23 @@ Strict Separation: This manages UX state (Opened/Seen), NOT economic value.
 import sqlite3
 import os
 from typing import Set, Dict, Any
+from core.metrics import db_timed
+from core.profiling import profiled
 
 STATE_DB_PATH = "data/user_state.db"
 
 class UserStateManager:
-    def __init__(self):
+    def __init__(self, db_path: str = STATE_DB_PATH):
+        self.db_path = db_path
         self._ensure_db()
 
     def _ensure_db(self):
-        os.makedirs(os.path.dirname(STATE_DB_PATH), exist_ok=True)
-        with sqlite3.connect(STATE_DB_PATH) as conn:
+        if os.path.dirname(self.db_path):
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        with sqlite3.connect(self.db_path) as conn:
             cursor = conn.cursor()
+            # WAL: readers see the last commit instead of waiting on a writer's lock (persists in the file)
+            cursor.execute("PRAGMA journal_mode=WAL")
             # UX Table: Tracks which offers a user has intentionally opened
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS opened_offers (
@@ -29,6 +35,8 @@ class UserStateManager:
             """)
             conn.commit()
 
+    @profiled("state", rows=lambda r: 1 if r.get("status") == "success" else 0)
+    @db_timed("state")
     def mark_opened(self, user_id: str, offer_id: str) -> Dict[str, Any]:
         """
         Records an 'Open' event.
@@ -36,7 +44,7 @@ class UserStateManager:
         Returns: {'status': 'success' | 'already_opened'}
         """
         try:
-            with sqlite3.connect(STATE_DB_PATH) as conn:
+            with sqlite3.connect(self.db_path) as conn:
                 cursor = conn.cursor()
                 cursor.execute(
                     "INSERT INTO opened_offers (user_id, offer_id) VALUES (?, ?)",
@@ -47,9 +55,11 @@ class UserStateManager:
         except sqlite3.IntegrityError:
             return {"status": "already_opened"}
 
+    @profiled("state", rows=len)
+    @db_timed("state")
     def get_opened_set(self, user_id: str) -> Set[str]:
         """Returns a set of all offer_ids opened by the user."""
-        with sqlite3.connect(STATE_DB_PATH) as conn:
+        with sqlite3.connect(self.db_path) as conn:
             cursor = conn.cursor()
             cursor.execute(
                 "SELECT offer_id FROM opened_offers WHERE user_id = ?",
@@ -57,12 +67,26 @@ class UserStateManager:
             )
             return {row[0] for row in cursor.fetchall()}
 
+    @profiled("state", rows=int)
+    @db_timed("state")
     def has_opened(self, user_id: str, offer_id: str) -> bool:
         """Checks if a specific offer has been opened by the user."""
-        with sqlite3.connect(STATE_DB_PATH) as conn:
+        with sqlite3.connect(self.db_path) as conn:
             cursor = conn.cursor()
             cursor.execute(
                 "SELECT 1 FROM opened_offers WHERE user_id = ? AND offer_id = ?",
                 (user_id, offer_id)
             )
             return cursor.fetchone() is not None
+
+    @profiled("state")
+    @db_timed("state")
+    def get_revision(self, user_id: str) -> int:
+        """Monotonic per-user revision of the opened set (rows are insert-only, so MAX(rowid) moves on every open)."""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT COALESCE(MAX(rowid), 0) FROM opened_offers WHERE user_id = ?",
+                (user_id,)
+            )
+            return cursor.fetchone()[0]
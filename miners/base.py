@@ -1,22 +1,69 @@
-import time
 from abc import ABC, abstractmethod
-from typing import List
+from contextlib import contextmanager
+from typing import List, Optional
+from core.metrics import MINER_PHASE
 from core.models import GameOffer
+from core.profiling import profiled, span
+from miners.ratelimit import HostRateLimiter, shared_limiter
+
+class PartialResult(list):
+    """
+    A mine() result known to miss part of the live set (e.g. a page failed mid-crawl).
+    Still worth serving, but consumers must not treat absent offers as gone.
+    """
+
+    def __init__(self, offers=(), error: Optional[str] = None):
+        super().__init__(offers)
+        self.error = error
+
 
 class BaseMiner(ABC):
-    def __init__(self, name: str):
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Each concrete miner's strict pass is a profiling span ("SteamMiner.mine", rows = offers)
+        mine = cls.__dict__.get("mine") or getattr(cls.mine, "__wrapped__", cls.mine)
+        cls.mine = profiled(cls.__name__, rows=len)(mine)
+
+    def __init__(self, name: str, limiter: Optional[HostRateLimiter] = None, label: Optional[str] = None):
         self.name = name
-        self.last_request_time = 0
-        self.min_interval = 2.0  # Seconds between requests (Security/Politeness)
+        # Metrics / span label; the registry name for built-ins, so phases line up with cycles
+        self.label = label or name
+        self.min_interval = 2.0  # Seconds between requests per host (Security/Politeness)
+        self.burst = 1  # Requests allowed back-to-back before min_interval kicks in
+        self.limiter = limiter or shared_limiter()
 
-    def _rate_limit(self):
-        """Ensures we don't spam the API and get banned."""
-        elapsed = time.time() - self.last_request_time
-        if elapsed < self.min_interval:
-            time.sleep(self.min_interval - elapsed)
-        self.last_request_time = time.time()
+    def _limit_key(self, url: Optional[str], limiter: Optional[HostRateLimiter] = None) -> str:
+        """Applies this miner's budget (min_interval, burst) to the host and returns its key."""
+        key = url or self.name
+        rate = 1.0 / self.min_interval if self.min_interval > 0 else 0
+        (limiter or self.limiter).configure(key, rate=rate, burst=self.burst)
+        return key
+
+    def _rate_limit(self, url: Optional[str] = None) -> float:
+        """Ensures we don't spam the API and get banned. Shares the host's bucket with other miners."""
+        return self.limiter.acquire(self._limit_key(url))
+
+    async def _rate_limit_async(self, url: Optional[str] = None) -> float:
+        """Event-loop friendly variant of _rate_limit."""
+        return await self.limiter.acquire_async(self._limit_key(url))
+
+    @contextmanager
+    def _phase(self, phase: str, *args):
+        """
+        Times a mining phase ("fetch", "parse") into zerocrate_miner_phase_duration_seconds,
+        and as a "<label>.<phase>" profiling span when profiling is on.
+        """
+        with MINER_PHASE.time(self.label, phase), span(f"{self.label}.{phase}", *args) as s:
+            yield s
 
     @abstractmethod
     def fetch_games(self) -> List[GameOffer]:
         """Must return a list of GameOffer objects."""
         pass
+
+    def mine(self) -> List[GameOffer]:
+        """
+        Strict variant of fetch_games: upstream failures raise instead of returning [].
+        Used by the result cache so outages aren't mistaken for 'no deals'.
+        """
+        return self.fetch_games()
@@ -0,0 +1,177 @@
+"""
+miners/cache.py
+Stale-While-Revalidate result cache with per-source circuit breakers.
+Readers always get the last good results immediately; refreshes happen in the
+background, and a failing upstream is left alone until its breaker lets a probe through.
+"""
+
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+from core.metrics import MINER_CYCLES, MINER_PHASE
+from core.models import GameOffer
+
+
+class CircuitBreaker:
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 60.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = 0.0
+        self._state = self.CLOSED
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == self.OPEN and time.time() - self.opened_at >= self.reset_timeout:
+                self._state = self.HALF_OPEN
+            return self._state
+
+    def allow(self) -> bool:
+        """Closed: always. Open: never. Half-open: exactly one probe at a time."""
+        state = self.state
+        with self._lock:
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self._state = self.CLOSED
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._probe_in_flight = False
+            # A failed probe re-opens immediately; otherwise wait for the threshold
+            if self._state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self._state = self.OPEN
+                self.opened_at = time.time()
+
+
+class CachedSource:
+    def __init__(self, name: str, fetch: Callable[[], List[GameOffer]], ttl: float = 300.0,
+                 breaker: Optional[CircuitBreaker] = None):
+        self.name = name
+        self.fetch = fetch  # Must raise on upstream failure (see BaseMiner.mine)
+        self.ttl = ttl
+        self.breaker = breaker or CircuitBreaker()
+        self.offers: List[GameOffer] = []
+        self.fetched_at: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self._refreshing = False
+        self._lock = threading.Lock()
+
+    @property
+    def is_stale(self) -> bool:
+        return self.fetched_at is None or (time.time() - self.fetched_at) >= self.ttl
+
+    def refresh(self) -> Optional[bool]:
+        """
+        Runs one fetch through the breaker. Returns True if fresh results were stored,
+        False if the fetch failed or the breaker is open, and None if another refresh was
+        already in flight (nothing was attempted, so it is neither a success nor a failure).
+        """
+        with self._lock:
+            if self._refreshing:
+                return None  # Single-flight: someone is already on it
+            self._refreshing = True
+        try:
+            if not self.breaker.allow():
+                MINER_CYCLES.inc(self.name, "breaker_open")
+                return False
+            try:
+                with MINER_PHASE.time(self.name, "cycle"):
+                    offers = self.fetch()
+            except Exception as e:
+                MINER_CYCLES.inc(self.name, "error")
+                self.breaker.record_failure()
+                self.last_error = str(e)
+                print(f"⚠️  {self.name}: refresh failed ({e}). Serving cached results.")
+                return False
+            MINER_CYCLES.inc(self.name, "ok")
+            self.breaker.record_success()
+            self.offers = offers
+            self.fetched_at = time.time()
+            self.last_error = None
+            return True
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def refresh_in_background(self):
+        threading.Thread(target=self.refresh, name=f"swr-{self.name}", daemon=True).start()
+
+    def get(self) -> List[GameOffer]:
+        """
+        Returns the last good results without waiting on upstream.
+        Only the very first call (nothing cached yet) blocks on a fetch.
+        """
+        if self.fetched_at is None:
+            self.refresh()
+        elif self.is_stale:
+            self.refresh_in_background()
+        return self.offers
+
+    def freshness(self) -> Dict[str, object]:
+        """Metadata for the UI: how old the data is and whether the source is healthy."""
+        age = None if self.fetched_at is None else time.time() - self.fetched_at
+        if age is None:
+            age_text = "never"
+        elif age < 60:
+            age_text = "just now"
+        elif age < 3600:
+            age_text = f"{int(age // 60)}m ago"
+        else:
+            age_text = f"{int(age // 3600)}h ago"
+        return {
+            "source": self.name,
+            "fetched_at": datetime.fromtimestamp(self.fetched_at, timezone.utc).isoformat() if self.fetched_at else None,
+            "age_seconds": None if age is None else round(age, 1),
+            "age_text": age_text,
+            "stale": self.is_stale,
+            "refreshing": self._refreshing,
+            "breaker": self.breaker.state,
+            "last_error": self.last_error,
+        }
+
+
+class MinerResultCache:
+    """Registry of CachedSources, one per miner."""
+
+    def __init__(self):
+        self.sources: Dict[str, CachedSource] = {}
+
+    def register(self, name: str, fetch: Callable[[], List[GameOffer]], ttl: float = 300.0,
+                 breaker: Optional[CircuitBreaker] = None) -> CachedSource:
+        source = CachedSource(name, fetch, ttl=ttl, breaker=breaker)
+        self.sources[name] = source
+        return source
+
+    def register_miner(self, miner, ttl: float = 300.0) -> CachedSource:
+        """Convenience for BaseMiner/Scout instances: caches their strict mine() pass."""
+        return self.register(getattr(miner, "name", type(miner).__name__), miner.mine, ttl=ttl)
+
+    def get(self, name: str) -> List[GameOffer]:
+        return self.sources[name].get()
+
+    def get_all(self) -> List[GameOffer]:
+        offers = []
+        for source in self.sources.values():
+            offers.extend(source.get())
+        return offers
+
+    def freshness(self) -> List[Dict[str, object]]:
+        return [source.freshness() for source in self.sources.values()]
@@ -1,80 +1,86 @@
-import requests
-from typing import List
+from typing import List, Optional
+from core.classify import classify_prices
 from core.models import GameOffer, Rarity
 from miners.base import BaseMiner
+from miners.epic_catalog import EpicCatalog, shared_catalog
 
 class EpicMiner(BaseMiner):
-    def __init__(self):
-        super().__init__("Epic Games Store")
-        self.api_url = "https://store-site-backend-static.ak.epicgames.com/freeGamesPromotions"
+    def __init__(self, catalog: Optional[EpicCatalog] = None):
+        super().__init__("Epic Games Store", label="epic")
+        # Shared with the Oracle so both read one fetch of freeGamesPromotions
+        self.catalog = catalog or shared_catalog()
+        self.api_url = self.catalog.url
 
-    def _calculate_rarity(self, price: float) -> Rarity:
-        # Simple Rarity Logic (We can expand this later)
-        if price > 40: return Rarity.LEGENDARY
-        if price > 15: return Rarity.EPIC
-        if price > 5: return Rarity.RARE
-        return Rarity.COMMON
+    def mine(self) -> List[GameOffer]:
+        """Strict mining pass: upstream failures raise instead of returning []."""
+        # Rate limiting happens inside the catalog, only when it actually goes upstream,
+        # but against our budget for Epic's host
+        self._limit_key(self.catalog.url, self.catalog.limiter)
+        with self._phase("fetch"):
+            snapshot = self.catalog.get()
 
-    def fetch_games(self) -> List[GameOffer]:
-        self._rate_limit()
-        print(f"⛏️  {self.name}: Connecting to API...")
-        
-        try:
-            response = requests.get(self.api_url)
-            data = response.json()
-            games = data['data']['Catalog']['searchStore']['elements']
-            
+        with self._phase("parse") as phase:
             loot_crate = []
-            
-            for game in games:
+            # Epic reports cents: appraise the whole catalog in one pass
+            appraisal = classify_prices([game.original_price for game in snapshot.entries], cents=True)
+
+            for game, price, rarity in zip(snapshot.entries, appraisal.prices, appraisal.rarities):
                 # SAFE & DUMB LOGIC: Check the bill, not the tag.
                 # If Original Price > 0 and Final Price == 0, it is free.
-                price = game.get('price', {}).get('totalPrice', {})
-                discount_price = price.get('discountPrice', -1)
-                original_price = price.get('originalPrice', -1)
+                discount_price = game.discount_price
+                original_price = game.original_price
 
                 # Skip invalid data
                 if discount_price == -1 or original_price == -1:
                     continue
-                
+
                 # Check for "Vaulted" status (Mystery Games often have 0 price but this tag)
-                categories = [c.get('path') for c in game.get('categories', [])]
-                is_vaulted = 'freegames/vaulted' in categories or 'freegames' in categories
+                is_vaulted = game.is_vaulted
 
                 is_deal = False
-                effective_rarity = None
 
                 # Condition 1: Standard Deal (Price > 0, Discount = 0)
                 if discount_price == 0 and original_price > 0:
                     is_deal = True
-                    price_float = original_price / 100.0
-                
+                    price_float = price
+
                 # Condition 2: Vault/Mystery Deal (Price = 0, but explicitly a Free Game)
                 elif discount_price == 0 and original_price == 0 and is_vaulted:
                     is_deal = True
                     # We don't know the price, but Vault games are usually premium.
                     # Flag as LEGENDARY to ensure dopamine hit.
                     price_float = 29.99 # Assumed Value for Mystery Games
-                    effective_rarity = Rarity.LEGENDARY
+                    rarity = Rarity.LEGENDARY
 
                 if is_deal:
-                    # Sanitize Slug (Mystery games have "[]")
-                    slug = game.get('productSlug', '')
-                    if slug == "[]" or not slug:
-                        slug = "free-games" # Fallback to generic page
+                    # Mystery games have no slug, fall back to the generic page
+                    slug = game.slug or "free-games"
+
+                    # Current promotion window (if Epic sent one) gives us the expiry
+                    end_time = next((p.end for p in game.current if p.is_free and p.end), None)
 
                     # Create the Object
                     offer_obj = GameOffer(
-                        title=game['title'],
+                        title=game.title,
                         original_price=price_float,
                         discount_price=0.0,
-                        description=game.get('description', ''),
-                        image_url=game['keyImages'][0]['url'] if game.get('keyImages') else "",
+                        description=game.description,
+                        image_url=game.image_url,
                         store_url=f"https://store.epicgames.com/p/{slug}",
                         source="Epic Games",
-                        rarity=effective_rarity if effective_rarity else self._calculate_rarity(price_float)
+                        platform_id=game.slug or game.id,
+                        end_time=end_time,
+                        rarity=rarity
                     )
                     loot_crate.append(offer_obj)
+            phase.rows = len(loot_crate)
+        return loot_crate
+
+    def fetch_games(self) -> List[GameOffer]:
+        print(f"⛏️  {self.name}: Connecting to API...")
+        
+        try:
+            loot_crate = self.mine()
             if not loot_crate:
                 print(f"⚠️  No active 100% off deals found. Activating DEMO MODE for visualization.")
                 return self._get_demo_loot()
@@ -0,0 +1,198 @@
+"""
+miners/epic_catalog.py
+Shared client for Epic's freeGamesPromotions feed.
+Fetches once per TTL and normalizes the catalog so EpicMiner and the Oracle
+read the same parsed structure instead of each hitting (and walking) the API.
+"""
+
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import List, Optional
+
+import requests
+
+from miners.ratelimit import HostRateLimiter, shared_limiter
+
+EPIC_URL = os.environ.get(
+    "EPIC_PROMOTIONS_URL",
+    "https://store-site-backend-static.ak.epicgames.com/freeGamesPromotions"
+)
+CATALOG_TTL = 300.0  # Seconds. Epic rotates promotions weekly, 5 minutes is plenty fresh.
+
+# Module-level pooled session: warm processes (and warm Lambda containers) reuse the
+# TCP/TLS connection instead of handshaking on every fetch.
+SESSION = requests.Session()
+SESSION.mount("https://", requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=4))
+SESSION.mount("http://", requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=4))
+
+
+def _parse_epic_time(raw: Optional[str]) -> Optional[datetime]:
+    """Epic timestamps are ISO-8601 with a trailing 'Z'."""
+    if not raw:
+        return None
+    try:
+        return datetime.fromisoformat(raw.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+
+
+@dataclass
+class Promotion:
+    start_raw: Optional[str]
+    end_raw: Optional[str]
+    discount_percentage: int  # Epic semantics: percentage of the price you still pay
+    start: Optional[datetime] = None
+    end: Optional[datetime] = None
+
+    @property
+    def is_free(self) -> bool:
+        return self.discount_percentage == 0
+
+
+@dataclass
+class CatalogEntry:
+    id: str
+    title: str
+    slug: Optional[str]  # None for Mystery games (Epic sends "[]")
+    description: str
+    image_url: str
+    original_price: int  # Cents, -1 when Epic omits it
+    discount_price: int  # Cents, -1 when Epic omits it
+    fmt_original_price: Optional[str]
+    categories: List[str] = field(default_factory=list)
+    current: List[Promotion] = field(default_factory=list)
+    upcoming: List[Promotion] = field(default_factory=list)
+
+    @property
+    def is_vaulted(self) -> bool:
+        return 'freegames/vaulted' in self.categories or 'freegames' in self.categories
+
+
+@dataclass
+class CatalogSnapshot:
+    entries: List[CatalogEntry]
+    fetched_at: float
+    etag: Optional[str] = None  # Upstream validator; unchanged ETag means unchanged entries
+
+
+def _parse_promotions(groups) -> List[Promotion]:
+    # Epic structure: groups -> list -> promotionalOffers -> list
+    parsed = []
+    for group in groups or []:
+        for offer in group.get('promotionalOffers') or []:
+            setting = offer.get('discountSetting') or {}
+            start_raw = offer.get('startDate')
+            end_raw = offer.get('endDate')
+            parsed.append(Promotion(
+                start_raw=start_raw,
+                end_raw=end_raw,
+                discount_percentage=setting.get('discountPercentage', -1),
+                start=_parse_epic_time(start_raw),
+                end=_parse_epic_time(end_raw),
+            ))
+    return parsed
+
+
+def parse_catalog(data: dict) -> List[CatalogEntry]:
+    """Normalizes the raw freeGamesPromotions payload."""
+    elements = data['data']['Catalog']['searchStore']['elements']
+
+    entries = []
+    for game in elements:
+        total = (game.get('price') or {}).get('totalPrice') or {}
+        fmt = total.get('fmtPrice') or {}
+        promotions = game.get('promotions') or {}
+        key_images = game.get('keyImages') or []
+
+        slug = game.get('productSlug')
+        if slug == "[]" or not slug:
+            slug = None
+
+        entries.append(CatalogEntry(
+            id=game.get('id', ''),
+            title=game.get('title', 'Unknown Game'),
+            slug=slug,
+            description=game.get('description', ''),
+            image_url=key_images[0].get('url', '') if key_images else "",
+            original_price=total.get('originalPrice', -1),
+            discount_price=total.get('discountPrice', -1),
+            fmt_original_price=fmt.get('originalPrice'),
+            categories=[c.get('path') for c in game.get('categories') or []],
+            current=_parse_promotions(promotions.get('promotionalOffers')),
+            upcoming=_parse_promotions(promotions.get('upcomingPromotionalOffers')),
+        ))
+    return entries
+
+
+class EpicCatalog:
+    """
+    TTL-cached view of the Epic promotions catalog.
+    Concurrent callers share a single in-flight fetch.
+    """
+
+    def __init__(self, url: str = EPIC_URL, ttl: float = CATALOG_TTL, timeout: float = 10,
+                 limiter: Optional[HostRateLimiter] = None):
+        self.url = url
+        self.ttl = ttl
+        self.timeout = timeout
+        self.limiter = limiter or shared_limiter()
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._stale: Optional[CatalogSnapshot] = None  # Kept after invalidate() for ETag revalidation
+        self._lock = threading.Lock()
+
+    def _is_fresh(self) -> bool:
+        return self._snapshot is not None and (time.time() - self._snapshot.fetched_at) < self.ttl
+
+    def get(self) -> CatalogSnapshot:
+        """Returns the cached snapshot, refetching upstream once the TTL has lapsed."""
+        if self._is_fresh():
+            return self._snapshot
+        # Only real upstream calls spend a token; cache hits are free. Waited out before
+        # taking the lock, so a politeness delay never holds up callers served from cache.
+        self.limiter.acquire(self.url)
+        with self._lock:
+            # Another caller may have refreshed while we waited
+            if self._is_fresh():
+                return self._snapshot
+
+            # Revalidate instead of refetching when we still hold a parsed copy
+            headers = {}
+            previous = self._snapshot or self._stale
+            if previous is not None and previous.etag:
+                headers["If-None-Match"] = previous.etag
+
+            response = SESSION.get(self.url, headers=headers, timeout=self.timeout)
+            if response.status_code == 304 and previous is not None:
+                self._snapshot = CatalogSnapshot(previous.entries, time.time(), previous.etag)
+                return self._snapshot
+
+            response.raise_for_status()
+            self._snapshot = CatalogSnapshot(
+                entries=parse_catalog(response.json()),
+                fetched_at=time.time(),
+                etag=response.headers.get("ETag")
+            )
+            return self._snapshot
+
+    def invalidate(self):
+        """Forces the next get() to hit upstream."""
+        if self._snapshot is not None:
+            self._stale = self._snapshot
+        self._snapshot = None
+
+
+_shared_catalog: Optional[EpicCatalog] = None
+_shared_lock = threading.Lock()
+
+
+def shared_catalog() -> EpicCatalog:
+    """Process-wide catalog used by EpicMiner and the Oracle."""
+    global _shared_catalog
+    if _shared_catalog is None:
+        with _shared_lock:
+            if _shared_catalog is None:
+                _shared_catalog = EpicCatalog()
+    return _shared_catalog
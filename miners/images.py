@@ -0,0 +1,283 @@
+"""
+miners/images.py
+Cover Image Cache.
+Cover art is fetched once from the store CDNs (politely: through the shared host
+rate limiter) and stored on disk by content hash, so identical covers are stored once
+and every URL we serve for them is immutable. Card-sized variants are produced with
+Pillow when it is installed; without it the original bytes are served.
+
+Layout under IMAGE_CACHE_DIR:
+  index.db                 source URL -> (sha256, content type)
+  ab/abcdef...             original bytes
+  ab/abcdef..._w460        resized variant
+"""
+
+import hashlib
+import io
+import os
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional
+from urllib.parse import quote, urljoin, urlparse
+import requests
+from miners.ratelimit import HostRateLimiter, shared_limiter
+
+try:
+    from PIL import Image
+except ImportError:  # Optional: resizing is skipped without Pillow
+    Image = None
+
+IMAGE_CACHE_DIR = "data/images"
+
+CARD_WIDTH = 460          # Card art is rendered ~230 CSS px wide: 2x for HiDPI
+MAX_WIDTH = 1920
+# The only widths resized copies are made at: a request can't mint a file per pixel width
+VARIANT_WIDTHS = (CARD_WIDTH, 2 * CARD_WIDTH)
+MAX_BYTES = 8 * 1024 * 1024
+PREFETCH_WORKERS = 8
+TIMEOUT = 10
+
+MAX_REDIRECTS = 3
+
+# Served back from our own origin, so only inert raster formats: SVG (or anything else
+# a browser might execute) is refused however the CDN labels it
+RASTER_TYPES = frozenset({"image/jpeg", "image/png", "image/webp", "image/gif", "image/avif"})
+
+# Only store CDNs are proxied: the endpoint must not become an open proxy.
+# Store-owned domains match with their subdomains; shared CDN domains only by exact host.
+ALLOWED_HOST_SUFFIXES = (
+    "epicgames.com", "epicgames.net", "cdn2.unrealengine.com",
+    "steamstatic.com", "steampowered.com", "steamcdn-a.akamaihd.net",
+    "i.redd.it", "preview.redd.it", "external-preview.redd.it", "redditmedia.com",
+    "gog-statics.com", "images.gog.com",
+) + tuple(h.strip() for h in os.environ.get("ZEROCRATE_IMAGE_HOSTS", "").split(",") if h.strip())
+
+HEADERS = {"User-Agent": "Mozilla/5.0 (ZeroCrate cover cache)"}
+
+
+@dataclass
+class CachedImage:
+    digest: str
+    content_type: str
+    path: str
+
+
+def is_allowed(url: str) -> bool:
+    parsed = urlparse(url or "")
+    host = (parsed.hostname or "").lower()
+    if parsed.scheme not in ("http", "https") or not host:
+        return False
+    return any(host == suffix or host.endswith("." + suffix) for suffix in ALLOWED_HOST_SUFFIXES)
+
+
+def variant_width(width: Optional[int]) -> Optional[int]:
+    """Snaps a requested width to the smallest VARIANT_WIDTHS entry covering it (the largest if none does)."""
+    if not width:
+        return None
+    return next((w for w in VARIANT_WIDTHS if w >= width), VARIANT_WIDTHS[-1])
+
+
+class ImageCache:
+    def __init__(self, root: str = IMAGE_CACHE_DIR, limiter: Optional[HostRateLimiter] = None,
+                 session: Optional[requests.Session] = None):
+        self.root = root
+        self.limiter = limiter or shared_limiter()
+        self.session = session or requests.Session()
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, threading.Event] = {}
+        self._prefetcher: Optional[ThreadPoolExecutor] = None
+        os.makedirs(root, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS images (
+                    url TEXT PRIMARY KEY,
+                    digest TEXT NOT NULL,
+                    content_type TEXT NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_images_digest ON images(digest)")
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(os.path.join(self.root, "index.db"), timeout=30)
+
+    def _blob_path(self, digest: str, width: Optional[int] = None) -> str:
+        name = digest if width is None else f"{digest}_w{width}"
+        return os.path.join(self.root, digest[:2], name)
+
+    # --- Lookups ---
+
+    def lookup(self, url: str) -> Optional[CachedImage]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT digest, content_type FROM images WHERE url = ?", (url,)).fetchone()
+        if row and os.path.exists(self._blob_path(row[0])):
+            return CachedImage(row[0], row[1], self._blob_path(row[0]))
+        return None
+
+    def by_digest(self, digest: str) -> Optional[CachedImage]:
+        if len(digest) != 64 or any(c not in "0123456789abcdef" for c in digest):
+            return None
+        path = self._blob_path(digest)
+        if not os.path.exists(path):
+            return None
+        with self._connect() as conn:
+            row = conn.execute("SELECT content_type FROM images WHERE digest = ? LIMIT 1", (digest,)).fetchone()
+        return CachedImage(digest, row[0] if row else "application/octet-stream", path)
+
+    # --- Fetching ---
+
+    def _get(self, url: str) -> Optional[requests.Response]:
+        """GET that follows redirects itself, so every hop is checked against the allowlist."""
+        hop = url
+        for _ in range(MAX_REDIRECTS + 1):
+            if not is_allowed(hop):
+                print(f"⚠️  Image Cache: {url} redirects to {hop}, which is not proxied")
+                return None
+            self.limiter.acquire(hop)
+            response = self.session.get(hop, headers=HEADERS, timeout=TIMEOUT, stream=True, allow_redirects=False)
+            if not response.is_redirect:
+                return response
+            hop = urljoin(hop, response.headers.get("Location", ""))
+            response.close()
+        print(f"⚠️  Image Cache: {url} redirects more than {MAX_REDIRECTS} times")
+        return None
+
+    def _download(self, url: str) -> Optional[CachedImage]:
+        response = self._get(url)
+        if response is None:
+            return None
+        try:
+            response.raise_for_status()
+            content_type = response.headers.get("Content-Type", "").split(";")[0].strip().lower()
+            if content_type not in RASTER_TYPES:
+                print(f"⚠️  Image Cache: {url} is {content_type or 'untyped'}, not a raster image")
+                return None
+            body = bytearray()
+            for chunk in response.iter_content(64 * 1024):
+                body += chunk
+                if len(body) > MAX_BYTES:
+                    print(f"⚠️  Image Cache: {url} exceeds {MAX_BYTES // (1024 * 1024)} MB")
+                    return None
+        finally:
+            response.close()
+
+        digest = hashlib.sha256(body).hexdigest()
+        path = self._blob_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(body)
+            os.replace(tmp, path)  # Atomic: readers never see a partial file
+        with self._connect() as conn:
+            conn.execute("INSERT OR REPLACE INTO images (url, digest, content_type) VALUES (?, ?, ?)",
+                         (url, digest, content_type))
+        return CachedImage(digest, content_type, path)
+
+    def fetch(self, url: str) -> Optional[CachedImage]:
+        """Cached image for url, downloading it on first use. Concurrent callers share one download."""
+        if not is_allowed(url):
+            return None
+        cached = self.lookup(url)
+        if cached:
+            return cached
+
+        with self._lock:
+            event = self._inflight.get(url)
+            leader = event is None
+            if leader:
+                event = self._inflight[url] = threading.Event()
+        if not leader:
+            event.wait(TIMEOUT * 2)
+            return self.lookup(url)
+
+        try:
+            return self._download(url)
+        except requests.RequestException as e:
+            print(f"⚠️  Image Cache: {url} failed: {e}")
+            return None
+        finally:
+            with self._lock:
+                self._inflight.pop(url, None)
+            event.set()
+
+    def prefetch(self, urls: Iterable[str], workers: int = PREFETCH_WORKERS) -> int:
+        """Downloads the uncached URLs concurrently. Returns how many are now cached."""
+        todo = [u for u in dict.fromkeys(urls) if is_allowed(u) and self.lookup(u) is None]
+        if not todo:
+            return 0
+        with ThreadPoolExecutor(max_workers=min(workers, len(todo))) as pool:
+            return sum(1 for result in pool.map(self.fetch, todo) if result)
+
+    def prefetch_in_background(self, urls: Iterable[str]):
+        """Fire-and-forget prefetch, so ingestion never waits on a CDN."""
+        urls = list(urls)
+        if not urls:
+            return
+        with self._lock:
+            if self._prefetcher is None:
+                self._prefetcher = ThreadPoolExecutor(max_workers=1, thread_name_prefix="zc-images")
+        self._prefetcher.submit(self.prefetch, urls)
+
+    # --- Variants ---
+
+    def variant(self, image: CachedImage, width: Optional[int]) -> CachedImage:
+        """
+        The image scaled down to `width`, snapped to VARIANT_WIDTHS (never up).
+        The original if Pillow is missing or it fails.
+        """
+        width = variant_width(width)
+        if Image is None or not width or image.content_type == "image/gif":
+            return image
+        path = self._blob_path(image.digest, width)
+        content_type = "image/png" if image.content_type == "image/png" else "image/jpeg"
+        if os.path.exists(path):
+            return CachedImage(image.digest, content_type, path)
+        try:
+            with Image.open(image.path) as img:
+                if img.width <= width:
+                    return image
+                height = max(1, round(img.height * width / img.width))
+                resized = img.resize((width, height), Image.LANCZOS)
+                out = io.BytesIO()
+                if content_type == "image/png":
+                    resized.save(out, "PNG", optimize=True)
+                else:
+                    resized.convert("RGB").save(out, "JPEG", quality=82, optimize=True, progressive=True)
+        except Exception as e:
+            print(f"⚠️  Image Cache: resize of {image.digest[:12]} failed: {e}")
+            return image
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(out.getvalue())
+        os.replace(tmp, path)
+        return CachedImage(image.digest, content_type, path)
+
+    # --- URLs for the UI ---
+
+    def card_url(self, url: str, width: int = CARD_WIDTH) -> str:
+        """
+        What a card should load for `url`: the immutable content URL if cached, the proxy
+        (which redirects there) if not, and the original for hosts we don't proxy.
+        """
+        if not url or not is_allowed(url):
+            return url
+        cached = self.lookup(url)
+        if cached:
+            return f"/img/{cached.digest}?w={width}"
+        return f"/api/img?u={quote(url, safe='')}&w={width}"
+
+
+_shared_cache: Optional[ImageCache] = None
+_shared_lock = threading.Lock()
+
+
+def shared_image_cache() -> ImageCache:
+    global _shared_cache
+    if _shared_cache is None:
+        with _shared_lock:
+            if _shared_cache is None:
+                _shared_cache = ImageCache()
+    return _shared_cache
@@ -1,11 +1,53 @@
-import requests
+"""
+miners/oracle_lambda.py
+The Oracle: forecasts upcoming free Epic drops.
+Built for warm-container reuse: the catalog (and its pooled session) live at module
+level, forecasts are memoized per catalog and upstream ETag, and deps the handler never
+uses (rich, sqlite3, asyncio) load lazily.
+"""
+
 import json
-from datetime import datetime
+import time
+import weakref
+from typing import List, Dict, Any, Optional
+from core.forecast import Forecast
+from miners.epic_catalog import CatalogSnapshot, EpicCatalog, shared_catalog
+
+FORECAST_MEMO_TTL = 60.0  # Seconds a serialized forecast is reused for an unchanged upstream
+
+# catalog -> (validator, expires_at, serialized body, count). Survives across warm invocations.
+_forecast_memo: "weakref.WeakKeyDictionary[EpicCatalog, tuple]" = weakref.WeakKeyDictionary()
+
+def forecast_records(snapshot: CatalogSnapshot) -> List[Forecast]:
+    """
+    --- THE PREDICTION ENGINE ---
+    Ignore current offers, look for upcoming promotions that will be 100% Free.
+    Keeps the parsed datetimes so callers can persist and schedule them.
+    """
+    forecasts = []
 
-# --- Configuration ---
-EPIC_URL = "https://store-site-backend-static.ak.epicgames.com/freeGamesPromotions"
+    for game in snapshot.entries:
+        for offer in game.upcoming:
+            # Check: Is it going to be 100% Free?
+            if not offer.is_free:
+                continue
+
+            forecasts.append(Forecast(
+                game=game.title,
+                starts_at=offer.start,
+                ends_at=offer.end,
+                value=game.fmt_original_price or "Unknown Value",
+                image=game.image_url or None,
+                starts_at_raw=offer.start_raw
+            ))
+
+    return forecasts
 
-def lambda_handler(event, context):
+def build_forecast(snapshot: CatalogSnapshot) -> List[Dict[str, Any]]:
+    """Forecast as the Lambda's JSON-ready intel packages (times formatted as UTC strings)."""
+    return [f.to_intel() for f in forecast_records(snapshot)]
+
+def lambda_handler(event, context, catalog: Optional[EpicCatalog] = None):
     """
     AWS Lambda Entry Point.
     Wakes up, checks the future, returns a forecast.
@@ -13,64 +55,23 @@ def lambda_handler(event, context):
     print("🔮 Oracle: Gazing into the future timeline...")
     
     try:
-        # 1. Connect to Epic
-        response = requests.get(EPIC_URL, timeout=10)
-        data = response.json()
-        games = data['data']['Catalog']['searchStore']['elements']
-        
-        forecast_list = []
-        
-        # 2. Analyze Data
-        for game in games:
-            title = game.get('title', 'Unknown Game')
-            promotions = game.get('promotions')
-            
-            if not promotions:
-                continue
-            
-            # --- THE PREDICTION ENGINE ---
-            # Ignore current offers, look for 'upcomingPromotionalOffers'
-            upcoming = promotions.get('upcomingPromotionalOffers')
-            
-            if upcoming:
-                # Epic structure: upcoming -> list -> promotionalOffers -> list
-                offers = upcoming[0]['promotionalOffers']
-                
-                for offer in offers:
-                    # Check: Is it going to be 100% Free?
-                    discount = offer['discountSetting']['discountPercentage']
-                    
-                    if discount == 0:
-                        # Extract Time
-                        start_date_str = offer['startDate']
-                        
-                        # Format Time (Z -> UTC)
-                        try:
-                            start_dt = datetime.fromisoformat(start_date_str.replace('Z', '+00:00'))
-                            formatted_date = start_dt.strftime("%Y-%m-%d %H:%M")
-                        except:
-                            formatted_date = start_date_str
-                        
-                        # Extract Value
-                        try:
-                            original_price = game['price']['totalPrice']['fmtPrice']['originalPrice']
-                        except:
-                            original_price = "Unknown Value"
+        # 1. Connect to Epic (shared, TTL-cached, ETag-revalidated catalog)
+        catalog = catalog or shared_catalog()
+        snapshot = catalog.get()
 
-                        # Build Intel Package
-                        intel = {
-                            "game": title,
-                            "unlocks_at": formatted_date,
-                            "value": original_price,
-                            "image": game['keyImages'][0]['url'] if game.get('keyImages') else None
-                        }
-                        forecast_list.append(intel)
+        # 2. Analyze Data (skipped entirely while this catalog's upstream hasn't changed)
+        validator = snapshot.etag or snapshot.fetched_at
+        now = time.time()
+        memo = _forecast_memo.get(catalog)
+        if memo is None or memo[0] != validator or memo[1] <= now:
+            forecast_list = build_forecast(snapshot)
+            memo = _forecast_memo[catalog] = (validator, now + FORECAST_MEMO_TTL, json.dumps(forecast_list), len(forecast_list))
         
         # Return Forecast
         return {
             'statusCode': 200,
-            'body': json.dumps(forecast_list),
-            'count': len(forecast_list)
+            'body': memo[2],
+            'count': memo[3]
         }
 
     except Exception as e:
@@ -80,16 +81,13 @@ def lambda_handler(event, context):
             'body': json.dumps({"error": str(e)})
         }
 
-# --- Local Testing Block ---
-if __name__ == "__main__":
+def _render_forecast(result: Dict[str, Any]):
+    """Local pretty-printer. rich is imported here so the Lambda never loads it."""
     from rich.console import Console
     from rich.table import Table
     
     console = Console()
     
-    # Simulate Lambda Trigger
-    result = lambda_handler(None, None)
-    
     if result['statusCode'] == 200:
         forecast = json.loads(result['body'])
         
@@ -113,3 +111,8 @@ if __name__ == "__main__":
             console.print(f"\n[italic grey50]Detected {len(forecast)} incoming signals.[/italic grey50]")
     else:
         console.print("[bold red]System Failure.[/bold red]")
+
+# --- Local Testing Block ---
+if __name__ == "__main__":
+    # Simulate Lambda Trigger
+    _render_forecast(lambda_handler(None, None))
@@ -0,0 +1,216 @@
+"""
+miners/ratelimit.py
+Shared per-host token buckets (Security/Politeness).
+Callers reserve a token under a short lock and then wait *outside* it, so
+concurrent miners hitting the same host queue up fairly without serializing
+on each other's sleeps, and different hosts never block one another.
+"""
+
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+DEFAULT_RATE = 0.5   # Tokens per second (one request every 2s)
+DEFAULT_BURST = 1    # Bucket capacity
+
+
+def host_key(url_or_host: str) -> str:
+    """Buckets are keyed by host so every miner talking to it shares one budget."""
+    parsed = urlparse(url_or_host)
+    return (parsed.netloc or url_or_host).lower()
+
+
+@dataclass
+class LimiterStats:
+    acquired: int = 0
+    waited: int = 0          # Acquisitions that had to wait at all
+    total_wait: float = 0.0  # Seconds
+    max_wait: float = 0.0    # Seconds
+
+    def record(self, wait: float):
+        self.acquired += 1
+        if wait > 0:
+            self.waited += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+
+
+class TokenBucket:
+    """
+    In-process bucket. Tokens may go negative: each reservation is handed the
+    exact delay it must wait, which keeps the lock hold time tiny.
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reconfigure(self, rate: float, capacity: int):
+        """New budget, same bucket: tokens already spent stay spent."""
+        self._refill()
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = min(self.tokens, float(capacity))
+
+    def reserve(self) -> float:
+        self._refill()
+        self.tokens -= 1
+        if self.tokens >= 0:
+            return 0.0
+        return -self.tokens / self.rate
+
+
+class SQLiteBucketStore:
+    """
+    Optional cross-process coordination.
+    Bucket state lives in a shared SQLite file; BEGIN IMMEDIATE serializes the
+    read-modify-write so several workers respect one budget per host.
+    """
+
+    def __init__(self, db_path: str):
+        import sqlite3  # Lazy: only cross-process setups pay for it (keeps Lambda cold starts lean)
+
+        self.db_path = db_path
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS rate_buckets (
+                    host TEXT PRIMARY KEY,
+                    tokens REAL NOT NULL,
+                    updated REAL NOT NULL
+                )
+            """)
+
+    def reserve(self, host: str, rate: float, capacity: int) -> float:
+        import sqlite3
+
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            now = time.time()  # Wall clock: monotonic clocks are not comparable across processes
+            row = conn.execute(
+                "SELECT tokens, updated FROM rate_buckets WHERE host = ?", (host,)
+            ).fetchone()
+            tokens = float(capacity) if row is None else min(capacity, row[0] + (now - row[1]) * rate)
+            tokens -= 1
+            conn.execute(
+                "INSERT OR REPLACE INTO rate_buckets (host, tokens, updated) VALUES (?, ?, ?)",
+                (host, tokens, now)
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+        return 0.0 if tokens >= 0 else -tokens / rate
+
+
+class HostRateLimiter:
+    def __init__(self, default_rate: float = DEFAULT_RATE, default_burst: int = DEFAULT_BURST,
+                 store: Optional[SQLiteBucketStore] = None):
+        self.default_rate = default_rate
+        self.default_burst = default_burst
+        self.store = store
+        self._limits: Dict[str, tuple] = {}
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._stats: Dict[str, LimiterStats] = {}
+        self._lock = threading.Lock()
+
+    def configure(self, url_or_host: str, rate: float, burst: int = DEFAULT_BURST):
+        """
+        Sets the budget for a host. The host's bucket is kept (only its rate and capacity change),
+        so callers configuring different budgets for one host never hand it a fresh, full bucket.
+        """
+        host = host_key(url_or_host)
+        with self._lock:
+            if self._limits.get(host) == (rate, burst):
+                return
+            self._limits[host] = (rate, burst)
+            bucket = self._buckets.get(host)
+            if bucket is not None and rate > 0:
+                bucket.reconfigure(rate, burst)
+
+    def reserve(self, url_or_host: str) -> float:
+        """Takes one token and returns how long the caller must wait before using it."""
+        host = host_key(url_or_host)
+        rate, burst = self._limits.get(host, (self.default_rate, self.default_burst))
+        if rate <= 0:
+            return 0.0
+        if self.store is not None:
+            return self.store.reserve(host, rate, burst)
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = self._buckets[host] = TokenBucket(rate, burst)
+            return bucket.reserve()
+
+    def _record(self, url_or_host: str, wait: float):
+        host = host_key(url_or_host)
+        with self._lock:
+            self._stats.setdefault(host, LimiterStats()).record(wait)
+
+    def acquire(self, url_or_host: str) -> float:
+        """Blocks the calling thread until a token is available. Returns seconds waited."""
+        wait = self.reserve(url_or_host)
+        if wait > 0:
+            time.sleep(wait)
+        self._record(url_or_host, wait)
+        return wait
+
+    async def acquire_async(self, url_or_host: str) -> float:
+        """Async variant: yields to the event loop instead of blocking it."""
+        import asyncio  # Lazy: sync-only processes (the Oracle Lambda) never import it
+
+        if self.store is not None:
+            # The shared store's BEGIN IMMEDIATE can block for seconds behind another process
+            wait = await asyncio.to_thread(self.reserve, url_or_host)
+        else:
+            wait = self.reserve(url_or_host)  # In-memory: a few microseconds under the lock
+        if wait > 0:
+            await asyncio.sleep(wait)
+        self._record(url_or_host, wait)
+        return wait
+
+    def stats(self) -> Dict[str, dict]:
+        """Wait-time metrics per host."""
+        with self._lock:
+            return {
+                host: {
+                    "acquired": s.acquired,
+                    "waited": s.waited,
+                    "total_wait": round(s.total_wait, 4),
+                    "max_wait": round(s.max_wait, 4),
+                }
+                for host, s in self._stats.items()
+            }
+
+
+_shared_limiter: Optional[HostRateLimiter] = None
+_shared_lock = threading.Lock()
+
+
+def shared_limiter() -> HostRateLimiter:
+    """
+    Process-wide limiter used by every miner.
+    Set ZEROCRATE_RATELIMIT_DB to a SQLite path to share budgets across processes.
+    """
+    global _shared_limiter
+    if _shared_limiter is None:
+        with _shared_lock:
+            if _shared_limiter is None:
+                db_path = os.environ.get("ZEROCRATE_RATELIMIT_DB")
+                store = SQLiteBucketStore(db_path) if db_path else None
+                _shared_limiter = HostRateLimiter(store=store)
+    return _shared_limiter
@@ -0,0 +1,209 @@
+"""
+miners/registry.py
+The Miner Registry: discovers miners by name and imports them only on first use.
+A process that only needs one source (or none, like the web UI) never pays for the
+bs4 / feedparser / requests imports of the others.
+
+Sources, later ones winning:
+  1. Built-ins below
+  2. Installed packages exposing the "zerocrate.miners" entry-point group
+  3. ZEROCRATE_MINERS="name=package.module:Class,..." (a bare "-name" disables one)
+
+Import budget report (cold imports, one fresh interpreter per miner):
+  python -m miners.registry
+"""
+
+import importlib
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+ENTRY_POINT_GROUP = "zerocrate.miners"
+
+BUILTIN_MINERS = {
+    "epic": "miners.epic:EpicMiner",
+    "steam": "miners.steam:SteamMiner",
+    "scout": "miners.scout:Scout",
+}
+
+# Third-party packages worth calling out in the report
+HEAVY_MODULES = ("bs4", "feedparser", "requests", "rich", "fastapi")
+
+IMPORT_BUDGET_MS = float(os.environ.get("ZEROCRATE_IMPORT_BUDGET_MS", "250"))
+
+
+@dataclass
+class ImportCost:
+    name: str
+    spec: str
+    seconds: float
+    new_modules: int
+    heavy: List[str]
+
+    def to_dict(self, budget_ms: float = IMPORT_BUDGET_MS) -> dict:
+        ms = self.seconds * 1000
+        return {
+            "miner": self.name,
+            "spec": self.spec,
+            "import_ms": round(ms, 1),
+            "new_modules": self.new_modules,
+            "heavy": self.heavy,
+            "over_budget": ms > budget_ms,
+        }
+
+
+def _entry_point_specs() -> Dict[str, str]:
+    """Reads entry-point metadata only: nothing is imported until a miner is loaded."""
+    try:
+        from importlib.metadata import entry_points
+        return {ep.name: ep.value for ep in entry_points(group=ENTRY_POINT_GROUP)}
+    except Exception as e:
+        print(f"⚠️  Miner Registry: entry-point discovery failed: {e}")
+        return {}
+
+
+def _env_specs(raw: str) -> Dict[str, Optional[str]]:
+    specs = {}
+    for item in raw.split(","):
+        item = item.strip()
+        if item.startswith("-"):
+            specs[item[1:]] = None
+        elif "=" in item:
+            name, spec = item.split("=", 1)
+            specs[name.strip()] = spec.strip()
+    return specs
+
+
+class MinerRegistry:
+    def __init__(self, specs: Optional[Dict[str, str]] = None, entry_points: bool = True):
+        self._specs: Dict[str, str] = dict(BUILTIN_MINERS)
+        if entry_points:
+            self._specs.update(_entry_point_specs())
+        overrides = _env_specs(os.environ.get("ZEROCRATE_MINERS", ""))
+        overrides.update(specs or {})
+        for name, spec in overrides.items():
+            if spec is None:
+                self._specs.pop(name, None)
+            else:
+                self._specs[name] = spec
+
+        self._classes: Dict[str, type] = {}
+        self._costs: Dict[str, ImportCost] = {}
+        self._lock = threading.Lock()
+
+    def names(self) -> List[str]:
+        return list(self._specs)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._specs
+
+    def spec(self, name: str) -> str:
+        return self._specs[name]
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._classes
+
+    def load(self, name: str) -> type:
+        """Imports the miner's module on first use and returns its class."""
+        if name in self._classes:
+            return self._classes[name]
+        if name not in self._specs:
+            raise KeyError(f"Unknown miner '{name}'. Registered: {', '.join(self._specs)}")
+
+        with self._lock:
+            if name not in self._classes:
+                spec = self._specs[name]
+                module_name, _, attr = spec.partition(":")
+                before = set(sys.modules)
+                start = time.perf_counter()
+                module = importlib.import_module(module_name)
+                seconds = time.perf_counter() - start
+                new = set(sys.modules) - before
+                cls = getattr(module, attr) if attr else module
+                self._costs[name] = ImportCost(
+                    name=name, spec=spec, seconds=seconds, new_modules=len(new),
+                    heavy=sorted(m for m in HEAVY_MODULES if m in new)
+                )
+                self._classes[name] = cls
+        return self._classes[name]
+
+    def create(self, name: str, **kwargs):
+        return self.load(name)(**kwargs)
+
+    def report(self, budget_ms: float = IMPORT_BUDGET_MS) -> List[dict]:
+        """
+        In-process import costs of the miners loaded so far. Costs depend on load
+        order (shared deps are paid by whoever comes first); see cold_report().
+        """
+        return [cost.to_dict(budget_ms) for cost in self._costs.values()]
+
+
+# Runs inside a fresh interpreter so every import is genuinely cold
+PROBE = r'''
+import json, sys, time
+before = set(sys.modules)
+start = time.perf_counter()
+import importlib
+module_name, _, attr = sys.argv[1].partition(":")
+module = importlib.import_module(module_name)
+seconds = time.perf_counter() - start
+new = set(sys.modules) - before
+print(json.dumps({"seconds": seconds, "new_modules": len(new), "modules": sorted(new)}))
+'''
+
+
+def cold_report(registry: Optional["MinerRegistry"] = None, budget_ms: float = IMPORT_BUDGET_MS,
+                extra: Optional[Dict[str, str]] = None) -> List[dict]:
+    """Cold import cost of every registered miner (plus `extra` modules), one subprocess each."""
+    import json
+    import subprocess
+
+    registry = registry or shared_registry()
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    targets = {name: registry.spec(name) for name in registry.names()}
+    targets.update(extra or {})
+
+    rows = []
+    for name, spec in targets.items():
+        out = subprocess.run([sys.executable, "-c", PROBE, spec], cwd=root,
+                             capture_output=True, text=True)
+        if out.returncode != 0:
+            rows.append({"miner": name, "spec": spec, "error": out.stderr.strip().splitlines()[-1:]})
+            continue
+        data = json.loads(out.stdout.strip().splitlines()[-1])
+        cost = ImportCost(name=name, spec=spec, seconds=data["seconds"], new_modules=data["new_modules"],
+                          heavy=sorted(m for m in HEAVY_MODULES if m in data["modules"]))
+        rows.append(cost.to_dict(budget_ms))
+    return rows
+
+
+_shared_registry: Optional[MinerRegistry] = None
+_shared_lock = threading.Lock()
+
+
+def shared_registry() -> MinerRegistry:
+    global _shared_registry
+    if _shared_registry is None:
+        with _shared_lock:
+            if _shared_registry is None:
+                _shared_registry = MinerRegistry()
+    return _shared_registry
+
+
+if __name__ == "__main__":
+    rows = cold_report(extra={
+        "oracle": "miners.oracle_lambda",
+        "core": "core.models",
+    })
+    print(f"📦 Cold import budget ({IMPORT_BUDGET_MS:.0f} ms per entry)")
+    for row in rows:
+        if "error" in row:
+            print(f"   ❌ {row['miner']:<7} {row['spec']:<30} {row['error']}")
+            continue
+        flag = "⚠️ " if row["over_budget"] else "✅"
+        heavy = ", ".join(row["heavy"]) or "-"
+        print(f"   {flag} {row['miner']:<7} {row['spec']:<30} {row['import_ms']:>7.1f} ms  "
+              f"{row['new_modules']:>4} modules  heavy: {heavy}")
@@ -2,15 +2,39 @@
 miners/scout.py
 The Watcher: Monitors high-signal RSS feeds for 100% off deals.
 Focus: r/FreeGameFindings (Strict moderation ensures high quality)
+Extra feeds can be added via the constructor or SCOUT_FEEDS (comma separated).
 """
 
 import feedparser
+import os
 import re
 import html
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Optional
-from core.models import GameOffer, Rarity
+from core.classify import classify_prices
+from core.models import GameOffer
+from miners.base import BaseMiner
+from miners.seen_index import SeenEntryIndex, stable_digest
 
-class Scout:
+MAX_FEED_WORKERS = 8
+
+# Precompiled once at import: these run for every entry of every feed
+PLATFORM_TAG_RE = re.compile(r"\[(.*?)\]")
+# In priority order: a cross-store tag like "[Epic / Steam]" counts as Steam
+PLATFORM_PATTERNS = [(re.compile(name, re.IGNORECASE), source) for name, source in (
+    ("steam", "Steam"), ("epic", "Epic Games"), ("gog", "GOG"), ("itch", "Itch.io"),
+)]
+PARENS_RE = re.compile(r"\(.*?\)")
+TITLE_TAIL_RE = re.compile(r"\-|–|100%|Free")
+HREF_RE = re.compile(r'href="([^"]+)"')
+IMG_SRC_RE = re.compile(r'src="([^"]+jpg|[^"]+png)"')
+
+
+def _keyword_matcher(keywords: List[str]) -> "re.Pattern":
+    """One case-insensitive alternation instead of a loop of substring checks."""
+    return re.compile("|".join(re.escape(k) for k in keywords), re.IGNORECASE)
+
+class Scout(BaseMiner):
     # RSS Feed for "New" posts to catch deals immediately
     RSS_URL = "https://www.reddit.com/r/FreeGameFindings/new/.rss"
     
@@ -20,35 +44,27 @@ class Scout:
         "Demo", "Beta", "Alpha", "Restocked", "Massively Multiplayer"
     ]
 
-    def __init__(self):
-        self.feed = None
+    # "expired" flair often shows up in the title for RSS
+    GARBAGE_RE = _keyword_matcher(BLACKLIST_KEYWORDS + ["EXPIRED"])
 
-    def _is_garbage(self, title: str) -> bool:
-        """Filters out DLCs, trash, and non-game content."""
-        title_upper = title.upper()
-        
-        # 1. Check for forbidden keywords
-        for keyword in self.BLACKLIST_KEYWORDS:
-            if keyword.upper() in title_upper:
-                return True
-        
-        # 2. Check for "expired" flair (often in title for RSS)
-        if "EXPIRED" in title_upper:
-            return True
+    def __init__(self, feeds: Optional[List[str]] = None, index: Optional[SeenEntryIndex] = None):
+        super().__init__("Scout", label="scout")
+        if feeds is None:
+            env_feeds = os.environ.get("SCOUT_FEEDS", "")
+            feeds = [f.strip() for f in env_feeds.split(",") if f.strip()] or [self.RSS_URL]
+        self.feeds = feeds
+        # Persistent record of processed entries: restarts and parallel workers skip them
+        self.index = index or SeenEntryIndex()
 
-        return False
+    def _is_garbage(self, title: str) -> bool:
+        """Filters out DLCs, trash, expired posts and non-game content."""
+        return self.GARBAGE_RE.search(title) is not None
 
     def _normalize_platform(self, raw_platform: str) -> Optional[str]:
         """Maps subreddit tags to our internal Source strings."""
-        raw = raw_platform.lower()
-        if "steam" in raw:
-            return "Steam"
-        if "epic" in raw:
-            return "Epic Games"
-        if "gog" in raw:
-            return "GOG"
-        if "itch" in raw:
-            return "Itch.io"
+        for pattern, source in PLATFORM_PATTERNS:
+            if pattern.search(raw_platform):
+                return source
         return None  # We ignore unknown platforms for now
 
     def _estimate_value(self, platform: str) -> float:
@@ -74,7 +90,7 @@ class Scout:
             # Regex to find the href associated with "[link]" text commonly used by Reddit
             # Or just the first external link that isn't reddit.com
             # r/FreeGameFindings usually has a standard format.
-            matches = re.findall(r'href="([^"]+)"', content)
+            matches = HREF_RE.findall(content)
             for m in matches:
                 if "reddit.com" not in m and "static.reddit" not in m:
                     return m
@@ -95,84 +111,141 @@ class Scout:
         # Fallback: check content for img tag
         try:
             content = entry.content[0].value
-            match = re.search(r'src="([^"]+jpg|[^"]+png)"', content)
+            match = IMG_SRC_RE.search(content)
             if match:
                 return match.group(1)
         except:
             pass
         return ""
 
+    def _fetch_feed(self, url: str) -> Optional[list]:
+        """Parses one RSS feed. A dead feed yields None rather than failing the cycle."""
+        try:
+            with self._phase("fetch", url):
+                feed = feedparser.parse(url)
+        except Exception as e:
+            print(f"⚠️  Scout Link Error ({url}): {e}")
+            return None
+
+        if hasattr(feed, 'status') and feed.status != 200:
+            print(f"⚠️  Scout failed to connect to {url}. Status: {feed.status}")
+            return None
+        return feed.entries
+
+    def _fetch_entries(self) -> list:
+        """Fetches all feeds concurrently and merges them, dropping cross-posted duplicates."""
+        workers = max(1, min(MAX_FEED_WORKERS, len(self.feeds)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            feeds = [entries for entries in pool.map(self._fetch_feed, self.feeds) if entries is not None]
+
+        if not feeds:
+            raise RuntimeError("Scout lost contact with every feed")
+
+        merged = {}
+        for entries in feeds:
+            for entry in entries:
+                merged.setdefault(entry.get('id') or entry.get('link', ''), entry)
+        return list(merged.values())
+
     def fetch_games(self) -> List[GameOffer]:
-        """Fetches the feed and returns verified GameOffer objects."""
-        print(f"🔭 Scout is scanning: {self.RSS_URL} ...")
-        
-        # Parse the RSS Feed
+        """Fetches the feeds and returns verified GameOffer objects."""
         try:
-            feed = feedparser.parse(self.RSS_URL)
+            return self.mine()
         except Exception as e:
             print(f"⚠️  Scout Link Error: {e}")
             return []
 
-        if hasattr(feed, 'status') and feed.status != 200:
-            print(f"⚠️  Scout failed to connect. Status: {feed.status}")
-            return []
+    def _parse_entry(self, entry) -> Optional[GameOffer]:
+        """One feed entry to an offer, or None if it isn't a base game on a known platform."""
+        # RSS titles often look like: "[Steam] (Game) Pizza Possum - Free"
+        title = entry.title
+
+        # 1. Strict Filter Check
+        if self._is_garbage(title):
+            return None
+
+        # 2. Parse Title Structure
+        match = PLATFORM_TAG_RE.search(title)
+        if not match:
+            return None
+
+        raw_platform = match.group(1)
+        platform = self._normalize_platform(raw_platform)
+
+        if not platform:
+            return None
+
+        # 3. Clean Game Title
+        clean_title = title.replace(f"[{raw_platform}]", "").strip()
+        clean_title = PARENS_RE.sub("", clean_title)
+        clean_title = TITLE_TAIL_RE.split(clean_title)[0].strip()
+        clean_title = html.unescape(clean_title)
+
+        # 4. Extract Real URL & Image
+        real_url = self._extract_real_url(entry)
+        image_url = self._extract_thumbnail(entry)
+
+        # 5. Construct the Offer
+        estimated_price = self._estimate_value(platform)
+
+        clean_url_key = real_url.split('?')[0].split('#')[0].rstrip('/')
+        url_hash = stable_digest(clean_url_key, size=4)
+        platform_id = f"scout_{platform.lower()}_{url_hash}"
+
+        return GameOffer(
+            title=clean_title,
+            original_price=estimated_price,
+            discount_price=0.0,
+            description=f"Detected via Scout. Source: {platform}",
+            image_url=image_url,
+            store_url=real_url,
+            source=f"{platform}",
+            platform_id=platform_id
+        )
+
+    def mine(self) -> List[GameOffer]:
+        """
+        Strict variant of fetch_games: raises if no feed could be reached.
+        Returns every live offer in the feeds; only new or edited entries are parsed.
+        """
+        print(f"🔭 Scout is scanning {len(self.feeds)} feed(s): {', '.join(self.feeds)} ...")
+
+        entries = self._fetch_entries()
+
+        with self._phase("parse") as phase:
+            keys = [(entry.get('id') or entry.get('link', ''),
+                     stable_digest(entry.get('title', ''), entry.get('link', ''), entry.get('updated', '')))
+                    for entry in entries]
+            known = self.index.lookup(keys)
+
+            loot_bag = []
+            seen_ids = set()
+            parsed = []  # Results to remember, written once the cycle's offers are built
+
+            for entry, (entry_key, digest) in zip(entries, keys):
+                if entry_key in known:
+                    data = known[entry_key]
+                    offer = GameOffer.from_dict(data) if data else None
+                else:
+                    offer = self._parse_entry(entry)
+                    parsed.append((entry_key, digest, offer.to_dict() if offer else None))
+                if offer is None:
+                    continue
+
+                # Same deal posted to several feeds: keep the first
+                if offer.platform_id in seen_ids:
+                    continue
+                seen_ids.add(offer.platform_id)
+                loot_bag.append(offer)
+
+            # Same tiers as every other miner, applied to the estimated values in one pass
+            appraisal = classify_prices([offer.original_price for offer in loot_bag])
+            for offer, rarity in zip(loot_bag, appraisal.rarities):
+                offer.rarity = rarity
+            phase.rows = len(parsed)
 
-        loot_bag = []
-
-        for entry in feed.entries:
-            # RSS titles often look like: "[Steam] (Game) Pizza Possum - Free"
-            title = entry.title
-            
-            # 1. Strict Filter Check
-            if self._is_garbage(title):
-                continue
-
-            # 2. Parse Title Structure
-            match = re.search(r"\[(.*?)\]", title)
-            if not match:
-                continue 
-            
-            raw_platform = match.group(1)
-            platform = self._normalize_platform(raw_platform)
-
-            if not platform:
-                continue 
-
-            # 3. Clean Game Title
-            clean_title = title.replace(f"[{raw_platform}]", "").strip()
-            clean_title = re.sub(r"\(.*?\)", "", clean_title) 
-            clean_title = re.split(r"\-|–|100%|Free", clean_title)[0].strip()
-            clean_title = html.unescape(clean_title)
-
-            # 4. Extract Real URL & Image
-            real_url = self._extract_real_url(entry)
-            image_url = self._extract_thumbnail(entry)
-
-            # 5. Construct the Offer
-            estimated_price = self._estimate_value(platform)
-            
-            clean_url_key = real_url.split('?')[0].split('#')[0].rstrip('/')
-            url_hash = hex(hash(clean_url_key) & 0xffffffff)[2:] 
-            platform_id = f"scout_{platform.lower()}_{url_hash}"
-
-            rarity = Rarity.COMMON
-            if estimated_price > 15: rarity = Rarity.RARE
-            
-            offer = GameOffer(
-                title=clean_title,
-                original_price=estimated_price,
-                discount_price=0.0, 
-                description=f"Detected via Scout. Source: {platform}",
-                image_url=image_url, 
-                store_url=real_url,
-                source=f"{platform}",
-                platform_id=platform_id,
-                rarity=rarity
-            )
-            
-            loot_bag.append(offer)
-
-        print(f"✅ Scout returned with {len(loot_bag)} potential assets.")
+        self.index.record(parsed)
+        print(f"✅ Scout returned with {len(loot_bag)} live assets ({len(parsed)} newly parsed).")
         return loot_bag
 
 # Quick verification block
@@ -0,0 +1,90 @@
+"""
+miners/seen_index.py
+Persistent index of feed entries a miner has already parsed, with the parse result.
+An entry whose content digest is unchanged is served from here instead of being
+parsed again, so a cycle only pays for new or edited posts while still returning
+the feed's full live set. Keys and digests are stable across processes (blake2b,
+not Python's salted hash()), so restarts and parallel workers share the work.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+SEEN_DB_PATH = "data/seen_entries.db"
+
+
+def stable_digest(*parts: str, size: int = 16) -> str:
+    """Process-independent hex digest of the given strings."""
+    h = hashlib.blake2b(digest_size=size)
+    for part in parts:
+        h.update((part or "").encode("utf-8"))
+        h.update(b"\x1f")  # Field separator so ("ab", "c") != ("a", "bc")
+    return h.hexdigest()
+
+
+class SeenEntryIndex:
+    def __init__(self, db_path: str = SEEN_DB_PATH, namespace: str = "scout"):
+        self.db_path = db_path
+        self.namespace = namespace
+        self._ensure_db()
+
+    def _ensure_db(self):
+        if os.path.dirname(self.db_path):
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS seen_entries (
+                    namespace TEXT NOT NULL,
+                    entry_key TEXT NOT NULL,
+                    digest TEXT NOT NULL,
+                    seen_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    payload TEXT,
+                    PRIMARY KEY (namespace, entry_key)
+                )
+            """)
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(seen_entries)")}
+            if "payload" not in columns:
+                # Indexes from before parse results were kept: their rows just get parsed once more
+                conn.execute("ALTER TABLE seen_entries ADD COLUMN payload TEXT")
+            conn.commit()
+
+    def lookup(self, keys: Iterable[Tuple[str, str]]) -> Dict[str, Optional[Any]]:
+        """
+        {entry_key: stored parse result} for the (entry_key, digest) pairs already parsed at that digest.
+        A stored result of None means the entry was parsed and rejected.
+        """
+        wanted = dict(keys)
+        if not wanted:
+            return {}
+        found = {}
+        with sqlite3.connect(self.db_path, timeout=30) as conn:
+            entry_keys = list(wanted)
+            for i in range(0, len(entry_keys), 500):  # Stay under SQLite's bound-parameter limit
+                chunk = entry_keys[i:i + 500]
+                rows = conn.execute(
+                    f"SELECT entry_key, digest, payload FROM seen_entries "
+                    f"WHERE namespace = ? AND entry_key IN ({','.join('?' * len(chunk))}) AND payload IS NOT NULL",
+                    [self.namespace, *chunk]
+                )
+                for entry_key, digest, payload in rows:
+                    if wanted[entry_key] == digest:
+                        found[entry_key] = json.loads(payload)
+        return found
+
+    def record(self, results: List[Tuple[str, str, Optional[Any]]]):
+        """
+        Stores (entry_key, digest, parse result) rows in one transaction.
+        Call it once the results are built: an entry is only skipped after it was fully processed.
+        """
+        if not results:
+            return
+        with sqlite3.connect(self.db_path, timeout=30) as conn:
+            conn.executemany("""
+                INSERT INTO seen_entries (namespace, entry_key, digest, payload) VALUES (?, ?, ?, ?)
+                ON CONFLICT(namespace, entry_key) DO UPDATE
+                    SET digest = excluded.digest, payload = excluded.payload, seen_at = CURRENT_TIMESTAMP
+            """, [(self.namespace, key, digest, json.dumps(result)) for key, digest, result in results])
+            conn.commit()
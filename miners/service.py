@@ -0,0 +1,168 @@
+"""
+miners/service.py
+The Mining Service: long-running loop that polls every source through the
+adaptive scheduler, keeps the SWR cache warm and records deltas in the change feed.
+Live offers are also written to the shared loot cache the web workers read from;
+their /api/why explanations are precomputed and their covers prefetched as they arrive.
+The Oracle runs alongside: its forecasts are persisted and each predicted unlock
+arms a targeted Epic refresh, so new drops land in the cache seconds after going live.
+Run with: python -m miners.service
+"""
+
+import time
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Callable, Optional
+from core.changefeed import REMOVED, ChangeFeed
+from core.explain import ExplanationStore
+from core.forecast import ForecastStore
+from core.loot_cache import LOOT_CACHE_DB_PATH, LootCache
+from core.scheduler import PollScheduler
+from core.search import SearchIndex
+from miners.base import PartialResult
+from miners.cache import CachedSource, MinerResultCache
+from miners.images import ImageCache, shared_image_cache
+from miners.registry import MinerRegistry, shared_registry
+
+if TYPE_CHECKING:  # Epic's catalog and the Oracle are imported only when "epic" is registered
+    from miners.epic_catalog import EpicCatalog
+
+# Base polling interval per registry name; every other registered miner (entry points,
+# ZEROCRATE_MINERS) gets DEFAULT_INTERVAL. Sources report their full live set, so each cycle prunes.
+SOURCES = {
+    "epic": 900.0,
+    "steam": 900.0,
+    "scout": 120.0,
+}
+DEFAULT_INTERVAL = 900.0
+ORACLE_INTERVAL = 3600.0
+
+
+def _make_poll(source: CachedSource, feed: ChangeFeed, producer: str,
+               search: Optional[SearchIndex] = None, loot_cache: Optional[LootCache] = None,
+               explanations: Optional[ExplanationStore] = None, images: Optional[ImageCache] = None):
+    def cache_live():
+        # Rewritten every cycle (failed ones too: the feed still lists their offers) so live
+        # offers never hit the TTL; pruning keeps the shared table bounded. Web workers read it.
+        loot_cache.update_many(source.offers)
+        loot_cache.prune()
+
+    def poll() -> bool:
+        refreshed = source.refresh()
+        if refreshed is None:
+            return False  # A refresh (e.g. a reader's SWR revalidation) is already running: nothing to record
+        if not refreshed:
+            if loot_cache is not None:
+                cache_live()
+            raise RuntimeError(source.last_error or f"{source.name} breaker is open")
+        # Changed iff the cycle produced events: that's what drives the adaptive interval.
+        # A partial crawl can't tell us what ended, so it only adds and updates.
+        events = feed.record_cycle(source.offers, producer=producer,
+                                   prune=not isinstance(source.offers, PartialResult))
+        if events and search is not None:
+            search.sync_changefeed(feed)
+        if events and explanations is not None:
+            explanations.sync_changefeed(feed)
+        if events and images is not None:
+            # Covers of new / changed offers are on disk before the first client asks for them
+            images.prefetch_in_background(e.payload.get("image_url") for e in events if e.kind != REMOVED)
+        if loot_cache is not None:
+            for event in events:
+                if event.kind == REMOVED:
+                    loot_cache.pop(event.offer_id, None)
+            cache_live()
+        return bool(events)
+    return poll
+
+
+def _lazy_mine(registry: MinerRegistry, name: str, **kwargs):
+    """Builds the miner (and imports its module) on the first poll, not at service start."""
+    miner = []
+
+    def mine():
+        if not miner:
+            miner.append(registry.create(name, **kwargs))
+        return miner[0].mine()
+    return mine
+
+
+def _unlock_aware(poll: Callable[[], bool], catalog: "EpicCatalog", store: ForecastStore):
+    """Bypasses the catalog's TTL cache when a forecast unlock has passed since the last poll."""
+    last_poll = [datetime.now(timezone.utc)]
+
+    def wrapped() -> bool:
+        now = datetime.now(timezone.utc)
+        unlocked = store.between(last_poll[0], now)
+        last_poll[0] = now
+        if unlocked:
+            print(f"🔓 Oracle: {', '.join(f.game for f in unlocked)} should be live. Refreshing Epic now.")
+            catalog.invalidate()
+        return poll()
+    return wrapped
+
+
+def _make_oracle_poll(catalog: "EpicCatalog", store: ForecastStore, scheduler: PollScheduler):
+    from miners.oracle_lambda import forecast_records
+
+    def poll():
+        forecasts = forecast_records(catalog.get())
+        store.record(forecasts)
+        # Arm a wake-up for every known unlock; the scheduler re-arms each in turn
+        for forecast in store.upcoming(datetime.now(timezone.utc)):
+            scheduler.hint_unlock("epic", forecast.starts_at.timestamp())
+        return [f.to_intel() for f in forecasts]
+    return poll
+
+
+def build_service(feed: Optional[ChangeFeed] = None, cache: Optional[MinerResultCache] = None,
+                  scheduler: Optional[PollScheduler] = None, forecasts: Optional[ForecastStore] = None,
+                  catalog: Optional["EpicCatalog"] = None,
+                  registry: Optional[MinerRegistry] = None,
+                  search: Optional[SearchIndex] = None,
+                  loot_cache: Optional[LootCache] = None,
+                  explanations: Optional[ExplanationStore] = None,
+                  images: Optional[ImageCache] = None) -> PollScheduler:
+    feed = feed or ChangeFeed()
+    cache = cache or MinerResultCache()
+    scheduler = scheduler or PollScheduler()
+    forecasts = forecasts or ForecastStore()
+    registry = registry or shared_registry()
+    search = search or SearchIndex()
+    loot_cache = loot_cache if loot_cache is not None else LootCache(db_path=LOOT_CACHE_DB_PATH)
+    explanations = explanations or ExplanationStore()
+    images = images or shared_image_cache()
+    search.sync_changefeed(feed)  # Catch up on cycles recorded while we were down
+    explanations.sync_changefeed(feed)
+
+    if "epic" in registry and catalog is None:
+        from miners.epic_catalog import shared_catalog
+        catalog = shared_catalog()
+
+    # Every registered miner is polled: built-ins, entry points and ZEROCRATE_MINERS alike
+    for name in registry.names():
+        interval = SOURCES.get(name, DEFAULT_INTERVAL)
+        mine = _lazy_mine(registry, name, catalog=catalog) if name == "epic" else _lazy_mine(registry, name)
+        source = cache.register(name, mine, ttl=interval)
+        poll = _make_poll(source, feed, name, search, loot_cache, explanations, images)
+        if name == "epic":
+            poll = _unlock_aware(poll, catalog, forecasts)
+        scheduler.add_source(name, poll, interval=interval)
+
+    if "epic" in registry:
+        # The Oracle forecasts Epic unlocks; without the Epic source there is nothing to arm
+        scheduler.add_source("oracle", _make_oracle_poll(catalog, forecasts, scheduler),
+                             interval=ORACLE_INTERVAL, max_interval=6 * ORACLE_INTERVAL)
+    return scheduler
+
+
+if __name__ == "__main__":
+    scheduler = build_service()
+    scheduler.start()
+    print("🛰️  Mining service online. Ctrl+C to stop.")
+    try:
+        while True:
+            time.sleep(60)
+            for job in scheduler.snapshot():
+                print(f"   {job['name']:<6} next in {job['next_run_in']:>7}s  interval {job['interval']:>6.0f}s  "
+                      f"runs {job['runs']}  changes {job['changes']}  failures {job['failures']}")
+    except KeyboardInterrupt:
+        scheduler.stop(wait=False)
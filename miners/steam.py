@@ -1,40 +1,42 @@
+import os
 import requests
 import re
-from typing import List
-from bs4 import BeautifulSoup
-from core.models import GameOffer, Rarity
-from miners.base import BaseMiner
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+from bs4 import BeautifulSoup, SoupStrainer
+from core.classify import classify_prices
+from core.models import GameOffer
+from miners.base import BaseMiner, PartialResult
+from miners.seen_index import stable_digest
+
+PAGE_SIZE = 50        # Rows per search window (Steam caps count at 100)
+MAX_PAGES = 20        # Safety cap: 1000 rows
+MAX_CONCURRENCY = 4   # Windows in flight at once
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept-Language': 'en-US,en;q=0.9'
+}
+
+ROW_STRAINER = SoupStrainer('a', class_='search_result_row')
+APP_ID_RE = re.compile(r'/app/(\d+)')
+
+# Search URL: 
+# specials=1 (On Sale)
+# maxprice=free (Free)
+# category1=998 (Game) - This filters out DLCs/Soundtracks to reduce noise
+# supportedlang=english - Ensures we can parse review text
+STEAM_SEARCH_URL = os.environ.get(
+    "STEAM_SEARCH_URL",
+    "https://store.steampowered.com/search/results/?maxprice=free&specials=1&category1=998&supportedlang=english"
+)
 
 class SteamMiner(BaseMiner):
-    def __init__(self):
-        super().__init__("Steam Store")
-        # Search URL: 
-        # specials=1 (On Sale)
-        # maxprice=free (Free)
-        # category1=998 (Game) - This filters out DLCs/Soundtracks to reduce noise
-        # supportedlang=english - Ensures we can parse review text
-        self.search_url = "https://store.steampowered.com/search/results/?maxprice=free&specials=1&category1=998&supportedlang=english"
-
-    def _clean_price(self, price_str: str) -> float:
-        """Robustly extracts float value from any currency string (e.g., '₪59.90', '€19.99')."""
-        if not price_str or "free" in price_str.lower():
-            return 0.0
-        try:
-            # Regex to find standard price format (digits + optional dot/comma)
-            # Matches: 19.99, 59,90, 1,200.00
-            # We assume '.' is decimal separator for simplistic global support, 
-            # or we normalize ',' to '.' if it looks like a decimal.
-            
-            # Simple approach: Remove everything except digits and dots/commas
-            clean = re.sub(r'[^\d.,]', '', price_str)
-            
-            # If comma is used as decimal (e.g. 59,99), replace with dot
-            if ',' in clean and '.' not in clean:
-               clean = clean.replace(',', '.')
-            
-            return float(clean)
-        except:
-            return 0.0
+    def __init__(self, search_url: Optional[str] = None):
+        super().__init__("Steam Store", label="steam")
+        self.search_url = search_url or STEAM_SEARCH_URL
+        # Let the first wave of pages go out together; the host bucket paces the rest
+        self.burst = MAX_CONCURRENCY
 
     def _parse_review_score(self, review_html: str) -> bool:
         """Returns True if reviews are Very Positive or Overwhelmingly Positive."""
@@ -55,98 +57,163 @@ class SteamMiner(BaseMiner):
             
         return False
 
+    def _page_url(self, start: int) -> str:
+        # infinite=1 makes Steam return JSON {results_html, total_count} for a start/count window
+        return f"{self.search_url}&start={start}&count={PAGE_SIZE}&infinite=1"
+
+    def _fetch_page(self, session: requests.Session, start: int) -> Tuple[str, int]:
+        """Returns (results_html, total_count) for one window of the search results."""
+        url = self._page_url(start)
+        self._rate_limit(url)
+        with self._phase("fetch", start):
+            response = session.get(url, headers=HEADERS, timeout=15)
+            if response.status_code != 200:
+                raise RuntimeError(f"Steam returned {response.status_code} for start={start}")
+            payload = response.json()
+        return payload.get('results_html', ''), int(payload.get('total_count', 0))
+
+    def _parse_row(self, row) -> Optional[Tuple[str, dict]]:
+        """
+        Parses one search_result_row into (raw original price, GameOffer fields).
+        Returns None if it isn't a quality 100%-off game. Prices are appraised per page.
+        """
+        title_tag = row.find(class_='title')
+        if not title_tag:
+            return None
+        title = title_tag.get_text(strip=True)
+
+        # 1. Quality Check: Reviews
+        # We strictly require "Very Positive" or "Overwhelmingly Positive"
+        review_tag = row.find(class_='search_review_summary')
+        if not review_tag:
+            return None
+
+        # Parse data-tooltip-html="Very Positive<br>..."
+        review_html = review_tag.get('data-tooltip-html', '')
+        if not self._parse_review_score(review_html):
+            return None
+
+        # 2. 100% Discount Check (done by the caller) -> 3. Price Check
+        # If it's a 100% deal, the original price is always struck through.
+        strike = row.find('strike')
+        if not strike:
+            return None
+
+        raw_price = strike.get_text(strip=True)
+
+        # Url
+        store_url = row['href']
+
+        # Image (img src inside .search_capsule)
+        capsule = row.find(class_='search_capsule')
+        img_tag = capsule.find('img') if capsule else None
+        image_url = img_tag['src'] if img_tag else ""
+
+        # ID Extraction
+        platform_id = row.get('data-ds-appid')
+        if not platform_id:
+            # Fallback: try to regex from URL
+            match = APP_ID_RE.search(store_url)
+            if match:
+                platform_id = match.group(1)
+            else:
+                platform_id = f"steam_unknown_{stable_digest(title, size=8)}" # Last resort
+
+        return raw_price, dict(
+            title=title,
+            discount_price=0.0,
+            description="Steam Community Reviewed: Very Positive+",
+            image_url=image_url,
+            store_url=store_url,
+            source="Steam",
+            platform_id=platform_id
+        )
+
+    def _parse_page(self, results_html: str) -> Tuple[List[GameOffer], bool]:
+        """
+        Parses only the a.search_result_row elements of a page.
+        Returns (offers, has_discounted_rows).
+        """
+        # SoupStrainer skips building a tree for everything but the result rows
+        soup = BeautifulSoup(results_html, 'html.parser', parse_only=ROW_STRAINER)
+
+        candidates = []
+        has_discounted = False
+        for row in soup.find_all('a', class_='search_result_row'):
+            try:
+                discount_block = row.find(class_='search_discount')
+                discount_span = discount_block.find('span') if discount_block else None
+                if not discount_span or discount_span.get_text(strip=True) != '-100%':
+                    continue
+                has_discounted = True
+
+                parsed = self._parse_row(row)
+                if parsed:
+                    candidates.append(parsed)
+            except Exception:
+                continue
+
+        # One appraisal pass for the whole page (memoized price parsing + rarity tiers)
+        appraisal = classify_prices([raw_price for raw_price, _ in candidates])
+        offers = [
+            GameOffer(original_price=price, rarity=rarity, **fields)
+            for (_, fields), price, rarity in zip(candidates, appraisal.prices, appraisal.rarities)
+            if price > 0
+        ]
+        return offers, has_discounted
+
+    def mine(self) -> List[GameOffer]:
+        """
+        Strict mining pass: upstream failures raise instead of returning [].
+        If a later page fails, paging stops and the pages before it come back as a PartialResult.
+        """
+        with requests.Session() as session:
+            adapter = requests.adapters.HTTPAdapter(pool_maxsize=MAX_CONCURRENCY)
+            session.mount("https://", adapter)
+
+            # First window tells us how many results exist
+            first_html, total_count = self._fetch_page(session, 0)
+            with self._phase("parse") as phase:
+                loot_crate, has_discounted = self._parse_page(first_html)
+                phase.rows = len(loot_crate)
+
+            starts = list(range(PAGE_SIZE, min(total_count, PAGE_SIZE * MAX_PAGES), PAGE_SIZE))
+
+            # Remaining windows go out in waves of MAX_CONCURRENCY.
+            # Stop once a wave has a page with no 100%-off rows: we've run past the deals.
+            failed = None
+            with ThreadPoolExecutor(max_workers=MAX_CONCURRENCY) as pool:
+                while has_discounted and starts and failed is None:
+                    wave, starts = starts[:MAX_CONCURRENCY], starts[MAX_CONCURRENCY:]
+                    pages = [pool.submit(self._fetch_page, session, start) for start in wave]
+                    for start, page in zip(wave, pages):
+                        try:
+                            results_html = page.result()[0]
+                        except Exception as e:
+                            # Keep only the pages before the hole, even ones of this wave that did
+                            # arrive: the partial result is always a prefix of the listing
+                            failed = f"page start={start}: {e}"
+                            print(f"⚠️  {self.name}: {failed}. Keeping the pages before it.")
+                            break
+                        with self._phase("parse") as phase:
+                            offers, page_has_discounted = self._parse_page(results_html)
+                            phase.rows = len(offers)
+                        loot_crate.extend(offers)
+                        has_discounted = has_discounted and page_has_discounted
+
+        # Windows can shift while we page through them, so dedup by App ID
+        unique = {}
+        for offer in loot_crate:
+            unique.setdefault(offer.platform_id, offer)
+        if failed is not None:
+            return PartialResult(unique.values(), error=failed)
+        return list(unique.values())
+
     def fetch_games(self) -> List[GameOffer]:
-        self._rate_limit()
         print(f"⛏️  {self.name}: Scanning for Quality Deals...")
         
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-                'Accept-Language': 'en-US,en;q=0.9'
-            }
-            response = requests.get(self.search_url, headers=headers)
-            if response.status_code != 200:
-                print(f"⚠️  Steam returned {response.status_code}")
-                return []
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            rows = soup.select('a.search_result_row')
-            
-            loot_crate = []
-            
-            for row in rows:
-                try:
-                    title = row.select_one('.title').text.strip()
-                    
-                    # 1. Quality Check: Reviews
-                    # We strictly require "Very Positive" or "Overwhelmingly Positive"
-                    review_tag = row.select_one('.search_review_summary')
-                    if not review_tag:
-                         continue
-
-                    # Parse data-tooltip-html="Very Positive<br>..."
-                    review_html = review_tag.get('data-tooltip-html', '')
-                    if not self._parse_review_score(review_html):
-                        # print(f"🗑️  Skipping garbage: {title}")
-                        continue
-                        
-                    # 2. 100% Discount Check
-                    discount_div = row.select_one('.search_discount span')
-                    if not discount_div or discount_div.text.strip() != '-100%':
-                        continue
-                    
-                    # 3. Price Check (Get Original Price from <strike>)
-                    # If it's a 100% deal, the original price is always struck through.
-                    strike = row.select_one('strike')
-                    if not strike: 
-                        continue
-                    
-                    original_price = self._clean_price(strike.text.strip())
-                    
-                    if original_price <= 0:
-                        continue
-
-                    # Url
-                    store_url = row['href']
-                    
-                    # Image (img src inside .search_capsule)
-                    img_tag = row.select_one('.search_capsule img')
-                    image_url = img_tag['src'] if img_tag else ""
-
-                    # Rarity logic
-                    rarity = Rarity.COMMON
-                    if original_price > 40: rarity = Rarity.LEGENDARY
-                    elif original_price > 15: rarity = Rarity.EPIC
-                    elif original_price > 5: rarity = Rarity.RARE
-
-                    # ID Extraction
-                    platform_id = row.get('data-ds-appid')
-                    if not platform_id:
-                        # Fallback: try to regex from URL
-                        match = re.search(r'/app/(\d+)', store_url)
-                        if match:
-                            platform_id = match.group(1)
-                        else:
-                            platform_id = f"steam_unknown_{hash(title)}" # Last resort
-
-                    offer = GameOffer(
-                        title=title,
-                        original_price=original_price,
-                        discount_price=0.0,
-                        description="Steam Community Reviewed: Very Positive+",
-                        image_url=image_url,
-                        store_url=store_url,
-                        source="Steam",
-                        platform_id=platform_id,
-                        rarity=rarity
-                    )
-                    loot_crate.append(offer)
-                    
-                except Exception as e:
-                    continue
-                    
-            return loot_crate
-
+            return self.mine()
         except Exception as e:
             print(f"❌ Error mining Steam: {e}")
             return []
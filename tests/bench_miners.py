@@ -0,0 +1,123 @@
+"""
+tests/bench_miners.py
+Per-miner parse throughput and end-to-end cycle latency, fully offline.
+Parse benchmarks feed synthetic payloads straight into the parsers; cycle benchmarks
+run each miner's mine() against the local upstream stub (see tests/upstream_stub.py).
+Run with: python tests/bench_miners.py [--steam-rows N] [--epic-elements N] [--rss-entries N]
+                                       [--latency S] [--jitter S] [--error-rate F] [--fixtures]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import feedparser
+from miners.epic import EpicMiner
+from miners.epic_catalog import EpicCatalog, parse_catalog
+from miners.ratelimit import HostRateLimiter
+from miners.scout import Scout
+from miners.seen_index import SeenEntryIndex
+from miners.steam import SteamMiner
+from upstream_stub import StubConfig, UpstreamStub, synthetic_epic, synthetic_rss, synthetic_steam_page
+
+
+def _best_of(fn, repeat: int = 3):
+    """Returns (best seconds, last result)."""
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def _report(label: str, seconds: float, items: int, unit: str):
+    rate = items / seconds if seconds else float("inf")
+    print(f"  {label:<28} {seconds * 1000:9.2f} ms  {items:>6} {unit:<8} {rate:>10,.0f}/s")
+
+
+def _unlimited() -> HostRateLimiter:
+    # The stub is local: benchmark the miners, not the politeness delays
+    return HostRateLimiter(default_rate=0)
+
+
+def bench_parsing(cfg: StubConfig, tmp: str):
+    print("⚙️  Parse throughput (no I/O)")
+
+    payload = synthetic_epic(cfg.epic_elements)
+    seconds, entries = _best_of(lambda: parse_catalog(payload))
+    _report("epic parse_catalog", seconds, len(entries), "elements")
+
+    page = synthetic_steam_page(0, cfg.steam_total, cfg.steam_total, cfg.steam_discounted)["results_html"]
+    miner = SteamMiner()
+    seconds, (offers, _) = _best_of(lambda: miner._parse_page(page))
+    _report("steam _parse_page", seconds, cfg.steam_total, "rows")
+
+    body = synthetic_rss(cfg.rss_entries)
+    seconds, feed = _best_of(lambda: feedparser.parse(body))
+    _report("scout feedparser", seconds, len(feed.entries), "entries")
+
+    def scout_cycle():
+        # Fresh index every run so every entry is parsed
+        scout = Scout(feeds=["bench"], index=SeenEntryIndex(os.path.join(tmp, f"seen_{time.perf_counter_ns()}.db")))
+        scout._fetch_entries = lambda: feed.entries
+        return scout.mine()
+    seconds, offers = _best_of(scout_cycle)
+    _report("scout entry processing", seconds, len(feed.entries), "entries")
+
+
+def bench_cycles(cfg: StubConfig, tmp: str):
+    print(f"🧪 End-to-end mine() against the stub "
+          f"(latency {cfg.latency * 1000:.0f}ms ±{cfg.jitter * 1000:.0f}ms, errors {cfg.error_rate:.0%})")
+
+    with UpstreamStub(cfg) as stub:
+        epic = EpicMiner(catalog=EpicCatalog(url=stub.epic_url, ttl=0, limiter=_unlimited()))
+        epic.min_interval = 0
+        steam = SteamMiner(search_url=stub.steam_url)
+        steam.limiter, steam.min_interval = _unlimited(), 0
+        scout = Scout(feeds=[stub.rss_url()], index=SeenEntryIndex(os.path.join(tmp, "seen_cycle.db")))
+
+        for label, miner in (("epic", epic), ("steam", steam), ("scout", scout)):
+            try:
+                seconds, offers = _best_of(miner.mine, repeat=1)
+                _report(f"{label} mine()", seconds, len(offers), "offers")
+            except Exception as e:
+                print(f"  {label + ' mine()':<28} failed: {e}")
+
+        # Warm cycles: Epic revalidates with If-None-Match, Scout reuses every parsed entry
+        for label, miner in (("epic (304)", epic), ("scout (all parsed)", scout)):
+            seconds, offers = _best_of(miner.mine)
+            _report(f"{label} mine()", seconds, len(offers), "offers")
+
+        print(f"  upstream hits: {json.dumps(cfg.hits)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--steam-rows", type=int, default=10_000)
+    parser.add_argument("--epic-elements", type=int, default=5_000)
+    parser.add_argument("--rss-entries", type=int, default=1_000)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--fixtures", action="store_true", help="Replay tests/fixtures/* instead of synthetic data")
+    args = parser.parse_args()
+
+    cfg = StubConfig(epic_elements=args.epic_elements, steam_total=args.steam_rows,
+                     steam_discounted=args.steam_rows * 6 // 10, rss_entries=args.rss_entries,
+                     latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                     use_fixtures=args.fixtures)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        bench_parsing(cfg, tmp)
+        bench_cycles(cfg, tmp)
+
+
+if __name__ == "__main__":
+    main()
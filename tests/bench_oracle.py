@@ -0,0 +1,75 @@
+"""
+tests/bench_oracle.py
+Oracle cold/warm latency benchmark.
+Serves a synthetic freeGamesPromotions payload from the upstream stub (with ETag/304 support),
+then measures in a fresh interpreter: module import, the first (cold) invocation,
+and warm invocations both from cache and with upstream revalidation.
+Run with: python tests/bench_oracle.py [elements]
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from upstream_stub import StubConfig, UpstreamStub
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+# Runs inside a fresh interpreter so the import is genuinely cold
+PROBE = r'''
+import json, time
+t0 = time.perf_counter()
+import miners.oracle_lambda as oracle
+from miners.epic_catalog import shared_catalog
+from miners.ratelimit import shared_limiter
+t1 = time.perf_counter()
+shared_limiter().default_rate = 0  # Benchmark the handler, not politeness delays
+
+def timed(n):
+    samples = []
+    for _ in range(n):
+        start = time.perf_counter()
+        result = oracle.lambda_handler(None, None)
+        samples.append(time.perf_counter() - start)
+        assert result["statusCode"] == 200, result
+    return samples
+
+cold = timed(1)[0]
+warm_cached = timed(50)
+shared_catalog().ttl = 0  # Every call now revalidates upstream (304 path)
+warm_revalidate = timed(50)
+print(json.dumps({"import": t1 - t0, "cold": cold,
+                  "warm_cached": warm_cached, "warm_revalidate": warm_revalidate}))
+'''
+
+
+def _ms(seconds: float) -> str:
+    return f"{seconds * 1000:8.2f} ms"
+
+
+def run(elements: int = 200) -> dict:
+    with UpstreamStub(StubConfig(epic_elements=elements)) as stub:
+        env = dict(os.environ, EPIC_PROMOTIONS_URL=stub.epic_url)
+        out = subprocess.run([sys.executable, "-c", PROBE], cwd=ROOT, env=env,
+                             capture_output=True, text=True, check=True)
+        # The handler prints its banner; the report is the last line
+        return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    elements = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    report = run(elements)
+    p50 = lambda xs: sorted(xs)[len(xs) // 2]
+    print(f"🔮 Oracle benchmark ({elements} catalog elements)")
+    print(f"  import           {_ms(report['import'])}")
+    print(f"  cold invocation  {_ms(report['cold'])}")
+    print(f"  warm (cached)    {_ms(p50(report['warm_cached']))}  p50")
+    print(f"  warm (304)       {_ms(p50(report['warm_revalidate']))}  p50")
+
+
+if __name__ == "__main__":
+    main()
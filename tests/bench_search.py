@@ -0,0 +1,50 @@
+"""
+tests/bench_search.py
+Search latency at catalog scale: indexes N synthetic offers into a temporary
+FTS5 index, then times prefix, multi-term and misspelt queries (p50 of 9 runs).
+Run with: python tests/bench_search.py [offers]
+"""
+
+import os
+import random
+import sys
+import tempfile
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core.models import GameOffer
+from core.search import SearchIndex
+
+QUERIES = ["drag", "dragon kni", "dargon knight", "hollow souls 12", "simulatr", "zz"]
+
+
+def synthetic_offers(count: int, seed: int = 7):
+    rng = random.Random(seed)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    vocab = list({"".join(rng.choice(letters) for _ in range(rng.randint(4, 9))) for _ in range(8000)})
+    vocab += "shadow dragon quest star knight legend hollow souls simulator".split()
+    for i in range(count):
+        yield GameOffer(
+            title=" ".join(rng.sample(vocab, 3)).title() + f" {i}",
+            original_price=9.99, discount_price=0.0,
+            description="A game about " + " ".join(rng.sample(vocab, 5)),
+            image_url="", store_url="", source=rng.choice(["Steam", "Epic Games", "GOG"]),
+            platform_id=str(i)
+        )
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    with tempfile.TemporaryDirectory() as tmp:
+        index = SearchIndex(os.path.join(tmp, "search.db"))
+        index.index_offers(synthetic_offers(count))
+        print(f"🔎 Search benchmark ({index.count():,} offers)")
+        for query in QUERIES:
+            runs = sorted(index.search(query)["took_ms"] for _ in range(9))
+            result = index.search(query)
+            corrected = f"  corrected {result['corrected']}" if result["corrected"] else ""
+            print(f"  {query!r:<20} {runs[4]:7.2f} ms  {len(result['results']):>3} hits{corrected}")
+
+
+if __name__ == "__main__":
+    main()
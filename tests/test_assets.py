@@ -0,0 +1,73 @@
+import sys
+import os
+import gzip
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from fastapi import FastAPI
+from fastapi.templating import Jinja2Templates
+from fastapi.testclient import TestClient
+from backend.assets import AssetManifest, PrecompressedStaticFiles, build, install_asset_url
+
+CSS = ".z-card { color: #fff; }\n" * 40
+JS = "console.log('ignition');\n" * 40
+
+
+def make_static(tmp_path):
+    static = tmp_path / "static"
+    static.mkdir()
+    (static / "styles.css").write_text(CSS)
+    (static / "app.js").write_text(JS)
+    return static
+
+
+def test_build_fingerprints_and_precompresses(tmp_path):
+    static = make_static(tmp_path)
+    manifest = build(str(static))
+    css = manifest["styles.css"]
+    assert css.startswith("dist/styles.") and css.endswith(".css")
+    assert (static / css).read_text().strip() == CSS.strip()
+    assert gzip.decompress((static / (css + ".gz")).read_bytes()) == (static / css).read_bytes()
+    assert build(str(static)) == manifest  # Deterministic
+
+    (static / "app.js").write_text(JS + "console.log('v2');\n")
+    rebuilt = build(str(static))
+    assert rebuilt["app.js"] != manifest["app.js"]
+    assert not (static / manifest["app.js"]).exists()  # Stale fingerprints are swept
+
+
+def test_template_references_fingerprinted_names(tmp_path):
+    static = make_static(tmp_path)
+    templates = Jinja2Templates(directory=os.path.join(os.path.dirname(__file__), "..", "backend", "templates"))
+    manifest = AssetManifest(str(static))
+    assert manifest.url("app.js") == "/static/app.js"  # No build yet: plain file
+
+    built = build(str(static))
+    install_asset_url(templates, manifest)
+    template = templates.env.from_string(
+        "<link href=\"{{ asset_url('styles.css') }}\"><script src=\"{{ asset_url('app.js') }}\"></script>")
+    html = template.render()
+    assert f"/static/{built['styles.css']}" in html and f"/static/{built['app.js']}" in html
+
+
+def test_precompressed_immutable_serving(tmp_path):
+    static = make_static(tmp_path)
+    built = build(str(static))
+    app = FastAPI()
+    app.mount("/static", PrecompressedStaticFiles(directory=str(static)), name="static")
+    client = TestClient(app)
+
+    res = client.get(f"/static/{built['styles.css']}", headers={"Accept-Encoding": "gzip"})
+    assert res.status_code == 200
+    assert res.headers["content-encoding"] == "gzip"
+    assert res.headers["content-type"].startswith("text/css")
+    assert "immutable" in res.headers["cache-control"]
+    assert res.text == (static / built["styles.css"]).read_text()  # httpx decoded it
+
+    res = client.get(f"/static/{built['app.js']}", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in res.headers
+    assert "immutable" in res.headers["cache-control"]
+
+    res = client.get("/static/app.js")
+    assert res.headers["cache-control"] == "no-cache"
+    assert client.get("/static/dist/missing.css").status_code == 404
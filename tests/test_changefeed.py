@@ -0,0 +1,81 @@
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core.changefeed import ChangeFeed, ADDED, REMOVED, CHANGED
+from core.models import GameOffer
+
+
+def make_offer(pid, price=19.99, source="Steam"):
+    return GameOffer(title=f"Game {pid}", original_price=price, discount_price=0.0, description="",
+                     image_url="", store_url="", source=source, platform_id=pid)
+
+
+def test_cycles_produce_ordered_deltas(tmp_path):
+    feed = ChangeFeed(str(tmp_path / "feed.db"))
+
+    first = feed.record_cycle([make_offer("1"), make_offer("2")])
+    assert [(e.kind, e.offer_id) for e in first] == [(ADDED, "claim:steam:1"), (ADDED, "claim:steam:2")]
+
+    # Unchanged cycle: nothing to do downstream
+    assert feed.record_cycle([make_offer("1"), make_offer("2")]) == []
+
+    second = feed.record_cycle([make_offer("1", price=29.99), make_offer("3")])
+    kinds = {e.offer_id: e for e in second}
+    assert kinds["claim:steam:1"].kind == CHANGED
+    assert kinds["claim:steam:1"].payload["changes"] == {"original_price": [19.99, 29.99]}
+    assert kinds["claim:steam:3"].kind == ADDED
+    assert kinds["claim:steam:2"].kind == REMOVED
+
+    seqs = [e.seq for e in feed.read()]
+    assert seqs == sorted(seqs) and len(seqs) == 5
+
+
+def test_removals_are_scoped_to_the_producer(tmp_path):
+    feed = ChangeFeed(str(tmp_path / "feed.db"))
+    feed.record_cycle([make_offer("1")], producer="steam")
+    feed.record_cycle([make_offer("e1", source="Epic Games")], producer="epic")
+    feed.record_cycle([make_offer("scout_steam_ab")], producer="scout", prune=False)
+
+    events = feed.record_cycle([], producer="steam")
+    assert [(e.kind, e.offer_id) for e in events] == [(REMOVED, "claim:steam:1")]
+    assert sorted(o.platform_id for o in feed.snapshot()) == ["e1", "scout_steam_ab"]
+
+    # A partial cycle never removes what it didn't re-emit; a full one does
+    assert feed.record_cycle([], producer="scout", prune=False) == []
+    assert [e.offer_id for e in feed.record_cycle([], producer="scout")] == ["claim:steam:scout_steam_ab"]
+
+
+def test_an_offer_stays_with_its_first_producer(tmp_path):
+    feed = ChangeFeed(str(tmp_path / "feed.db"))
+    # Steam lists it; a plugin reports the same claim ID with its own (estimated) price
+    listed, estimated = make_offer("1"), make_offer("1", price=14.99)
+    assert [e.kind for e in feed.record_cycle([listed], producer="steam")] == [ADDED]
+
+    # Alternating full cycles: no ADDED / REMOVED flapping, Steam's copy stays live
+    for _ in range(2):
+        assert feed.record_cycle([estimated], producer="plugin") == []
+        assert feed.record_cycle([listed], producer="steam") == []
+    assert [o.original_price for o in feed.snapshot()] == [19.99]
+
+    # Once its owner drops it, the other producer's next cycle picks it up
+    assert [e.kind for e in feed.record_cycle([], producer="steam")] == [REMOVED]
+    assert [e.kind for e in feed.record_cycle([estimated], producer="plugin")] == [ADDED]
+    assert [e.kind for e in feed.record_cycle([], producer="plugin")] == [REMOVED]
+
+
+def test_consumer_resumes_from_cursor(tmp_path):
+    db_path = str(tmp_path / "feed.db")
+    feed = ChangeFeed(db_path)
+    feed.record_cycle([make_offer("1"), make_offer("2")])
+
+    seen = []
+    assert feed.consume("rails", seen.extend) == 2
+
+    # "Restart": a new instance picks up after the committed cursor
+    feed = ChangeFeed(db_path)
+    feed.record_cycle([make_offer("1"), make_offer("2"), make_offer("3")])
+    seen.clear()
+    feed.consume("rails", seen.extend)
+    assert [e.offer_id for e in seen] == ["claim:steam:3"]
@@ -0,0 +1,38 @@
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core.classify import classify_price, classify_prices, parse_price, promote
+from core.models import Rarity
+
+
+def test_parse_price_handles_regional_formats():
+    assert parse_price("$19.99") == 19.99
+    assert parse_price("59,90€") == 59.90
+    assert parse_price("₪1,299.00") == 1299.0
+    assert parse_price("1.299,00 zł") == 1299.0
+    assert parse_price("1,200") == 1200.0
+    assert parse_price("Free to Play") == 0.0
+    assert parse_price("") == 0.0
+    assert parse_price("N/A") == 0.0
+
+
+def test_tiers_are_exclusive_floors():
+    batch = classify_prices([5.0, 5.01, 15.0, 15.01, 40.0, 40.01, None])
+    assert batch.rarities == [Rarity.COMMON, Rarity.RARE, Rarity.RARE, Rarity.EPIC,
+                              Rarity.EPIC, Rarity.LEGENDARY, Rarity.COMMON]
+
+
+def test_batch_accepts_strings_and_cents():
+    assert classify_prices(["$19.99", "€4,99"]).prices == [19.99, 4.99]
+    cents = classify_prices([1999, 4999], cents=True)
+    assert cents.prices == [19.99, 49.99]
+    assert cents.rarities == [Rarity.EPIC, Rarity.LEGENDARY]
+    # Same value, same rarity, whatever the source format
+    assert classify_price("$19.99") == classify_price(1999, cents=True) == classify_price(19.99)
+
+
+def test_promote_keeps_the_rarer():
+    assert promote(Rarity.LEGENDARY, Rarity.RARE) == Rarity.LEGENDARY
+    assert promote(Rarity.COMMON, Rarity.EPIC) == Rarity.EPIC
@@ -0,0 +1,161 @@
+import sys
+import os
+import json
+import subprocess
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from miners import epic_catalog
+from miners.epic_catalog import EpicCatalog
+from miners.ratelimit import HostRateLimiter
+from miners.epic import EpicMiner
+from miners.oracle_lambda import lambda_handler
+from core.models import Rarity
+
+PAYLOAD = {
+    "data": {"Catalog": {"searchStore": {"elements": [
+        {
+            "id": "abc123",
+            "title": "Free Now Game",
+            "productSlug": "free-now-game",
+            "description": "Currently free.",
+            "keyImages": [{"url": "https://cdn.epic/free-now.jpg"}],
+            "categories": [{"path": "freegames"}],
+            "price": {"totalPrice": {"originalPrice": 2999, "discountPrice": 0,
+                                     "fmtPrice": {"originalPrice": "$29.99"}}},
+            "promotions": {
+                "promotionalOffers": [{"promotionalOffers": [{
+                    "startDate": "2025-01-02T16:00:00.000Z",
+                    "endDate": "2025-01-09T16:00:00.000Z",
+                    "discountSetting": {"discountPercentage": 0}
+                }]}],
+                "upcomingPromotionalOffers": []
+            }
+        },
+        {
+            "id": "def456",
+            "title": "Next Week Game",
+            "productSlug": "next-week-game",
+            "description": "Free soon.",
+            "keyImages": [],
+            "categories": [],
+            "price": {"totalPrice": {"originalPrice": 1999, "discountPrice": 1999,
+                                     "fmtPrice": {"originalPrice": "$19.99"}}},
+            "promotions": {
+                "promotionalOffers": [],
+                "upcomingPromotionalOffers": [{"promotionalOffers": [{
+                    "startDate": "2025-01-09T16:00:00.000Z",
+                    "endDate": "2025-01-16T16:00:00.000Z",
+                    "discountSetting": {"discountPercentage": 0}
+                }]}]
+            }
+        }
+    ]}}}
+}
+
+
+class FakeResponse:
+    def __init__(self, payload, status_code=200, headers=None):
+        self._payload = payload
+        self.status_code = status_code
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self._payload
+
+
+def test_miner_and_oracle_share_one_fetch(monkeypatch):
+    calls = []
+
+    def fake_get(url, headers=None, timeout=None):
+        calls.append(url)
+        return FakeResponse(PAYLOAD)
+
+    monkeypatch.setattr(epic_catalog.SESSION, "get", fake_get)
+    catalog = EpicCatalog(ttl=60, limiter=HostRateLimiter(default_rate=0))
+
+    miner = EpicMiner(catalog=catalog)
+    loot = miner.fetch_games()
+    result = lambda_handler(None, None, catalog=catalog)
+
+    assert len(calls) == 1
+
+    assert [o.title for o in loot] == ["Free Now Game"]
+    assert loot[0].platform_id == "free-now-game"
+    assert loot[0].rarity == Rarity.EPIC
+    assert loot[0].end_time is not None
+
+    forecast = json.loads(result['body'])
+    assert result['statusCode'] == 200
+    assert forecast == [{
+        "game": "Next Week Game",
+        "unlocks_at": "2025-01-09 16:00",
+        "value": "$19.99",
+        "image": None
+    }]
+
+
+def test_catalog_refetches_after_ttl(monkeypatch):
+    calls = []
+    monkeypatch.setattr(epic_catalog.SESSION, "get",
+                        lambda url, headers=None, timeout=None: calls.append(url) or FakeResponse(PAYLOAD))
+    catalog = EpicCatalog(ttl=0, limiter=HostRateLimiter(default_rate=0))
+
+    catalog.get()
+    catalog.get()
+    assert len(calls) == 2
+
+
+def test_catalog_revalidates_with_etag(monkeypatch):
+    sent = []
+
+    def fake_get(url, headers=None, timeout=None):
+        sent.append(dict(headers or {}))
+        if headers and headers.get("If-None-Match") == '"v1"':
+            return FakeResponse(None, status_code=304)
+        return FakeResponse(PAYLOAD, headers={"ETag": '"v1"'})
+
+    monkeypatch.setattr(epic_catalog.SESSION, "get", fake_get)
+    catalog = EpicCatalog(ttl=60, limiter=HostRateLimiter(default_rate=0))
+
+    first = catalog.get()
+    catalog.invalidate()
+    second = catalog.get()
+
+    assert sent == [{}, {"If-None-Match": '"v1"'}]
+    assert second.entries is first.entries
+
+
+def test_miner_budget_applies_to_catalog_fetches(monkeypatch):
+    monkeypatch.setattr(epic_catalog.SESSION, "get", lambda url, headers=None, timeout=None: FakeResponse(PAYLOAD))
+    limiter = HostRateLimiter(default_rate=0)
+    catalog = EpicCatalog(ttl=0, limiter=limiter)
+    miner = EpicMiner(catalog=catalog)
+    miner.min_interval, miner.burst = 60.0, 1
+
+    miner.mine()
+    # The miner's budget (one request a minute) now governs Epic's host, not the limiter default
+    assert limiter.reserve(catalog.url) > 30
+
+
+def test_forecast_memo_is_per_catalog(monkeypatch):
+    empty = {"data": {"Catalog": {"searchStore": {"elements": []}}}}
+    payloads = {"https://a.example/promos": PAYLOAD, "https://b.example/promos": empty}
+    monkeypatch.setattr(epic_catalog.SESSION, "get", lambda url, headers=None, timeout=None:
+                        FakeResponse(payloads[url], headers={"ETag": '"v1"'}))  # Same validator on purpose
+    a = EpicCatalog(url="https://a.example/promos", ttl=60, limiter=HostRateLimiter(default_rate=0))
+    b = EpicCatalog(url="https://b.example/promos", ttl=60, limiter=HostRateLimiter(default_rate=0))
+
+    assert lambda_handler(None, None, catalog=a)["count"] == 1
+    assert lambda_handler(None, None, catalog=b)["count"] == 0
+    assert lambda_handler(None, None, catalog=a)["count"] == 1
+
+
+def test_oracle_import_skips_unused_stdlib():
+    code = "import sys, miners.oracle_lambda; print(sorted({'sqlite3', 'asyncio'} & set(sys.modules)))"
+    root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+    out = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "[]"
@@ -0,0 +1,113 @@
+import sys
+import os
+import asyncio
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.events import EventBroker, FeedBridge
+from core.changefeed import ChangeFeed
+from core.ledger import LedgerManager
+from core.models import GameOffer, Rarity
+from core.rails import RailsEngine
+
+
+def make_offer(title, price):
+    return GameOffer(title=title, original_price=price, discount_price=0.0, description="", image_url="",
+                     store_url=f"https://example.com/{title}", source="Steam", platform_id=title,
+                     rarity=Rarity.LEGENDARY if price > 40 else Rarity.COMMON)
+
+
+def test_stream_delivers_scoped_events_and_heartbeats():
+    async def scenario():
+        broker = EventBroker()
+        alice = broker.stream("alice", heartbeat=0.05)
+        assert (await alice.__anext__()).startswith(b"retry:")
+        bob_sub = broker.subscribe("bob")
+
+        broker.publish("offer_added", {"offer_id": "a"})
+        broker.publish("balance", {"balance": 10}, user_id="bob")
+        chunk = await alice.__anext__()
+        assert b"event: offer_added" in chunk and b"id: 1" in chunk
+        assert await alice.__anext__() == b": ping\n\n"  # Bob's balance never reaches Alice
+        assert bob_sub.queue.qsize() == 2
+        await alice.aclose()
+        assert broker.users() == ["bob"]
+
+    asyncio.run(scenario())
+
+
+def test_reconnect_replays_missed_events_or_asks_for_resync():
+    async def scenario():
+        broker = EventBroker(replay_size=4)
+        for i in range(3):
+            broker.publish("offer_added", {"offer_id": str(i)})
+        stream = broker.stream("u", last_event_id=1, heartbeat=0.05)
+        await stream.__anext__()
+        assert b"id: 2" in await stream.__anext__()
+        assert b"id: 3" in await stream.__anext__()
+        await stream.aclose()
+
+        for i in range(10):
+            broker.publish("offer_added", {"offer_id": str(i)})
+        stream = broker.stream("u", last_event_id=1, heartbeat=0.05)
+        await stream.__anext__()
+        assert b"event: resync" in await stream.__anext__()
+        await stream.aclose()
+
+    asyncio.run(scenario())
+
+
+def test_slow_client_is_cut_over_to_resync_instead_of_buffering():
+    async def scenario():
+        broker = EventBroker(queue_size=4)
+        stream = broker.stream("u", heartbeat=0.05)
+        await stream.__anext__()
+        await asyncio.sleep(0)
+        for i in range(50):
+            broker.publish("offer_added", {"offer_id": str(i)})
+        assert broker.stats()["dropped"] == 1
+        assert b"event: resync" in await stream.__anext__()
+        await stream.aclose()
+
+    asyncio.run(scenario())
+
+
+def test_thousands_of_idle_subscribers_and_cross_thread_publish():
+    async def scenario():
+        broker = EventBroker()
+        subs = [broker.subscribe(f"user_{i % 50}") for i in range(3000)]
+        await asyncio.to_thread(broker.publish, "offer_removed", {"offer_id": "x"})
+        await asyncio.sleep(0)
+        assert all(sub.queue.qsize() == 1 for sub in subs)
+        assert broker.stats()["subscribers"] == 3000
+
+    asyncio.run(scenario())
+
+
+def test_bridge_turns_feed_and_ledger_changes_into_events(tmp_path):
+    async def scenario():
+        feed = ChangeFeed(str(tmp_path / "feed.db"))
+        ledger = LedgerManager(db_path=str(tmp_path / "ledger.db"))
+        rails = RailsEngine()
+        feed.record_cycle([make_offer("Alpha", 59.99)], producer="steam")
+        rails.sync(feed)
+
+        broker = EventBroker()
+        bridge = FeedBridge(broker, feed, rails=rails, ledger=ledger)
+        sub = broker.subscribe("local_user")
+        assert bridge.poll_once() == 0  # Starts at the head: history is already rendered
+
+        feed.record_cycle([make_offer("Alpha", 59.99), make_offer("Beta", 49.99)], producer="steam")
+        ledger.add_transaction("local_user", 50, "EARN", "beta")
+        assert bridge.poll_once() == 2
+
+        added, balance = sub.queue.get_nowait(), sub.queue.get_nowait()
+        assert added.type == "offer_added"
+        assert added.data["card"]["title"] == "Beta"
+        assert added.data["placement"]["legendary"] is None        # After Alpha
+        assert added.data["placement"]["top_value"] is None
+        assert balance.type == "balance" and balance.data["balance"] == 50
+
+        assert bridge.poll_once() == 0
+
+    asyncio.run(scenario())
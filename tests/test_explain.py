@@ -0,0 +1,74 @@
+import sys
+import os
+from datetime import datetime
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+import backend.why_api as why_api
+from core.changefeed import ChangeFeed
+from core.explain import ExplanationStore, explain
+from core.models import GameOffer, Rarity
+
+
+def make_offer(title, price, source="Epic", platform_id=None, rarity=Rarity.EPIC, end_time=None):
+    return GameOffer(title=title, original_price=price, discount_price=0.0, description="", image_url="",
+                     store_url=f"https://example.com/{title}", source=source,
+                     platform_id=platform_id or title.lower(), end_time=end_time, rarity=rarity)
+
+
+def test_explanations_reflect_source_and_estimates():
+    store_offer = explain(make_offer("Vault", 59.99, rarity=Rarity.LEGENDARY, end_time=datetime(2030, 1, 2, 15)))
+    assert store_offer["confidence"] == "High"
+    assert "$59.99" in store_offer["reason"] and "Jan 02 15:00" in store_offer["reason"]
+
+    scout = explain(make_offer("Hidden Gem", 14.99, source="Steam", platform_id="scout_steam_ab12cd34"))
+    assert scout["estimated"] and scout["confidence"] == "Medium"
+    assert explain(make_offer("Mystery Game 3", 0.0))["confidence"] == "Low"
+
+
+def test_store_follows_the_change_feed(tmp_path):
+    feed = ChangeFeed(str(tmp_path / "feed.db"))
+    store = ExplanationStore(str(tmp_path / "why.db"))
+    feed.record_cycle([make_offer("Alpha", 19.99), make_offer("Beta", 9.99)], producer="epic")
+    assert store.sync_changefeed(feed) == 2
+    assert store.get("claim:epic:alpha")["title"] == "Alpha"
+
+    feed.record_cycle([make_offer("Alpha", 29.99)], producer="epic")  # Price change + Beta removed
+    store.sync_changefeed(feed)
+    assert "$29.99" in store.get("claim:epic:alpha")["reason"]
+    assert store.get("claim:epic:beta") is None
+    assert store.sync_changefeed(feed) == 0
+
+
+def test_single_and_batch_endpoints(tmp_path, monkeypatch):
+    store = ExplanationStore(str(tmp_path / "why.db"))
+    store.record([make_offer("Alpha", 19.99), make_offer("Beta", 9.99)])
+    monkeypatch.setattr(why_api, "_store", store)
+    app = FastAPI()
+    app.include_router(why_api.router)
+    client = TestClient(app)
+
+    res = client.get("/api/why/claim:epic:alpha")
+    assert res.status_code == 200 and res.json()["title"] == "Alpha"
+    assert "no-cache" in res.headers["cache-control"]
+    etag = res.headers["etag"]
+    assert client.get("/api/why/claim:epic:alpha", headers={"If-None-Match": etag}).status_code == 304
+
+    # The offer moved: the same conditional request now gets the fresh explanation
+    store.record([make_offer("Alpha", 24.99)])
+    res = client.get("/api/why/claim:epic:alpha", headers={"If-None-Match": etag})
+    assert res.status_code == 200 and "$24.99" in res.json()["reason"]
+    assert client.get("/api/why/claim:epic:nope").status_code == 404
+
+    res = client.get("/api/why", params={"ids": "claim:epic:alpha,claim:epic:beta,claim:epic:nope"})
+    body = res.json()
+    assert sorted(body["explanations"]) == ["claim:epic:alpha", "claim:epic:beta"]
+    assert body["missing"] == ["claim:epic:nope"]
+    batch_etag = res.headers["etag"]
+    assert client.get("/api/why", params={"ids": "claim:epic:alpha,claim:epic:beta,claim:epic:nope"},
+                      headers={"If-None-Match": batch_etag}).status_code == 304
+
+    too_many = ",".join(f"claim:epic:{i}" for i in range(why_api.MAX_BATCH + 1))
+    assert client.get("/api/why", params={"ids": too_many}).status_code == 400
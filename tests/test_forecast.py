@@ -0,0 +1,63 @@
+import sys
+import os
+import time
+from datetime import datetime, timedelta, timezone
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core.forecast import Forecast, ForecastStore
+from core.scheduler import PollScheduler, UNLOCK_GRACE
+from miners.epic_catalog import CatalogEntry, CatalogSnapshot, Promotion
+from miners.service import _make_oracle_poll, _unlock_aware
+
+NOW = datetime.now(timezone.utc).replace(microsecond=0)
+
+
+def test_store_is_keyed_by_game_and_start(tmp_path):
+    store = ForecastStore(str(tmp_path / "forecast.db"))
+    soon = Forecast("Soon", NOW + timedelta(hours=1), value="$9.99")
+    later = Forecast("Later", NOW + timedelta(days=2))
+    store.record([later, soon, Forecast("Unparseable", None, starts_at_raw="garbage")])
+    store.record([Forecast("Soon", NOW + timedelta(hours=1), value="$14.99")])
+
+    upcoming = store.upcoming(NOW)
+    assert [f.game for f in upcoming] == ["Soon", "Later"]
+    assert upcoming[0].value == "$14.99"
+    assert upcoming[0].starts_at == soon.starts_at
+    assert [f.game for f in store.between(NOW, NOW + timedelta(hours=2))] == ["Soon"]
+
+
+class FakeCatalog:
+    def __init__(self, snapshot):
+        self.snapshot = snapshot
+        self.invalidated = 0
+
+    def get(self):
+        return self.snapshot
+
+    def invalidate(self):
+        self.invalidated += 1
+
+
+def test_oracle_poll_arms_epic_refresh_at_unlock(tmp_path):
+    unlock = NOW + timedelta(minutes=10)
+    entry = CatalogEntry(id="1", title="Next Week Game", slug="nwg", description="", image_url="",
+                         original_price=1999, discount_price=1999, fmt_original_price="$19.99",
+                         upcoming=[Promotion(None, None, 0, start=unlock)])
+    catalog = FakeCatalog(CatalogSnapshot(entries=[entry], fetched_at=0))
+    store = ForecastStore(str(tmp_path / "forecast.db"))
+    scheduler = PollScheduler()
+    epic = scheduler.add_source("epic", lambda: False, interval=3600, start_in=3600)
+
+    intel = _make_oracle_poll(catalog, store, scheduler)()
+
+    assert intel[0]["unlocks_at"] == unlock.strftime("%Y-%m-%d %H:%M")
+    assert epic.next_run == unlock.timestamp() + UNLOCK_GRACE
+
+    # Once the unlock has passed, the Epic poll skips the catalog's TTL cache
+    polls = []
+    wrapped = _unlock_aware(lambda: polls.append(1) or True, catalog, store)
+    store.record([Forecast("Just Unlocked", datetime.now(timezone.utc) + timedelta(milliseconds=50))])
+    time.sleep(0.1)
+    assert wrapped() is True
+    assert catalog.invalidated == 1
@@ -0,0 +1,132 @@
+import sys
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+import backend.images_api as images_api
+import miners.images as images
+from miners.images import ImageCache
+from miners.ratelimit import HostRateLimiter
+
+COVER = b"\x89PNG\r\n\x1a\n" + b"cover-bytes" * 100
+
+
+class CDN(BaseHTTPRequestHandler):
+    hits = []
+
+    def do_GET(self):
+        CDN.hits.append(self.path)
+        if self.path.startswith("/hop"):
+            # Allowed host bouncing to a disallowed one, then to itself
+            target = "http://169.254.169.254/latest/meta-data" if self.path == "/hop-out" else "/a.png"
+            self.send_response(302)
+            self.send_header("Location", target)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if self.path.startswith("/page"):
+            body, content_type = b"<html></html>", "text/html"
+        elif self.path.endswith(".svg"):
+            body, content_type = b'<svg xmlns="http://www.w3.org/2000/svg"><script>alert(1)</script></svg>', \
+                "image/svg+xml"
+        else:
+            body, content_type = COVER, "image/png"
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def cdn(monkeypatch):
+    CDN.hits = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), CDN)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setattr(images, "ALLOWED_HOST_SUFFIXES", images.ALLOWED_HOST_SUFFIXES + ("127.0.0.1",))
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+
+def make_cache(tmp_path):
+    return ImageCache(root=str(tmp_path / "images"), limiter=HostRateLimiter(default_rate=0))
+
+
+def test_covers_are_stored_once_by_content(tmp_path, cdn):
+    cache = make_cache(tmp_path)
+    a = cache.fetch(f"{cdn}/a.png")
+    b = cache.fetch(f"{cdn}/b.png?size=large")
+    assert a.digest == b.digest and a.content_type == "image/png"
+    assert open(a.path, "rb").read() == COVER
+
+    assert cache.fetch(f"{cdn}/a.png").digest == a.digest
+    assert len(CDN.hits) == 2  # Third call served from disk
+
+
+def test_only_images_from_allowed_hosts(tmp_path, cdn):
+    cache = make_cache(tmp_path)
+    assert cache.fetch("http://169.254.169.254/latest/meta-data") is None
+    assert cache.fetch("file:///etc/passwd") is None
+    assert cache.fetch(f"{cdn}/page") is None
+    assert cache.fetch(f"{cdn}/cover.svg") is None  # Scriptable, so never served from our origin
+    assert images.is_allowed("https://cdn1.epicgames.com/x.jpg")
+    assert images.is_allowed("https://i.redd.it/abc.jpg")
+    assert not images.is_allowed("https://evil-epicgames.com/x.jpg")
+    assert not images.is_allowed("https://tenant.akamaihd.net/x.jpg")  # Shared CDN: exact hosts only
+
+
+def test_every_redirect_hop_is_checked(tmp_path, cdn):
+    cache = make_cache(tmp_path)
+    assert cache.fetch(f"{cdn}/hop-out") is None
+    assert CDN.hits == ["/hop-out"]
+    assert cache.fetch(f"{cdn}/hop-in").digest == cache.lookup(f"{cdn}/hop-in").digest
+
+
+def test_concurrent_requests_share_one_download_and_prefetch(tmp_path, cdn):
+    cache = make_cache(tmp_path)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(cache.fetch, [f"{cdn}/same.png"] * 8))
+    assert all(r and r.digest == results[0].digest for r in results)
+    assert CDN.hits.count("/same.png") == 1
+
+    assert cache.prefetch([f"{cdn}/p{i}.png" for i in range(5)] + [f"{cdn}/same.png"]) == 5
+
+
+def test_proxy_redirects_to_immutable_content_url(tmp_path, cdn, monkeypatch):
+    cache = make_cache(tmp_path)
+    monkeypatch.setattr(images_api, "_cache", cache)
+    app = FastAPI()
+    app.include_router(images_api.router)
+    client = TestClient(app)
+
+    url = f"{cdn}/cover.png"
+    assert cache.card_url(url).startswith("/api/img?u=")
+    res = client.get("/api/img", params={"u": url, "w": 460}, follow_redirects=False)
+    assert res.status_code == 302
+    digest = cache.lookup(url).digest
+    assert res.headers["location"] == f"/img/{digest}?w=460"
+    assert cache.card_url(url) == f"/img/{digest}?w=460"
+
+    res = client.get(f"/img/{digest}", params={"w": 460})
+    assert res.status_code == 200 and res.content == COVER  # No Pillow here / image already small
+    assert "immutable" in res.headers["cache-control"]
+    assert res.headers["x-content-type-options"] == "nosniff"
+    assert res.headers["content-security-policy"] == "default-src 'none'"  # Served as fetched
+
+    # Any other width lands on one of the few variant sizes
+    res = client.get("/api/img", params={"u": url, "w": 333}, follow_redirects=False)
+    assert res.headers["location"] == f"/img/{digest}?w=460"
+    assert [images.variant_width(w) for w in (None, 16, 460, 461, 1920)] == [None, 460, 460, 920, 920]
+
+    assert client.get("/img/" + "0" * 64).status_code == 404
+    assert client.get("/img/../../etc/passwd").status_code == 404
+    assert client.get("/api/img", params={"u": "https://example.org/x.png"}).status_code == 400
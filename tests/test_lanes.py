@@ -0,0 +1,135 @@
+import sys
+import os
+import asyncio
+import sqlite3
+import threading
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from backend.lanes import AsyncLedger, AsyncUserState, LaneBusy, StoreLanes, install
+from core.ledger import LedgerManager
+from core.state import UserStateManager
+
+
+def test_facades_round_trip(tmp_path):
+    async def scenario():
+        lanes = StoreLanes()
+        ledger = AsyncLedger(LedgerManager(db_path=str(tmp_path / "ledger.db")), lanes)
+        state = AsyncUserState(UserStateManager(db_path=str(tmp_path / "state.db")), lanes)
+
+        results = await asyncio.gather(*[
+            ledger.add_transaction("u", 10, "EARN", f"claim:steam:{i}") for i in range(20)])
+        assert all(r["status"] == "success" for r in results)
+        assert await ledger.get_balance("u") == 200
+        assert (await state.mark_opened("u", "claim:steam:1"))["status"] == "success"
+        assert (await state.mark_opened("u", "claim:steam:1"))["status"] == "already_opened"
+        assert await state.get_opened_set("u") == {"claim:steam:1"}
+        lanes.shutdown()
+
+    asyncio.run(scenario())
+
+
+def test_writes_are_serialized_and_reads_do_not_queue_behind_them():
+    async def scenario():
+        lanes = StoreLanes(read_workers=4)
+        active, peak = [0], [0]
+        lock = threading.Lock()
+
+        def slow_write():
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.05)
+            with lock:
+                active[0] -= 1
+
+        writes = [asyncio.ensure_future(lanes.write.run(slow_write)) for _ in range(4)]
+        await asyncio.sleep(0.01)
+        start = time.perf_counter()
+        await asyncio.gather(*[lanes.read.run(lambda: 1) for _ in range(8)])
+        read_latency = time.perf_counter() - start
+        await asyncio.gather(*writes)
+
+        assert peak[0] == 1                  # Single writer
+        assert read_latency < 0.1            # Reads didn't wait for the ~0.2s of writes
+        assert lanes.stats()["write"]["max_seen"] == 4
+        lanes.shutdown()
+
+    asyncio.run(scenario())
+
+
+def test_real_store_reads_do_not_wait_on_an_open_write(tmp_path):
+    db_path = str(tmp_path / "ledger.db")
+    manager = LedgerManager(db_path=db_path)
+    manager.add_transaction("u", 10, "EARN", "claim:steam:0")
+
+    async def scenario():
+        lanes = StoreLanes()
+        ledger = AsyncLedger(manager, lanes)
+        # Another writer mid-transaction, holding the strongest lock it can take
+        writer = sqlite3.connect(db_path, isolation_level=None)
+        writer.execute("BEGIN EXCLUSIVE")
+        writer.execute("INSERT INTO ledger_entries VALUES ('x', 'u', 5, 'EARN', 'claim:steam:1', '2025-01-01', NULL)")
+        try:
+            start = time.perf_counter()
+            assert await asyncio.wait_for(ledger.get_balance("u"), timeout=2) == 10  # Last committed state
+            assert time.perf_counter() - start < 0.5
+        finally:
+            writer.execute("COMMIT")
+            writer.close()
+        assert await ledger.get_balance("u") == 15
+        lanes.shutdown()
+
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    UserStateManager(db_path=str(tmp_path / "state.db"))
+    with sqlite3.connect(str(tmp_path / "state.db")) as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    asyncio.run(scenario())
+
+
+def test_full_lane_rejects_fast_and_maps_to_503():
+    lanes = StoreLanes(write_queue=1)
+    gate = threading.Event()
+    app = FastAPI()
+    install(app, lanes)
+
+    @app.post("/slow")
+    async def slow():
+        await lanes.write.run(gate.wait, 5)
+        return {"status": "ok"}
+
+    @app.post("/fast")
+    async def fast():
+        await lanes.write.run(lambda: None)
+        return {"status": "ok"}
+
+    async def scenario():
+        blocked = asyncio.ensure_future(lanes.write.run(gate.wait, 5))
+        await asyncio.sleep(0.01)
+        try:
+            await lanes.write.run(lambda: None)
+            assert False, "expected LaneBusy"
+        except LaneBusy as e:
+            assert e.lane == "write" and e.depth == 1
+        gate.set()
+        await blocked
+
+    asyncio.run(scenario())
+    assert lanes.write.rejected == 1
+
+    gate.clear()
+    with TestClient(app) as client:
+        thread = threading.Thread(target=lambda: client.post("/slow"))
+        thread.start()
+        deadline = time.time() + 2
+        while lanes.write.pending == 0 and time.time() < deadline:
+            time.sleep(0.005)
+        res = client.post("/fast")
+        assert res.status_code == 503
+        assert res.headers["retry-after"] == "1"
+        gate.set()
+        thread.join()
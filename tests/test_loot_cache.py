@@ -0,0 +1,77 @@
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core.ids import IDGenerator
+from core.loot_cache import LootCache
+from core.models import GameOffer, Rarity
+
+
+def make_offer(title, price=19.99, platform_id=None):
+    return GameOffer(title=title, original_price=price, discount_price=0.0, description="", image_url="",
+                     store_url=f"https://example.com/{title}", source="Epic",
+                     platform_id=platform_id or title.lower(), rarity=Rarity.EPIC)
+
+
+def test_mapping_interface_with_canonical_ids():
+    cache = LootCache()
+    offer_id = IDGenerator.claim("Epic", "test_offer")
+    cache[offer_id] = make_offer("Test Game", platform_id="test_offer")
+
+    assert cache[offer_id].title == "Test Game"
+    assert offer_id in cache and "claim:epic:nope" not in cache
+    assert cache.get("claim:epic:nope") is None
+
+    cache.update_many([make_offer("Other")])
+    assert sorted(cache) == ["claim:epic:other", "claim:epic:test_offer"]
+    del cache[offer_id]
+    assert len(cache) == 1
+
+
+def test_size_bound_evicts_least_recently_used():
+    cache = LootCache(maxsize=2)
+    cache.update_many([make_offer("A"), make_offer("B")])
+    cache["claim:epic:a"]  # A is now the most recent
+    cache.update_many([make_offer("C")])
+    assert sorted(cache) == ["claim:epic:a", "claim:epic:c"]
+
+
+def test_ttl_expiry_and_prune(tmp_path):
+    now = [1000.0]
+    cache = LootCache(ttl=60, db_path=str(tmp_path / "loot.db"), clock=lambda: now[0])
+    cache.update_many([make_offer("A")])
+    now[0] += 30
+    assert "claim:epic:a" in cache
+    now[0] += 31
+    assert "claim:epic:a" not in cache
+    assert len(cache) == 0
+    assert cache.prune() == 1
+
+
+def test_prune_caps_the_shared_table(tmp_path):
+    now = [1000.0]
+    cache = LootCache(db_path=str(tmp_path / "loot.db"), clock=lambda: now[0], max_shared=2)
+    for title in ("A", "B", "C"):
+        cache.update_many([make_offer(title)])
+        now[0] += 1
+    assert cache.prune() == 1
+    assert sorted(cache) == ["claim:epic:b", "claim:epic:c"]  # The soonest to expire went first
+
+
+def test_workers_share_one_catalog_and_see_each_others_writes(tmp_path):
+    path = str(tmp_path / "loot.db")
+    miner, worker = LootCache(db_path=path), LootCache(db_path=path)
+
+    miner.update_many([make_offer("Alpha", 10.0)])
+    assert worker["claim:epic:alpha"].original_price == 10.0  # Read from the shared store, not re-mined
+    assert worker.stats()["shared_reads"] == 1
+    worker["claim:epic:alpha"]
+    assert worker.stats()["shared_reads"] == 1                 # Then served locally
+
+    miner.update_many([make_offer("Alpha", 25.0)])             # Another process commits...
+    assert worker["claim:epic:alpha"].original_price == 25.0   # ...and data_version drops the stale copy
+    assert worker.stats()["invalidations"] == 1
+
+    del miner["claim:epic:alpha"]
+    assert "claim:epic:alpha" not in worker
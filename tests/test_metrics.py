@@ -0,0 +1,91 @@
+import sys
+import os
+import gc
+import threading
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from backend.metrics_api import MetricsMiddleware, router as metrics_router
+from core.ledger import LedgerManager
+from core.metrics import DB_OPS, HTTP_REQUESTS, MINER_CYCLES, REQUEST_DB_OPS, MetricsRegistry
+from miners.cache import CachedSource
+
+
+def test_sharded_counts_survive_thread_exit_and_render():
+    registry = MetricsRegistry()
+    hits = registry.counter("zc_test_hits_total", "Hits.", ("kind",))
+    latency = registry.histogram("zc_test_latency_seconds", "Latency.", ("kind",), buckets=(0.1, 1.0))
+
+    def work():
+        for _ in range(1000):
+            hits.inc("a")
+            latency.observe(0.05, "a")
+        latency.observe(5.0, "a")
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    del threads
+    gc.collect()
+
+    assert hits.value("a") == 8000
+    assert latency.snapshot("a")["count"] == 8008
+    text = registry.render()
+    assert "# TYPE zc_test_hits_total counter" in text
+    assert 'zc_test_hits_total{kind="a"} 8000' in text
+    assert 'zc_test_latency_seconds_bucket{kind="a",le="0.1"} 8000' in text
+    assert 'zc_test_latency_seconds_bucket{kind="a",le="+Inf"} 8008' in text
+    assert len(hits._shards) <= 1  # Finished threads were folded into the retired totals
+
+
+def test_middleware_labels_routes_and_counts_store_calls(tmp_path):
+    ledger = LedgerManager(db_path=str(tmp_path / "ledger.db"))
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+    app.include_router(metrics_router)
+
+    @app.get("/api/balance/{user_id}")
+    def balance(user_id: str):
+        return {"balance": ledger.get_balance(user_id), "revision": ledger.get_revision(user_id)}
+
+    client = TestClient(app)
+    route = "/api/balance/{user_id}"
+    before_ok = HTTP_REQUESTS.value("GET", route, "200")
+    before_db = REQUEST_DB_OPS.snapshot(route)
+    before_calls = DB_OPS.snapshot("ledger", "get_balance")["count"]
+
+    for user in ("alice", "bob", "carol"):
+        assert client.get(f"/api/balance/{user}").status_code == 200
+    client.get("/definitely/not/here")
+
+    assert HTTP_REQUESTS.value("GET", route, "200") == before_ok + 3
+    assert HTTP_REQUESTS.value("GET", "<unmatched>", "404") >= 1
+    after_db = REQUEST_DB_OPS.snapshot(route)
+    assert after_db["count"] == before_db["count"] + 3
+    assert after_db["sum"] == before_db["sum"] + 6   # Two ledger calls per request
+    assert DB_OPS.snapshot("ledger", "get_balance")["count"] == before_calls + 3
+
+    res = client.get("/metrics")
+    assert res.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'zerocrate_http_request_duration_seconds_count{method="GET",route="/api/balance/{user_id}"}' in res.text
+    assert "/api/balance/alice" not in res.text
+
+
+def test_miner_cycles_are_counted_by_outcome():
+    calls = []
+
+    def flaky():
+        calls.append(1)
+        if len(calls) == 2:
+            raise RuntimeError("upstream down")
+        return []
+
+    source = CachedSource("metrics_test_source", flaky)
+    source.refresh()
+    source.refresh()
+    assert MINER_CYCLES.value("metrics_test_source", "ok") == 1
+    assert MINER_CYCLES.value("metrics_test_source", "error") == 1
@@ -0,0 +1,103 @@
+import sys
+import os
+import threading
+
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from miners.cache import CachedSource, CircuitBreaker
+from core.models import GameOffer
+
+
+def make_offer(title):
+    return GameOffer(title=title, original_price=9.99, discount_price=0.0, description="",
+                     image_url="", store_url="", source="Test")
+
+
+class FlakyUpstream:
+    def __init__(self):
+        self.calls = 0
+        self.failing = False
+
+    def __call__(self):
+        self.calls += 1
+        if self.failing:
+            raise ConnectionError("upstream down")
+        return [make_offer(f"Game {self.calls}")]
+
+
+def test_serves_last_good_results_during_outage():
+    upstream = FlakyUpstream()
+    source = CachedSource("Test", upstream, ttl=0, breaker=CircuitBreaker(failure_threshold=2, reset_timeout=60))
+
+    assert [o.title for o in source.get()] == ["Game 1"]
+
+    upstream.failing = True
+    source.refresh()
+    source.refresh()
+    assert [o.title for o in source.get()] == ["Game 1"]
+    assert source.freshness()["breaker"] == CircuitBreaker.OPEN
+    assert source.freshness()["last_error"] == "upstream down"
+
+    # Breaker is open: no more upstream calls
+    calls = upstream.calls
+    source.refresh()
+    assert upstream.calls == calls
+
+
+def test_half_open_probe_closes_breaker():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow() is True
+    assert breaker.allow() is False  # Only one probe at a time
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_refresh_in_flight_is_a_no_op_for_the_service_poll(tmp_path):
+    from core.changefeed import ChangeFeed
+    from miners.service import _make_poll
+
+    release, started = threading.Event(), threading.Event()
+
+    def slow():
+        started.set()
+        release.wait(5)
+        return [make_offer("Slow")]
+
+    source = CachedSource("Test", slow, ttl=0)
+    reader = threading.Thread(target=source.refresh)
+    reader.start()
+    started.wait(5)
+
+    assert source.refresh() is None  # Single-flight: not attempted, not failed
+    poll = _make_poll(source, ChangeFeed(str(tmp_path / "feed.db")), "test")
+    assert poll() is False            # No error, so the scheduler doesn't back off
+    assert source.breaker.failures == 0
+
+    release.set()
+    reader.join(5)
+    assert [o.title for o in source.offers] == ["Slow"]
+
+
+def test_failed_cycle_keeps_live_offers_in_the_loot_cache(tmp_path):
+    from core.changefeed import ChangeFeed
+    from core.loot_cache import LootCache
+    from miners.service import _make_poll
+
+    now = [1000.0]
+    upstream = FlakyUpstream()
+    source = CachedSource("Test", upstream, ttl=0)
+    loot = LootCache(ttl=60, db_path=str(tmp_path / "loot.db"), clock=lambda: now[0])
+    poll = _make_poll(source, ChangeFeed(str(tmp_path / "feed.db")), "test", loot_cache=loot)
+    assert poll() is True
+
+    upstream.failing = True
+    now[0] += 50
+    with pytest.raises(RuntimeError):
+        poll()
+    now[0] += 50  # Past the first write's TTL: still live, because the failed cycle renewed it
+    assert [o.title for o in loot.values()] == ["Game 1"]
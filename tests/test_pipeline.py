@@ -0,0 +1,145 @@
+import sys
+import os
+import threading
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import core.inventory
+from core.inventory import InventoryManager
+from core.ledger import LedgerManager
+from core.models import GameOffer, Rarity
+from core.pipeline import MINT_XP, Pipeline, Stage, build_offer_pipeline
+
+
+def make_offer(title, price, source="Steam", platform_id=None, rarity=Rarity.COMMON, discount=0.0):
+    return GameOffer(title=title, original_price=price, discount_price=discount, description="",
+                     image_url="", store_url="", source=source, platform_id=platform_id, rarity=rarity)
+
+
+class FakeMiner:
+    def __init__(self, offers):
+        self.offers = offers
+
+    def mine(self):
+        return list(self.offers)
+
+
+def test_offer_pipeline_classifies_dedups_persists_and_mints(tmp_path, monkeypatch):
+    monkeypatch.setattr(core.inventory, "INVENTORY_FILE", str(tmp_path / "inventory.json"))
+    inventory = InventoryManager()
+    inventory.claim_loot([make_offer("Already Owned", 9.99)])
+    ledger = LedgerManager(db_path=str(tmp_path / "ledger.db"))
+
+    miners = [
+        FakeMiner([make_offer("  Big  Game ", 59.99, platform_id="1"),
+                   make_offer("Paid Game", 9.99, platform_id="2", discount=4.99),
+                   make_offer("Already Owned", 9.99, platform_id="3")]),
+        FakeMiner([make_offer("Vault Find", 0.0, source="Epic", platform_id="v", rarity=Rarity.LEGENDARY),
+                   make_offer("Big Game", 59.99, platform_id="1")]),  # Cross-miner duplicate
+    ]
+    pipeline = build_offer_pipeline("tester", inventory=inventory, ledger=ledger, queue_size=2)
+    minted = sorted(pipeline.run(miners), key=lambda m: m["title"])
+
+    assert [(m["title"], m["xp"], m["status"]) for m in minted] == [
+        ("Big Game", MINT_XP[Rarity.LEGENDARY], "success"),
+        ("Vault Find", MINT_XP[Rarity.LEGENDARY], "success"),
+    ]
+    assert set(InventoryManager().inventory) == {"Already Owned", "Big Game", "Vault Find"}
+    assert ledger.get_balance("tester") == 2 * MINT_XP[Rarity.LEGENDARY]
+
+    stats = pipeline.stats()
+    assert stats["normalize"]["dropped"] == 1  # Not free
+    assert stats["dedup"]["dropped"] == 2
+    assert stats["mint"]["emitted"] == 2
+
+    # Re-running the same cycle mints nothing new
+    assert build_offer_pipeline("tester", inventory=inventory, ledger=ledger).run(miners) == []
+
+
+def test_slow_sink_throttles_the_source():
+    produced, consumed = [0], [0]
+    lock = threading.Lock()
+    in_flight = []
+
+    def source():
+        for i in range(60):
+            with lock:
+                produced[0] += 1
+                in_flight.append(produced[0] - consumed[0])
+            yield i
+
+    def slow_sink(item):
+        time.sleep(0.002)
+        with lock:
+            consumed[0] += 1
+        return item
+
+    pipeline = Pipeline([
+        Stage("double", lambda x: x * 2, workers=2),
+        Stage("sink", slow_sink),
+    ], queue_size=3)
+    results = pipeline.run(source())
+
+    assert sorted(results) == [i * 2 for i in range(60)]
+    # Bounded queues cap how far the producer can run ahead of the sink
+    assert max(in_flight) <= 3 * 3 + 2 + 1 + 1
+    stats = pipeline.stats()
+    assert stats["sink"]["max_queue_depth"] <= 3
+    assert stats["double"]["blocked_seconds"] > 0
+
+
+def test_stage_errors_are_counted_not_fatal():
+    def picky(x):
+        if x == 3:
+            raise ValueError("bad item")
+        return x
+
+    pipeline = Pipeline([Stage("picky", picky, workers=2)])
+    assert sorted(pipeline.run(range(5))) == [0, 1, 2, 4]
+    assert pipeline.stats()["picky"]["errors"] == 1
+    assert pipeline.stats()["picky"]["last_error"] == "bad item"
+
+
+def test_failing_input_closes_the_stream_and_reraises():
+    seen = []
+
+    def items():
+        yield 1
+        yield 2
+        raise RuntimeError("source broke")
+
+    pipeline = Pipeline([Stage("keep", lambda x: seen.append(x) or x)])
+    done = []
+
+    def run():
+        try:
+            pipeline.run(items())
+        except RuntimeError as e:
+            done.append(str(e))
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    thread.join(5)
+    assert done == ["source broke"]
+    assert sorted(seen) == [1, 2]  # What was fed before the failure still went through
+
+
+def test_miner_names_are_built_on_the_fetch_stage(tmp_path, monkeypatch):
+    monkeypatch.setattr(core.inventory, "INVENTORY_FILE", str(tmp_path / "inventory.json"))
+    built_on = []
+
+    class Registry:
+        def create(self, name):
+            built_on.append(threading.current_thread().name)
+            if name == "broken":
+                raise ImportError("No module named 'missing_dep'")
+            return FakeMiner([make_offer("Named Game", 19.99, platform_id="n")])
+
+    pipeline = build_offer_pipeline("tester", inventory=InventoryManager(),
+                                    ledger=LedgerManager(db_path=str(tmp_path / "ledger.db")), registry=Registry())
+    minted = pipeline.run(["broken", "ok"])
+
+    assert [m["title"] for m in minted] == ["Named Game"]
+    assert all(name.startswith("pipeline-fetch-") for name in built_on)
+    assert pipeline.stats()["fetch"]["errors"] == 1
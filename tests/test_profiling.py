@@ -0,0 +1,136 @@
+import sys
+import os
+import json
+import logging
+import timeit
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+from core import profiling
+from core.ledger import LedgerManager
+from core.profiling import JsonlSink, LoggerSink, RingBufferSink, enable, profiled, span
+from core.state import UserStateManager
+from miners.base import BaseMiner
+
+
+@pytest.fixture(autouse=True)
+def profiling_off():
+    profiling.disable()
+    yield
+    profiling.disable()
+
+
+def test_store_calls_emit_spans_with_rows_and_stable_digests(tmp_path):
+    ledger = LedgerManager(db_path=str(tmp_path / "ledger.db"))
+    state = UserStateManager(db_path=str(tmp_path / "state.db"))
+    sink = RingBufferSink()
+    enable(sink, sample_rate=1.0, slow_ms=None)
+
+    ledger.add_transaction("alice", 10, "EARN", "ref-1")
+    ledger.add_transaction("alice", 10, "EARN", "ref-1")  # Idempotent replay touches nothing
+    state.mark_opened("alice", "offer-1")
+    state.get_opened_set("alice")
+    state.get_opened_set("alice")
+
+    spans = sink.spans()
+    assert [s.operation for s in spans] == ["ledger.add_transaction", "ledger.add_transaction",
+                                            "state.mark_opened", "state.get_opened_set", "state.get_opened_set"]
+    assert [s.rows for s in spans] == [1, 0, 1, 1, 1]
+    assert spans[0].args_digest == spans[1].args_digest  # Same arguments, same digest
+    assert spans[3].args_digest != spans[2].args_digest
+    assert all(s.duration_ms >= 0 and not s.slow and s.error is None for s in spans)
+
+
+def test_sampling_and_slow_threshold():
+    sink = RingBufferSink()
+    profiler = enable(sink, sample_rate=0.0, slow_ms=1000.0)
+
+    class Store:
+        @profiled("store")
+        def fast(self):
+            return None
+
+    Store().fast()
+    assert sink.spans() == []  # Not sampled, not slow
+
+    with span("store.block", "x") as s:
+        s.rows = 3
+    assert sink.spans() == []
+
+    profiler.slow_ms = 0.0  # Everything counts as slow now
+    Store().fast()
+    with pytest.raises(ValueError):
+        with span("store.block"):
+            raise ValueError("boom")
+    fast, block = sink.spans()
+    assert fast.operation == "store.fast" and fast.slow
+    assert block.error == "ValueError"
+
+
+def test_jsonl_and_logger_sinks(tmp_path, caplog):
+    path = str(tmp_path / "profile" / "spans.jsonl")
+    sink = JsonlSink(path)
+    enable(sink, sample_rate=1.0, slow_ms=None)
+    with span("ledger.scan") as s:
+        s.rows = 42
+    sink.close()
+    with open(path) as f:
+        record = json.loads(f.readline())
+    assert record["operation"] == "ledger.scan" and record["rows"] == 42
+
+    enable(LoggerSink(), sample_rate=1.0, slow_ms=None)
+    with caplog.at_level(logging.INFO, logger="zerocrate.profile"):
+        with span("state.scan"):
+            pass
+    assert caplog.records[-1].span["operation"] == "state.scan"
+
+
+def test_miners_are_profiled_per_class():
+    class FakeMiner(BaseMiner):
+        def __init__(self):
+            super().__init__("Fake")
+
+        def fetch_games(self):
+            with self._phase("parse") as phase:
+                phase.rows = 2
+            return ["a", "b"]
+
+    class FakerMiner(FakeMiner):
+        pass
+
+    sink = RingBufferSink()
+    enable(sink, sample_rate=1.0, slow_ms=None)
+    assert FakerMiner().mine() == ["a", "b"]
+    assert [(s.operation, s.rows) for s in sink.spans()] == [("Fake.parse", 2), ("FakerMiner.mine", 2)]
+
+
+def test_bad_environment_settings_leave_profiling_off(monkeypatch, capsys):
+    for mode, sample, slow in (("ring", "often", None), ("log", None, "fast"), ("ring:big", None, None)):
+        monkeypatch.setenv("ZEROCRATE_PROFILE", mode)
+        for name, value in (("ZEROCRATE_PROFILE_SAMPLE", sample), ("ZEROCRATE_PROFILE_SLOW_MS", slow)):
+            if value is None:
+                monkeypatch.delenv(name, raising=False)
+            else:
+                monkeypatch.setenv(name, value)
+        assert profiling.enable_from_env() is None
+        assert profiling.active() is None
+    assert capsys.readouterr().out.count("profiling stays off") == 3
+
+
+def test_disabled_hooks_stay_cheap():
+    class Store:
+        def plain(self, x):
+            return x
+
+        @profiled("store")
+        def hooked(self, x):
+            return x
+
+    store = Store()
+    plain = min(timeit.repeat(lambda: store.plain(1), number=20000, repeat=5))
+    hooked = min(timeit.repeat(lambda: store.hooked(1), number=20000, repeat=5))
+    assert hooked < plain * 5 + 0.01
+    with span("noop") as s:
+        s.rows = 1  # The shared no-op span ignores it
+    assert s.rows is None
@@ -0,0 +1,92 @@
+import sys
+import os
+from datetime import datetime, timedelta, timezone
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core.changefeed import ChangeFeed
+from core.models import GameOffer, Rarity
+from core.rails import RailsEngine, _encode_cursor
+from core.state import UserStateManager
+
+NOW = datetime(2030, 1, 1, tzinfo=timezone.utc)
+
+
+def make_offer(title, price, source="Steam", platform_id=None, rarity=Rarity.COMMON, end_time=None):
+    return GameOffer(title=title, original_price=price, discount_price=0.0, description="", image_url="",
+                     store_url=f"https://example.com/{title}", source=source,
+                     platform_id=platform_id or title, end_time=end_time, rarity=rarity)
+
+
+def titles(page):
+    return [card["title"] for card in page.cards]
+
+
+def test_rails_stay_sorted_under_incremental_updates():
+    engine = RailsEngine()
+    for i, price in enumerate([19.99, 59.99, 4.99, 44.99]):
+        engine.upsert(make_offer(f"Game {i}", price, rarity=Rarity.LEGENDARY if price > 40 else Rarity.COMMON))
+
+    assert titles(engine.page("top_value")) == ["Game 1", "Game 3", "Game 0", "Game 2"]
+    assert titles(engine.page("legendary")) == ["Game 1", "Game 3"]
+
+    # A price change moves the offer; a removal drops it everywhere
+    engine.upsert(make_offer("Game 2", 99.99, rarity=Rarity.LEGENDARY))
+    engine.remove(make_offer("Game 1", 0).offer_id)
+    assert titles(engine.page("top_value")) == ["Game 2", "Game 3", "Game 0"]
+    assert titles(engine.page("legendary")) == ["Game 2", "Game 3"]
+
+    rails = engine.render()
+    assert len(rails) >= 5
+    assert {"id", "title", "cards", "empty_message"} <= set(rails[0])
+
+
+def test_cursor_paging_skips_opened_lazily(tmp_path):
+    engine = RailsEngine()
+    offers = [make_offer(f"Game {i:02d}", 50.0 - i) for i in range(10)]
+    for offer in offers:
+        engine.upsert(offer)
+    opened = {offers[1].offer_id, offers[2].offer_id}
+
+    first = engine.page("steam", hidden=opened, limit=3)
+    assert titles(first) == ["Game 00", "Game 03", "Game 04"]
+
+    # The rail changes between pages: the cursor still resumes after Game 04
+    engine.upsert(make_offer("Game New", 100.0))
+    second = engine.page("steam", hidden=opened, cursor=first.next_cursor, limit=3)
+    assert titles(second) == ["Game 05", "Game 06", "Game 07"]
+    last = engine.page("steam", hidden=opened, cursor=second.next_cursor, limit=3)
+    assert titles(last) == ["Game 08", "Game 09"]
+    assert last.next_cursor is None
+
+    # Malformed or foreign cursors restart the rail instead of failing the request
+    for bad in ("%%%", "bm90IGpzb24", _encode_cursor(("scout key",), "x"), _encode_cursor((1,), 5)[:-3]):
+        assert titles(engine.page("steam", cursor=bad, limit=1)) == ["Game New"]
+
+    # Biggest Savings keeps opened offers, flagged for the dimmed card style
+    savings = engine.page("top_value", hidden=opened, limit=4)
+    assert [c["opened"] for c in savings.cards] == [False, False, True, True]
+
+    user_state = UserStateManager(db_path=str(tmp_path / "state.db"))
+    user_state.mark_opened("u", offers[0].offer_id)
+    steam = next(r for r in engine.render_for(user_state, "u") if r["id"] == "steam")
+    assert steam["cards"][0]["title"] == "Game New"
+    assert offers[0].title not in [c["title"] for c in steam["cards"]]
+
+
+def test_sync_follows_the_change_feed(tmp_path):
+    feed = ChangeFeed(str(tmp_path / "feed.db"))
+    soon = make_offer("Soon", 9.99, source="Epic Games", end_time=NOW + timedelta(hours=3))
+    feed.record_cycle([soon, make_offer("Later", 19.99, source="Epic Games", end_time=NOW + timedelta(days=3))],
+                      producer="epic")
+
+    engine = RailsEngine()
+    assert engine.sync(feed) == 2
+    page = engine.page("ending_soon", now=NOW)
+    assert titles(page) == ["Soon", "Later"]
+    assert [c["end_time_rel"] for c in page.cards] == ["3h left", "3d left"]
+
+    feed.record_cycle([soon], producer="epic")
+    assert engine.sync(feed) == 1
+    assert titles(engine.page("epic")) == ["Soon"]
+    assert engine.sync(feed) == 0
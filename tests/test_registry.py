@@ -0,0 +1,58 @@
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from miners.registry import MinerRegistry
+
+
+def test_miners_are_imported_on_first_use(monkeypatch):
+    monkeypatch.delenv("ZEROCRATE_MINERS", raising=False)
+    registry = MinerRegistry(specs={"collections": "collections:OrderedDict"}, entry_points=False)
+
+    assert {"epic", "steam", "scout", "collections"} <= set(registry.names())
+    assert not registry.is_loaded("collections")
+
+    instance = registry.create("collections", a=1)
+    assert instance == {"a": 1}
+    assert registry.is_loaded("collections")
+
+    [row] = registry.report(budget_ms=10_000)
+    assert row["miner"] == "collections"
+    assert row["over_budget"] is False
+
+
+def test_env_can_add_and_disable_miners(monkeypatch):
+    monkeypatch.setenv("ZEROCRATE_MINERS", "json=json:JSONDecoder, -steam")
+    registry = MinerRegistry(entry_points=False)
+
+    assert "steam" not in registry
+    assert registry.spec("json") == "json:JSONDecoder"
+    try:
+        registry.load("steam")
+        assert False, "disabled miner should not load"
+    except KeyError:
+        pass
+
+
+def test_service_polls_every_registered_miner(tmp_path, monkeypatch):
+    from core.changefeed import ChangeFeed
+    from core.explain import ExplanationStore
+    from core.forecast import ForecastStore
+    from core.loot_cache import LootCache
+    from core.search import SearchIndex
+    from miners.images import ImageCache
+    from miners.service import DEFAULT_INTERVAL, build_service
+
+    monkeypatch.setenv("ZEROCRATE_MINERS", "-epic")
+    registry = MinerRegistry(specs={"plugin": "collections:OrderedDict"}, entry_points=False)
+    scheduler = build_service(
+        feed=ChangeFeed(str(tmp_path / "feed.db")), forecasts=ForecastStore(str(tmp_path / "forecast.db")),
+        registry=registry, search=SearchIndex(str(tmp_path / "search.db")),
+        loot_cache=LootCache(db_path=str(tmp_path / "loot.db")),
+        explanations=ExplanationStore(str(tmp_path / "why.db")), images=ImageCache(root=str(tmp_path / "img")))
+
+    jobs = {job["name"]: job for job in scheduler.snapshot()}
+    assert set(jobs) == {"steam", "scout", "plugin"}  # No Epic source, so no Oracle either
+    assert jobs["plugin"]["interval"] == DEFAULT_INTERVAL
+    assert not registry.is_loaded("plugin")            # Still built on its first poll
@@ -0,0 +1,77 @@
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core.scheduler import PollScheduler, UNLOCK_GRACE
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_interval_backs_off_when_unchanged_and_tightens_on_change():
+    clock = FakeClock()
+    scheduler = PollScheduler(clock=clock)
+    payload = {"value": 1}
+    job = scheduler.add_source("epic", lambda: dict(payload), interval=100, min_interval=10, max_interval=1000)
+
+    assert scheduler.run_pending() == ["epic"]  # First poll always counts as a change
+    assert job.interval == 50
+
+    for expected in (100, 200, 400):
+        clock.now = job.next_run
+        scheduler.run_pending()
+        assert job.interval == expected
+
+    payload["value"] = 2
+    clock.now = job.next_run
+    scheduler.run_pending()
+    assert job.interval == 50
+    assert job.changes == 2
+
+
+def test_unlock_hint_pulls_next_run_forward():
+    clock = FakeClock()
+    scheduler = PollScheduler(clock=clock)
+    job = scheduler.add_source("epic", lambda: False, interval=3600, start_in=3600)
+
+    scheduler.hint_unlock("epic", clock.now + 60)
+    assert job.next_run == clock.now + 60 + UNLOCK_GRACE
+
+    clock.now += 30
+    assert scheduler.run_pending() == []
+    clock.now += 30 + UNLOCK_GRACE
+    assert scheduler.run_pending() == ["epic"]
+    assert job.unlock_at is None
+
+
+def test_later_unlocks_are_rearmed_after_the_earliest():
+    clock = FakeClock()
+    scheduler = PollScheduler(clock=clock)
+    job = scheduler.add_source("epic", lambda: False, interval=3600, max_interval=86400, start_in=3600)
+
+    first, second = clock.now + 60, clock.now + 600
+    scheduler.hint_unlock("epic", second)
+    scheduler.hint_unlock("epic", first)
+    assert job.unlock_at == first
+
+    clock.now = first + UNLOCK_GRACE
+    assert scheduler.run_pending() == ["epic"]
+    assert job.unlocks == [second]
+    assert job.next_run == second + UNLOCK_GRACE
+
+
+def test_snapshot_orders_queue_by_next_run():
+    clock = FakeClock()
+    scheduler = PollScheduler(clock=clock)
+    scheduler.add_source("slow", lambda: False, start_in=500)
+    scheduler.add_source("fast", lambda: False, start_in=5)
+    scheduler.remove_source("slow")
+    scheduler.add_source("later", lambda: False, start_in=50)
+
+    assert [j["name"] for j in scheduler.snapshot()] == ["fast", "later"]
@@ -0,0 +1,106 @@
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from feedparser import FeedParserDict
+from miners import scout as scout_module
+from miners.scout import Scout
+from miners.seen_index import SeenEntryIndex, stable_digest
+
+
+def make_entry(entry_id, title, url):
+    return FeedParserDict(
+        id=entry_id,
+        title=title,
+        link=f"https://www.reddit.com/r/FreeGameFindings/comments/{entry_id}/",
+        updated="2025-01-01T00:00:00+00:00",
+        content=[FeedParserDict(value=f'<a href="{url}">[link]</a>')],
+    )
+
+
+def fake_feed(entries):
+    return FeedParserDict(status=200, entries=entries)
+
+
+def test_scout_returns_live_set_and_parses_only_new_entries(tmp_path, monkeypatch):
+    entries = [
+        make_entry("t3_a", "[Steam] (Game) Pizza Possum - Free", "https://store.steampowered.com/app/1/"),
+        make_entry("t3_b", "[Epic] (DLC) Some Expansion", "https://store.epicgames.com/p/x"),
+    ]
+    monkeypatch.setattr(scout_module.feedparser, "parse", lambda url: fake_feed(entries))
+    index_path = str(tmp_path / "seen.db")
+
+    first = Scout(index=SeenEntryIndex(index_path)).fetch_games()
+    assert [o.title for o in first] == ["Pizza Possum"]
+
+    # A fresh instance (think: restart or second worker) still returns the live deal, without re-parsing it
+    scout = Scout(index=SeenEntryIndex(index_path))
+    monkeypatch.setattr(scout, "_parse_entry", lambda entry: (_ for _ in ()).throw(AssertionError("re-parsed")))
+    second = scout.fetch_games()
+    assert [o.title for o in second] == ["Pizza Possum"]
+    assert second[0].platform_id == first[0].platform_id
+
+    # New posts are parsed and join the live set; posts that left the feed drop out of it
+    entries.append(make_entry("t3_c", "[GOG] (Game) Other Thing", "https://www.gog.com/game/other"))
+    del entries[0]
+    third = Scout(index=SeenEntryIndex(index_path)).fetch_games()
+    assert [o.title for o in third] == ["Other Thing"]
+
+
+def test_failed_cycle_does_not_mark_entries_seen(tmp_path, monkeypatch):
+    entries = [make_entry("t3_a", "[Steam] (Game) Pizza Possum - Free", "https://store.steampowered.com/app/1/")]
+    monkeypatch.setattr(scout_module.feedparser, "parse", lambda url: fake_feed(entries))
+    index_path = str(tmp_path / "seen.db")
+
+    broken = Scout(index=SeenEntryIndex(index_path))
+    monkeypatch.setattr(scout_module, "classify_prices", lambda prices: 1 / 0)
+    assert broken.fetch_games() == []
+
+    # Nothing was remembered, so the entry is parsed again next cycle
+    entry = entries[0]
+    key = (entry.id, stable_digest(entry.title, entry.link, entry.updated))
+    assert SeenEntryIndex(index_path).lookup([key]) == {}
+
+
+def test_phases_are_labelled_by_registry_name(tmp_path, monkeypatch):
+    from core.metrics import MINER_PHASE
+
+    entries = [make_entry("t3_a", "[Steam] Alpha (Game) - Free", "https://store.steampowered.com/app/1/")]
+    monkeypatch.setattr(scout_module.feedparser, "parse", lambda url: fake_feed(entries))
+    before = {phase: MINER_PHASE.snapshot("scout", phase)["count"] for phase in ("fetch", "parse")}
+    Scout(index=SeenEntryIndex(str(tmp_path / "seen.db"))).mine()
+    assert {phase: MINER_PHASE.snapshot("scout", phase)["count"] for phase in before} == \
+        {phase: count + 1 for phase, count in before.items()}  # Same "scout" label as its cycles
+
+
+def test_platform_tags_keep_store_priority(tmp_path):
+    scout = Scout(index=SeenEntryIndex(str(tmp_path / "seen.db")))
+    assert scout._normalize_platform("Epic / Steam") == "Steam"
+    assert scout._normalize_platform("itch.io, GOG") == "GOG"
+    assert scout._normalize_platform("Prime Gaming") is None
+
+
+def test_platform_id_is_stable():
+    # Pinned value: must not depend on PYTHONHASHSEED
+    assert stable_digest("https://store.steampowered.com/app/1", size=4) == "c8de31ea"
+
+
+def test_feeds_are_merged_and_filtered(tmp_path, monkeypatch):
+    feeds = {
+        "https://feed.one/.rss": [
+            make_entry("t3_a", "[Steam] (Game) Shared Deal - 100% off", "https://store.steampowered.com/app/7/"),
+            make_entry("t3_b", "[Steam] (Game) Old Thing [Expired]", "https://store.steampowered.com/app/8/"),
+        ],
+        "https://feed.two/.rss": [
+            make_entry("t3_x", "[steam] (game) Shared Deal", "https://store.steampowered.com/app/7?utm=x"),
+            make_entry("t3_y", "[Itch.io] (Game) Tiny Game", "https://someone.itch.io/tiny"),
+            make_entry("t3_z", "[Steam] (Soundtrack) Tunes", "https://store.steampowered.com/app/9/"),
+        ],
+    }
+    monkeypatch.setattr(scout_module.feedparser, "parse", lambda url: fake_feed(feeds[url]))
+
+    scout = Scout(feeds=list(feeds), index=SeenEntryIndex(str(tmp_path / "seen.db")))
+    loot = scout.fetch_games()
+
+    assert sorted((o.title, o.source) for o in loot) == [("Shared Deal", "Steam"), ("Tiny Game", "Itch.io")]
@@ -0,0 +1,78 @@
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from backend import search_api
+from core.changefeed import ChangeFeed
+from core.models import GameOffer
+from core.search import SearchIndex
+
+
+def make_offer(title, platform_id, source="Steam", description=""):
+    return GameOffer(title=title, original_price=19.99, discount_price=0.0, description=description,
+                     image_url="", store_url=f"https://example.com/{platform_id}", source=source,
+                     platform_id=platform_id)
+
+
+def titles(result):
+    return [r["title"] for r in result["results"]]
+
+
+def test_changefeed_sync_prefix_and_typos(tmp_path):
+    feed = ChangeFeed(str(tmp_path / "feed.db"))
+    index = SearchIndex(str(tmp_path / "search.db"))
+
+    feed.record_cycle([make_offer("Hollow Knight", "1"), make_offer("Dragon Quest XI", "2"),
+                       make_offer("Pokémon Puzzle", "3", description="Match the dragons")], producer="steam")
+    assert index.sync_changefeed(feed) == 3
+
+    assert titles(index.search("hollow")) == ["Hollow Knight"]
+    assert titles(index.search("drag")) == ["Dragon Quest XI", "Pokémon Puzzle"]  # Title hits rank first
+    assert titles(index.search("pokemon")) == ["Pokémon Puzzle"]
+
+    typo = index.search("dargon quest")
+    assert titles(typo) == ["Dragon Quest XI"]
+    assert typo["corrected"]["dargon"][0] == "dragon"
+
+    # Removals and price changes flow through incrementally
+    repriced = make_offer("Hollow Knight", "1")
+    repriced.original_price = 14.99
+    feed.record_cycle([repriced], producer="steam")
+    assert index.sync_changefeed(feed) == 3
+    assert titles(index.search("dragon quest")) == []
+    assert index.search("knight")["results"][0]["original_price"] == 14.99
+    assert index.count() == 1
+
+
+def test_document_type_is_not_searchable(tmp_path):
+    index = SearchIndex(str(tmp_path / "search.db"))
+    index.index_offers([make_offer("Hollow Knight", "1"), make_offer("Special Offer Pack", "2")])
+    index.index_inventory([{"title": "Celeste", "source": "Epic"}])
+
+    assert titles(index.search("offer")) == ["Special Offer Pack"]
+    assert titles(index.search("off")) == ["Special Offer Pack"]
+    assert titles(index.search("inventory")) == []
+    assert titles(index.search("celeste", kind="inventory")) == ["Celeste"]
+    assert titles(index.search("celeste", kind="offer")) == []
+
+
+def test_inventory_and_api(tmp_path, monkeypatch):
+    index = SearchIndex(str(tmp_path / "search.db"))
+    index.index_offers([make_offer("Celeste", "9")])
+    inventory = {"Celeste": {"title": "Celeste", "source": "Epic Games", "store_url": "x"}}
+    assert index.sync_inventory(inventory) == 1
+    assert index.sync_inventory(inventory) == 0
+
+    monkeypatch.setattr(search_api, "_index", index)
+    app = FastAPI()
+    app.include_router(search_api.router)
+    client = TestClient(app)
+
+    body = client.get("/api/search", params={"q": "cel"}).json()
+    assert sorted(r["kind"] for r in body["results"]) == ["inventory", "offer"]
+    body = client.get("/api/search", params={"q": "cel", "kind": "inventory"}).json()
+    assert [r["kind"] for r in body["results"]] == ["inventory"]
+    assert client.get("/api/search", params={"q": "cel", "kind": "bogus"}).status_code == 422
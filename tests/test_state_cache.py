@@ -0,0 +1,82 @@
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from backend.state_cache import StatePayloadCache
+from core.changefeed import ChangeFeed
+from core.ledger import LedgerManager
+from core.models import GameOffer
+from core.state import UserStateManager
+
+USER = "local_user"
+
+
+def make_app(tmp_path, clock):
+    ledger = LedgerManager(db_path=str(tmp_path / "ledger.db"))
+    user_state = UserStateManager(db_path=str(tmp_path / "state.db"))
+    feed = ChangeFeed(str(tmp_path / "feed.db"))
+    builds = []
+
+    def build(user_id):
+        builds.append(user_id)
+        return {"scout": {"status": "watching"},
+                "hero": {"level": 1, "balance": ledger.get_balance(user_id)},
+                "rails": [{"id": f"rail_{i}", "cards": ["x" * 200]} for i in range(5)]}
+
+    cache = StatePayloadCache(build, ledger, user_state, feed, clock=clock)
+    app = FastAPI()
+
+    @app.get("/api/state")
+    def api_state(request: Request):
+        return cache.response(request, USER)
+
+    return TestClient(app), ledger, user_state, feed, builds
+
+
+def test_state_is_built_once_per_version(tmp_path):
+    now = [1000.0]
+    client, ledger, user_state, feed, builds = make_app(tmp_path, lambda: now[0])
+
+    first = client.get("/api/state")
+    assert first.status_code == 200
+    assert first.json()["hero"]["balance"] == 0
+    etag = first.headers["etag"]
+
+    # Polling with the tag: 304, no body, no rebuild
+    again = client.get("/api/state", headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.content == b""
+    assert client.get("/api/state").status_code == 200
+    assert len(builds) == 1
+
+    # Each input bumps the version
+    tags = {etag}
+    for change in (
+        lambda: ledger.add_transaction(USER, 100, "EARN", "claim:steam:1"),
+        lambda: user_state.mark_opened(USER, "claim:steam:1"),
+        lambda: feed.record_cycle([GameOffer("G", 9.99, 0, "", "", "", "Steam", "1")]),
+        lambda: now.__setitem__(0, now[0] + 60),
+    ):
+        change()
+        response = client.get("/api/state", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        etag = response.headers["etag"]
+        assert etag not in tags
+        tags.add(etag)
+    assert len(builds) == 5
+    assert client.get("/api/state").json()["hero"]["balance"] == 100
+
+    # Other users' activity doesn't touch this user's version
+    ledger.add_transaction("someone_else", 50, "EARN", "claim:steam:2")
+    assert client.get("/api/state", headers={"If-None-Match": etag}).status_code == 304
+
+
+def test_gzip_is_precomputed(tmp_path):
+    client, *_ = make_app(tmp_path, lambda: 0.0)
+    response = client.get("/api/state", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert len(response.json()["rails"]) == 5  # httpx transparently decodes
@@ -0,0 +1,107 @@
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from miners import steam
+from miners.base import PartialResult
+from miners.steam import SteamMiner
+from miners.ratelimit import HostRateLimiter
+from core.models import Rarity
+
+
+def make_row(app_id, title, price="$19.99", discount="-100%", review="Very Positive<br>95% of reviews"):
+    discount_html = f'<div class="search_discount"><span>{discount}</span></div>' if discount else ""
+    return f'''
+    <a href="https://store.steampowered.com/app/{app_id}/x/" class="search_result_row" data-ds-appid="{app_id}">
+        <div class="search_capsule"><img src="https://cdn.steam/{app_id}.jpg"></div>
+        <span class="title">{title}</span>
+        <span class="search_review_summary positive" data-tooltip-html="{review}"></span>
+        {discount_html}
+        <div class="search_price"><strike>{price}</strike>Free</div>
+    </a>
+    <div class="noise"><p>sidebar</p></div>
+    '''
+
+
+class FakeResponse:
+    status_code = 200
+
+    def __init__(self, payload):
+        self._payload = payload
+
+    def json(self):
+        return self._payload
+
+
+def test_crawler_pages_until_discounts_run_out(monkeypatch):
+    pages = {
+        0: make_row(1, "Alpha", "$59.99") + make_row(2, "Beta", "$4.99", review="Mixed"),
+        50: make_row(3, "Gamma", "$9.99"),
+        100: make_row(4, "Paid Game", discount=None),
+        150: make_row(5, "Never Fetched", "$19.99"),
+    }
+    requested = []
+
+    def fake_get(self, url, headers=None, timeout=None):
+        start = int(url.split("start=")[1].split("&")[0])
+        requested.append(start)
+        return FakeResponse({"results_html": pages[start], "total_count": 200})
+
+    monkeypatch.setattr(steam.requests.Session, "get", fake_get)
+    monkeypatch.setattr(steam, "MAX_CONCURRENCY", 2)
+
+    miner = SteamMiner()
+    miner.limiter = HostRateLimiter()
+    miner.min_interval = 0
+    loot = miner.fetch_games()
+
+    assert sorted(o.title for o in loot) == ["Alpha", "Gamma"]
+    alpha = next(o for o in loot if o.title == "Alpha")
+    assert alpha.platform_id == "1"
+    assert alpha.rarity == Rarity.LEGENDARY
+    assert alpha.image_url == "https://cdn.steam/1.jpg"
+
+    # The wave containing the non-discounted page is the last one fetched
+    assert 150 not in requested
+
+
+def test_failed_page_keeps_earlier_pages(monkeypatch):
+    pages = {
+        0: make_row(1, "Alpha", "$59.99"),
+        100: make_row(3, "After The Hole", "$9.99"),
+        150: make_row(4, "Never Fetched", "$19.99"),
+    }
+    requested = []
+
+    class Broken(FakeResponse):
+        status_code = 503
+
+    def fake_get(self, url, headers=None, timeout=None):
+        start = int(url.split("start=")[1].split("&")[0])
+        requested.append(start)
+        if start == 50:
+            return Broken({})
+        return FakeResponse({"results_html": pages[start], "total_count": 200})
+
+    monkeypatch.setattr(steam.requests.Session, "get", fake_get)
+    monkeypatch.setattr(steam, "MAX_CONCURRENCY", 2)
+
+    miner = SteamMiner()
+    miner.limiter = HostRateLimiter()
+    miner.min_interval = 0
+    loot = miner.fetch_games()
+
+    # Page 100 shared the failed page's wave and arrived, but only the prefix before the hole is kept
+    assert [o.title for o in loot] == ["Alpha"]
+    assert isinstance(loot, PartialResult) and "start=50" in loot.error
+    assert 100 in requested and 150 not in requested
+
+
+def test_fallback_platform_id_is_stable():
+    from bs4 import BeautifulSoup
+    html = make_row(7, "No Id").replace(' data-ds-appid="7"', "").replace("/app/7/", "/sub/7/")
+    row = BeautifulSoup(html, "html.parser").find("a")
+    _, fields = SteamMiner()._parse_row(row)
+    # Pinned: must not depend on PYTHONHASHSEED
+    assert fields["platform_id"] == "steam_unknown_dc4d70c6b0da068d"
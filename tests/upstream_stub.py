@@ -0,0 +1,277 @@
+"""
+tests/upstream_stub.py
+Local stand-in for every upstream the miners talk to (Epic API, Steam search, Reddit RSS).
+Replays recorded fixtures or synthetically scaled payloads, with configurable latency
+and error injection, so parsing can be benchmarked and load-tested without the network.
+
+Record live fixtures:   python tests/upstream_stub.py record [epic|steam|scout]
+Serve (for manual use): python tests/upstream_stub.py serve [port]
+"""
+
+import json
+import os
+import random
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+LIVE_URLS = {
+    "epic": "https://store-site-backend-static.ak.epicgames.com/freeGamesPromotions",
+    "steam": "https://store.steampowered.com/search/results/?maxprice=free&specials=1&category1=998"
+             "&supportedlang=english&start=0&count=100&infinite=1",
+    "scout": "https://www.reddit.com/r/FreeGameFindings/new/.rss",
+}
+FIXTURE_FILES = {"epic": "epic_promotions.json", "steam": "steam_search.json", "scout": "scout_feed.rss"}
+
+
+# --- Synthetic payloads ---
+
+def synthetic_epic(elements: int = 200) -> dict:
+    """freeGamesPromotions with a mix of current free, upcoming free and paid entries."""
+    games = []
+    for i in range(elements):
+        free_now = i % 10 == 0
+        promo = [{"promotionalOffers": [{
+            "startDate": "2030-01-09T16:00:00.000Z",
+            "endDate": "2030-01-16T16:00:00.000Z",
+            "discountSetting": {"discountPercentage": 0 if i % 4 == 0 else 50}
+        }]}]
+        games.append({
+            "id": f"id-{i}",
+            "title": f"Synthetic Game {i}",
+            "productSlug": f"synthetic-game-{i}",
+            "description": "Benchmark filler.",
+            "keyImages": [{"url": f"https://cdn.example/{i}.jpg"}],
+            "categories": [{"path": "freegames"}],
+            "price": {"totalPrice": {"originalPrice": 1999 + i, "discountPrice": 0 if free_now else 1999 + i,
+                                     "fmtPrice": {"originalPrice": f"${(1999 + i) / 100:.2f}"}}},
+            "promotions": {
+                "promotionalOffers": promo if free_now else [],
+                "upcomingPromotionalOffers": [] if free_now else promo
+            }
+        })
+    return {"data": {"Catalog": {"searchStore": {"elements": games}}}}
+
+
+def synthetic_steam_row(i: int, discounted: bool = True) -> str:
+    discount = '<div class="search_discount"><span>-100%</span></div>' if discounted else ""
+    review = "Very Positive<br>91% of reviews" if i % 3 else "Mixed<br>55% of reviews"
+    return (
+        f'<a href="https://store.steampowered.com/app/{i}/Synthetic_{i}/" class="search_result_row" data-ds-appid="{i}">'
+        f'<div class="search_capsule"><img src="https://cdn.example/steam/{i}.jpg"></div>'
+        f'<div class="responsive_search_name_combined"><span class="title">Synthetic Steam {i}</span>'
+        f'<span class="search_review_summary positive" data-tooltip-html="{review}"></span>'
+        f'{discount}<div class="search_price"><strike>${5 + i % 60}.99</strike>Free</div></div></a>'
+        f'<div class="search_result_row_spacer"><p>filler</p></div>'
+    )
+
+
+def synthetic_steam_page(start: int, count: int, total: int, discounted_rows: int) -> dict:
+    rows = "".join(synthetic_steam_row(i, discounted=i < discounted_rows)
+                   for i in range(start, min(start + count, total)))
+    return {"success": 1, "results_html": rows, "total_count": total, "start": start}
+
+
+def synthetic_rss(entries: int = 100) -> str:
+    platforms = ["Steam", "Epic Games", "GOG", "itch.io", "Steam"]
+    kinds = ["Game", "Game", "Game", "DLC", "Game"]
+    items = []
+    for i in range(entries):
+        platform, kind = platforms[i % len(platforms)], kinds[i % len(kinds)]
+        title = escape(f"[{platform}] ({kind}) Synthetic Deal {i} - 100% off")
+        content = escape(f'<a href="https://deals.example/{platform.lower()}/{i}">[link]</a>'
+                         f'<img src="https://thumbs.example/{i}.jpg">')
+        items.append(
+            f"<entry><id>t3_synth{i}</id><title>{title}</title>"
+            f'<link href="https://www.reddit.com/r/FreeGameFindings/comments/synth{i}/"/>'
+            f"<updated>2030-01-01T00:00:00+00:00</updated>"
+            f'<content type="html">{content}</content></entry>'
+        )
+    return ('<?xml version="1.0" encoding="UTF-8"?><feed xmlns="http://www.w3.org/2005/Atom">'
+            "<title>FreeGameFindings</title>" + "".join(items) + "</feed>")
+
+
+# --- Server ---
+
+@dataclass
+class StubConfig:
+    epic_elements: int = 200
+    steam_total: int = 1000
+    steam_discounted: int = 600  # Rows past this index are not discounted (crawler should stop)
+    rss_entries: int = 100
+    latency: float = 0.0         # Seconds added to every response
+    jitter: float = 0.0          # Uniform extra latency in [0, jitter]
+    error_rate: float = 0.0      # Fraction of requests answered with a 503
+    use_fixtures: bool = False   # Replay tests/fixtures/* instead of synthetic payloads
+    seed: int = 1337
+    hits: Dict[str, int] = field(default_factory=dict)
+
+
+class UpstreamStub:
+    """
+    Routes:
+      /freeGamesPromotions   Epic catalog (ETag + 304 supported)
+      /search/results/       Steam search (start/count/infinite honoured)
+      /rss/<name>            Reddit-style Atom feed
+    """
+
+    def __init__(self, config: Optional[StubConfig] = None):
+        self.config = config or StubConfig()
+        self._rng = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self._cache: Dict[str, Tuple[bytes, str]] = {}
+        self.server: Optional[ThreadingHTTPServer] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_port}"
+
+    @property
+    def epic_url(self) -> str:
+        return f"{self.base_url}/freeGamesPromotions"
+
+    @property
+    def steam_url(self) -> str:
+        return f"{self.base_url}/search/results/?maxprice=free&specials=1"
+
+    def rss_url(self, name: str = "FreeGameFindings") -> str:
+        return f"{self.base_url}/rss/{name}"
+
+    def _fixture(self, key: str) -> Optional[bytes]:
+        path = os.path.join(FIXTURE_DIR, FIXTURE_FILES[key])
+        if self.config.use_fixtures and os.path.exists(path):
+            with open(path, "rb") as f:
+                return f.read()
+        return None
+
+    def _static(self, key: str) -> Tuple[bytes, str]:
+        """Epic/RSS bodies are generated once and reused (they don't depend on the query)."""
+        if key not in self._cache:
+            body = self._fixture(key)
+            if body is None:
+                if key == "epic":
+                    body = json.dumps(synthetic_epic(self.config.epic_elements)).encode("utf-8")
+                else:
+                    body = synthetic_rss(self.config.rss_entries).encode("utf-8")
+            self._cache[key] = (body, "application/json" if key == "epic" else "application/atom+xml")
+        return self._cache[key]
+
+    def _steam(self, query: dict) -> Tuple[bytes, str]:
+        fixture = self._fixture("steam")
+        if fixture is not None:
+            return fixture, "application/json"
+        start = int(query.get("start", ["0"])[0])
+        count = int(query.get("count", ["50"])[0])
+        page = synthetic_steam_page(start, count, self.config.steam_total, self.config.steam_discounted)
+        return json.dumps(page).encode("utf-8"), "application/json"
+
+    def route(self, path: str) -> Tuple[int, bytes, str, Dict[str, str]]:
+        parsed = urlparse(path)
+        query = parse_qs(parsed.query)
+        if parsed.path.endswith("/freeGamesPromotions"):
+            body, ctype = self._static("epic")
+            return 200, body, ctype, {"ETag": f'"epic-{len(body)}"'}
+        if parsed.path.startswith("/search/results"):
+            body, ctype = self._steam(query)
+            return 200, body, ctype, {}
+        if parsed.path.startswith("/rss/"):
+            body, ctype = self._static("scout")
+            return 200, body, ctype, {}
+        return 404, b"not found", "text/plain", {}
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # Keep-alive, like the real CDNs
+
+            def do_GET(self):
+                cfg = stub.config
+                with stub._lock:
+                    key = urlparse(self.path).path
+                    cfg.hits[key] = cfg.hits.get(key, 0) + 1
+                    delay = cfg.latency + (stub._rng.uniform(0, cfg.jitter) if cfg.jitter else 0)
+                    fail = cfg.error_rate and stub._rng.random() < cfg.error_rate
+                if delay:
+                    time.sleep(delay)
+
+                if fail:
+                    status, body, ctype, headers = 503, b"injected failure", "text/plain", {}
+                else:
+                    status, body, ctype, headers = stub.route(self.path)
+                    etag = headers.get("ETag")
+                    if etag and self.headers.get("If-None-Match") == etag:
+                        status, body = 304, b""
+
+                self.send_response(status)
+                self.send_header("Content-Type", ctype)
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def start(self, port: int = 0) -> "UpstreamStub":
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, name="upstream-stub", daemon=True).start()
+        return self
+
+    def stop(self):
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+
+    def __enter__(self) -> "UpstreamStub":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+# --- Recorder ---
+
+def record(name: str) -> str:
+    """Fetches a live upstream payload and stores it under tests/fixtures/ for replay."""
+    import requests
+
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    response = requests.get(LIVE_URLS[name], timeout=30, headers={
+        "User-Agent": "Mozilla/5.0 (ZeroCrate fixture recorder)",
+        "Accept-Language": "en-US,en;q=0.9",
+    })
+    response.raise_for_status()
+    path = os.path.join(FIXTURE_DIR, FIXTURE_FILES[name])
+    with open(path, "wb") as f:
+        f.write(response.content)
+    return path
+
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else "serve"
+    if command == "record":
+        for name in sys.argv[2:] or list(LIVE_URLS):
+            print(f"📼 Recorded {name}: {record(name)}")
+    else:
+        stub = UpstreamStub().start(int(sys.argv[2]) if len(sys.argv) > 2 else 8765)
+        print(f"🧪 Upstream stub on {stub.base_url}")
+        print(f"   EPIC_PROMOTIONS_URL={stub.epic_url}")
+        print(f"   STEAM_SEARCH_URL={stub.steam_url}")
+        print(f"   SCOUT_FEEDS={stub.rss_url()}")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            stub.stop()